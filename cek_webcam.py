@@ -1,26 +1,42 @@
 import cv2
+import os
+import sys
+
+# Modul bersama ada di folder main
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "main"))
+from camera_discovery import CameraRegistry
+from config import load_config
 
 def cek_webcam():
-    for i in range(6):  # Cek dari indeks 0 hingga 5
+    # Semua index (0 hingga 5) di-probe bersamaan, bukan satu per satu
+    registry = CameraRegistry(load_config()["camera"]["roles"])
+    devices = registry.refresh()
+    if not devices:
+        print("Tidak ada webcam yang tersedia.")
+        return
+
+    for device in devices:
+        print(f"Webcam index {device['index']} ({device['backend']}):")
+        for mode in device["modes"]:
+            print(f"  {mode['fourcc']} {mode['width']}x{mode['height']} @ {mode['fps']} fps")
+    print(f"Peran kamera: {registry.cache['roles']} (disimpan di {registry.cache_path})")
+
+    for device in devices:
+        i = device["index"]
         cap = cv2.VideoCapture(i)
-        
-        if not cap.isOpened():
-            print(f"Webcam pada index {i} tidak tersedia.")
-            continue
-        
-        print(f"Webcam pada index {i} berhasil dibuka. Tekan 'q' untuk keluar.")
-        
+        print(f"Webcam pada index {i} berhasil dibuka. Tekan 'q' untuk lanjut.")
+
         while True:
             ret, frame = cap.read()
             if not ret:
                 print(f"Gagal membaca frame dari webcam pada index {i}.")
                 break
-            
+
             cv2.imshow(f"Cek Webcam {i}", frame)
-            
+
             if cv2.waitKey(1) & 0xFF == ord('q'):
                 break
-        
+
         cap.release()
         cv2.destroyAllWindows()
 
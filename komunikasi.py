@@ -1,51 +1,42 @@
-import socket
-import serial
-import threading
+import asyncio
+import os
+import sys
+
+# Modul bersama ada di folder main
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "main"))
+from bridge_async import BasestationBridge
+from serial_hub import SerialHub
+from ringlog import LOG
 
 # ===== Konfigurasi =====
 UDP_PORT = 28098
 SERIAL_PORT = "COM7"     # Ganti sesuai port Arduino
 BAUDRATE = 9600
+PROTOCOL = "ascii"       # "ascii" (perintah + ">") atau "binary" (lihat main/protocol.py)
 
-# ===== Setup Serial dan UDP =====
-udp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-udp_socket.bind(("0.0.0.0", UDP_PORT))
-
+# ===== Setup Serial =====
 try:
-    arduino = serial.Serial(SERIAL_PORT, BAUDRATE, timeout=1)
-    print(f"[Python] Terhubung ke Arduino di {SERIAL_PORT}")
+    arduino = SerialHub(SERIAL_PORT, BAUDRATE)
+    LOG.info("main", "Terhubung ke Arduino di %s", SERIAL_PORT)
 except Exception as e:
-    print(f"[ERROR] Tidak bisa terhubung ke Arduino: {e}")
+    LOG.error("main", "Tidak bisa terhubung ke Arduino: %s", e)
     arduino = None
 
-# ===== Kirim dari VB.NET ke Arduino =====
-def udp_receiver():
-    while True:
-        data, addr = udp_socket.recvfrom(1024)
-        msg = data.decode().strip()
-        print(f"[VB.NET] >> {msg}")
-        if arduino:
-            if not msg.endswith(">"):
-                msg += ">"
-            arduino.write(msg.encode())
-            print(f"[Arduino <=] {msg}")
-
-# ===== Baca Serial dari Arduino =====
-def baca_serial():
-    while True:
-        if arduino and arduino.in_waiting:
-            balasan = arduino.readline().decode().strip()
-            if balasan:
-                print(f"[Arduino >>] {balasan}")
+# ===== Baca Serial dari Arduino (diteruskan bridge dari SerialHub) =====
+def baca_serial(balasan):
+    LOG.summary("arduino", "balasan", "Arduino >> %s", balasan)
 
-# ===== Jalankan thread =====
-threading.Thread(target=udp_receiver, daemon=True).start()
-threading.Thread(target=baca_serial, daemon=True).start()
+# ===== Jalankan bridge asyncio =====
+if arduino:
+    arduino.start()
 
-print("[Python] Program jalan. Menunggu data dari VB.NET dan Arduino...")
+LOG.info("main", "Program jalan. Menunggu data dari VB.NET dan Arduino...")
+bridge = BasestationBridge(arduino, UDP_PORT, PROTOCOL, on_arduino=baca_serial)
 try:
-    while True:
-        pass
+    asyncio.run(bridge.run())
 except KeyboardInterrupt:
+    pass
+finally:
     if arduino:
         arduino.close()
+    LOG.stop()
@@ -0,0 +1,205 @@
+// ============ Parser Referensi Protokol Biner Kamera -> Arduino ================
+// Pasangan dari main/protocol.py. Format frame harus sama persis dengan di sana.
+//
+// Contoh pemakaian di sketch:
+//
+//   #include "robot_protocol.h"
+//   RobotFrameParser parser;
+//
+//   void loop() {
+//     while (Serial.available()) {
+//       if (parser.feed(Serial.read())) {
+//         const RobotFrame &f = parser.frame();
+//         if (f.type == ROBOT_FRAME_TARGETS && f.targetCount() > 0) {
+//           RobotTarget t = f.target(0);
+//           // t.x, t.y dalam piksel kamera
+//         } else if (f.type == ROBOT_FRAME_FIELD && f.targetCount() > 0) {
+//           RobotFieldTarget t = f.fieldTarget(0);
+//           // t.distanceCm, t.bearingDeci (0,1 derajat, + = kanan)
+//         }
+//       }
+//     }
+//   }
+
+#ifndef ROBOT_PROTOCOL_H
+#define ROBOT_PROTOCOL_H
+
+#include <stdint.h>
+#include <string.h>
+
+#define ROBOT_SYNC 0xA5
+#define ROBOT_VERSION 1
+#define ROBOT_FRAME_TARGETS 0x1
+#define ROBOT_FRAME_COMMAND 0x2
+#define ROBOT_FRAME_FIELD 0x3
+#define ROBOT_HEADER_SIZE 6
+#define ROBOT_TARGET_SIZE 6
+#define ROBOT_CRC_SIZE 2
+// Boleh diperkecil sebelum #include untuk menghemat RAM; frame yang lebih panjang ditolak
+#ifndef ROBOT_MAX_PAYLOAD
+#define ROBOT_MAX_PAYLOAD 255
+#endif
+#define ROBOT_BUFFER_SIZE (ROBOT_HEADER_SIZE + ROBOT_MAX_PAYLOAD + ROBOT_CRC_SIZE)
+
+struct RobotTarget {
+  int16_t x;
+  int16_t y;
+  uint8_t camera;
+  uint8_t classId;
+  uint8_t confidence;  // 0..255
+};
+
+struct RobotFieldTarget {
+  uint16_t distanceCm;
+  int16_t bearingDeci;  // 0,1 derajat, + = kanan
+  uint8_t camera;
+  uint8_t classId;
+  uint8_t confidence;  // 0..255
+};
+
+struct RobotFrame {
+  uint8_t version;
+  uint8_t type;
+  uint8_t seq;
+  uint16_t timestamp;  // milidetik capture di PC, berputar
+  uint8_t length;
+  const uint8_t *payload;  // Menunjuk ke buffer parser, berlaku sampai feed() berikutnya
+
+  uint8_t targetCount() const { return length / ROBOT_TARGET_SIZE; }
+
+  RobotTarget target(uint8_t i) const {
+    const uint8_t *p = payload + i * ROBOT_TARGET_SIZE;
+    RobotTarget t;
+    t.x = (int16_t)(p[0] | (p[1] << 8));
+    t.y = (int16_t)(p[2] | (p[3] << 8));
+    t.camera = p[4] >> 4;
+    t.classId = p[4] & 0x0F;
+    t.confidence = p[5];
+    return t;
+  }
+
+  RobotFieldTarget fieldTarget(uint8_t i) const {
+    const uint8_t *p = payload + i * ROBOT_TARGET_SIZE;
+    RobotFieldTarget t;
+    t.distanceCm = (uint16_t)(p[0] | (p[1] << 8));
+    t.bearingDeci = (int16_t)(p[2] | (p[3] << 8));
+    t.camera = p[4] >> 4;
+    t.classId = p[4] & 0x0F;
+    t.confidence = p[5];
+    return t;
+  }
+};
+
+// CRC-16/CCITT-FALSE tanpa tabel agar hemat RAM di mikrokontroler
+static inline uint16_t robotCrc16Update(uint16_t crc, uint8_t b) {
+  crc ^= (uint16_t)b << 8;
+  for (uint8_t i = 0; i < 8; i++) {
+    crc = (crc & 0x8000) ? (uint16_t)((crc << 1) ^ 0x1021) : (uint16_t)(crc << 1);
+  }
+  return crc;
+}
+
+// Panjang payload yang mungkin untuk tiap tipe frame. Header dengan panjang mustahil
+// berarti SYNC palsu, jadi parser tidak perlu menunggu sampai 255 byte untuk tahu
+static inline bool robotLengthValid(uint8_t type, uint8_t length) {
+  if (length > ROBOT_MAX_PAYLOAD) return false;
+  if (type == ROBOT_FRAME_TARGETS || type == ROBOT_FRAME_FIELD) return length % ROBOT_TARGET_SIZE == 0;
+  return type == ROBOT_FRAME_COMMAND;
+}
+
+class RobotFrameParser {
+ public:
+  RobotFrameParser() { reset(); }
+
+  // Masukkan satu byte. Mengembalikan true jika satu frame valid selesai diterima;
+  // frame() berlaku sampai feed() berikutnya.
+  //
+  // Byte sejak SYNC disimpan di buffer. Jika header mustahil atau CRC salah, hanya
+  // SYNC itu yang dibuang dan byte sisanya dipindai ulang mencari SYNC berikutnya,
+  // sama seperti FrameParser di protocol.py. Frame yang ditemukan utuh saat pindai
+  // ulang dilaporkan pada feed() berikutnya.
+  bool feed(uint8_t b) {
+    if (consumed_) {
+      drop_(consumed_);
+      consumed_ = 0;
+    }
+    if (count_ == 0 && b != ROBOT_SYNC) return false;  // Sampah di antara frame
+    buf_[count_++] = b;
+    return parse_();
+  }
+
+  const RobotFrame &frame() const { return frame_; }
+
+  void reset() {
+    count_ = 0;
+    consumed_ = 0;
+    crcErrors = 0;
+    lengthErrors = 0;
+  }
+
+  uint16_t crcErrors;
+  uint16_t lengthErrors;
+
+ private:
+  bool parse_() {
+    while (count_ > 0) {
+      if (buf_[0] != ROBOT_SYNC) {
+        resync_();
+        continue;
+      }
+      if (count_ < 2) return false;
+      if ((buf_[1] >> 4) != ROBOT_VERSION) {
+        resync_();  // SYNC palsu: versi tidak cocok
+        continue;
+      }
+      if (count_ < ROBOT_HEADER_SIZE) return false;
+      uint8_t type = buf_[1] & 0x0F;
+      uint8_t length = buf_[5];
+      if (!robotLengthValid(type, length)) {
+        lengthErrors++;
+        resync_();
+        continue;
+      }
+      uint16_t total = ROBOT_HEADER_SIZE + length + ROBOT_CRC_SIZE;
+      if (count_ < total) return false;
+
+      uint16_t crc = 0xFFFF;
+      for (uint16_t i = 1; i < ROBOT_HEADER_SIZE + length; i++) crc = robotCrc16Update(crc, buf_[i]);
+      uint16_t received = buf_[total - 2] | ((uint16_t)buf_[total - 1] << 8);
+      if (received != crc) {
+        crcErrors++;
+        resync_();
+        continue;
+      }
+
+      frame_.version = buf_[1] >> 4;
+      frame_.type = type;
+      frame_.seq = buf_[2];
+      frame_.timestamp = buf_[3] | ((uint16_t)buf_[4] << 8);
+      frame_.length = length;
+      frame_.payload = buf_ + ROBOT_HEADER_SIZE;
+      consumed_ = total;  // Dibuang saat feed() berikutnya, payload tetap valid sampai saat itu
+      return true;
+    }
+    return false;
+  }
+
+  // Buang SYNC di awal buffer lalu geser ke SYNC berikutnya (jika ada)
+  void resync_() {
+    uint16_t i = 1;
+    while (i < count_ && buf_[i] != ROBOT_SYNC) i++;
+    drop_(i);
+  }
+
+  void drop_(uint16_t n) {
+    memmove(buf_, buf_ + n, count_ - n);
+    count_ -= n;
+  }
+
+  uint8_t buf_[ROBOT_BUFFER_SIZE];
+  uint16_t count_;
+  uint16_t consumed_;
+  RobotFrame frame_;
+};
+
+#endif  // ROBOT_PROTOCOL_H
@@ -0,0 +1,127 @@
+# ============ Program Perbandingan Engine Inferensi ================
+# Program ini membandingkan FPS dan akurasi backend ONNX / OpenVINO (FP32 & INT8)
+# terhadap model .pt asli pada frame rekaman yang sama
+#
+# Contoh:
+#   python benchmark_engine.py --source rekaman/ --backends pytorch onnx openvino --int8
+
+"""
+Library yang digunakan
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from engine import InferenceEngine, exported_path
+from export_model import load_frames
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark backend inferensi YOLOv8")
+    parser.add_argument("--source", required=True, help="Folder gambar atau file video rekaman")
+    parser.add_argument("--weights", default="best_ball4.pt", help="Model .pt asli (referensi)")
+    parser.add_argument("--backends", default=["pytorch", "onnx", "openvino"], nargs="+", help="Backend yang diuji")
+    parser.add_argument("--int8", action="store_true", help="Ikut uji varian INT8")
+    parser.add_argument("--frames", default=200, type=int, help="Jumlah frame uji")
+    parser.add_argument("--imgsz", default=640, type=int, help="Ukuran input model")
+    parser.add_argument("--iou", default=0.5, type=float, help="IoU minimal agar box dianggap sama")
+    return parser.parse_args()
+
+
+def box_iou(a, b):
+    """
+    IoU semua pasangan box, a (N, 4) dan b (M, 4) -> (N, M).
+    """
+    lt = np.maximum(a[:, None, :2], b[None, :, :2])
+    rb = np.minimum(a[:, None, 2:4], b[None, :, 2:4])
+    inter = np.prod(np.clip(rb - lt, 0, None), axis=2)
+    area_a = np.prod(a[:, 2:4] - a[:, :2], axis=1)
+    area_b = np.prod(b[:, 2:4] - b[:, :2], axis=1)
+    return inter / (area_a[:, None] + area_b[None, :] - inter + 1e-9)
+
+
+def compare(reference, candidate, iou_min):
+    """
+    Cocokkan deteksi kandidat dengan deteksi referensi (.pt) secara greedy per frame.
+
+    :return: dict recall, precision, mean IoU, dan rata-rata selisih titik tengah (piksel)
+    """
+    tp = n_ref = n_cand = 0
+    ious, center_err = [], []
+    for ref, cand in zip(reference, candidate):
+        n_ref += len(ref)
+        n_cand += len(cand)
+        if not len(ref) or not len(cand):
+            continue
+        iou = box_iou(ref, cand)
+        while iou.size and iou.max() >= iou_min:
+            i, j = np.unravel_index(np.argmax(iou), iou.shape)
+            tp += 1
+            ious.append(iou[i, j])
+            c_ref = (ref[i, :2] + ref[i, 2:4]) / 2
+            c_cand = (cand[j, :2] + cand[j, 2:4]) / 2
+            center_err.append(float(np.hypot(*(c_ref - c_cand))))
+            iou[i, :] = -1
+            iou[:, j] = -1
+    return {
+        "recall": tp / n_ref if n_ref else 1.0,
+        "precision": tp / n_cand if n_cand else 1.0,
+        "mean_iou": float(np.mean(ious)) if ious else 0.0,
+        "center_err_px": float(np.mean(center_err)) if center_err else 0.0,
+    }
+
+
+def run_engine(engine, frames):
+    """
+    Jalankan engine pada semua frame.
+
+    :return: (fps, list boxes per frame)
+    """
+    for frame in frames[:5]:  # Warm-up, tidak dihitung
+        engine.predict(frame)
+    hasil = []
+    mulai = time.perf_counter()
+    for frame in frames:
+        boxes, _, _ = engine.predict(frame)
+        hasil.append(boxes)
+    durasi = time.perf_counter() - mulai
+    return len(frames) / durasi, hasil
+
+
+def main():
+    args = parse_arguments()
+    frames = load_frames(args.source, args.frames)
+    if not frames:
+        print(f"Tidak ada frame di {args.source}")
+        return
+    print(f"[Benchmark] {len(frames)} frame dari {args.source}")
+
+    varian = []
+    for backend in args.backends:
+        varian.append((backend, False))
+        if args.int8 and backend != "pytorch":
+            varian.append((backend, True))
+
+    # Model .pt selalu dijalankan sebagai referensi akurasi
+    fps_ref, reference = run_engine(InferenceEngine(args.weights, "pytorch", imgsz=args.imgsz), frames)
+
+    print(f"{'backend':<16}{'FPS':>8}{'speedup':>9}{'recall':>8}{'prec':>8}{'IoU':>7}{'err px':>8}")
+    for backend, int8 in varian:
+        nama = backend + (" int8" if int8 else "")
+        if backend == "pytorch":
+            fps, hasil = fps_ref, reference
+        else:
+            path = exported_path(args.weights, backend, int8)
+            if not os.path.exists(path):
+                print(f"{nama:<16} dilewati, {path} belum di-export")
+                continue
+            fps, hasil = run_engine(InferenceEngine(args.weights, backend, int8, imgsz=args.imgsz), frames)
+        skor = compare(reference, hasil, args.iou)
+        print(f"{nama:<16}{fps:>8.1f}{fps / fps_ref:>8.2f}x{skor['recall']:>8.3f}{skor['precision']:>8.3f}"
+              f"{skor['mean_iou']:>7.3f}{skor['center_err_px']:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
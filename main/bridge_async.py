@@ -0,0 +1,197 @@
+# ============ Module Bridge Basestation (asyncio) ================
+# Program ini berisi jembatan UDP basestation (VB.NET) <-> serial Arduino berbasis asyncio
+# Satu event loop menggantikan thread recvfrom() dan loop "while True: pass"
+
+"""
+Library yang digunakan
+"""
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from metrics import REGISTRY
+from ringlog import LOG
+from protocol import FrameEncoder
+
+
+class BasestationProtocol(asyncio.DatagramProtocol):
+    """
+    Penerima datagram UDP dari basestation. Setiap perintah langsung dimasukkan
+    ke antrian bridge beserta waktu terimanya.
+    """
+    def __init__(self, bridge):
+        self.bridge = bridge
+
+    def datagram_received(self, data, addr):
+        self.bridge._terima(data, addr)
+
+    def error_received(self, exc):
+        LOG.error("bridge", "UDP error: %s", exc)
+
+
+class AsyncSerial:
+    """
+    Transport serial async di atas SerialHub. Penulisan dijalankan di satu thread
+    executor (urutan tetap terjaga), pesan masuk dari thread pembaca hub diteruskan
+    ke event loop dengan call_soon_threadsafe.
+    """
+    def __init__(self, hub, loop):
+        """
+        :param hub: SerialHub yang sudah dibuka
+        :param loop: event loop yang menjalankan bridge
+        """
+        self.hub = hub
+        self.loop = loop
+        self.incoming = asyncio.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="serial-write")
+        self._callback = hub.subscribe(self._dari_hub)
+
+    def _dari_hub(self, pesan):
+        self.loop.call_soon_threadsafe(self.incoming.put_nowait, pesan)
+
+    async def write(self, data):
+        await self.loop.run_in_executor(self._executor, self.hub.write, data)
+
+    def close(self):
+        self.hub.unsubscribe(self._callback)
+        self._executor.shutdown(wait=False)
+
+
+class BasestationBridge:
+    """
+    Jembatan basestation -> Arduino. Perintah yang datang beruntun selama penulisan
+    sebelumnya masih berjalan digabung menjadi satu write, dan latensi setiap perintah
+    (datagram diterima -> selesai ditulis ke serial) dicatat.
+    """
+    def __init__(self, hub, udp_port=28098, protocol="ascii", host="0.0.0.0", on_arduino=None,
+                 on_control=None, control_prefix="!"):
+        """
+        :param hub: SerialHub ke Arduino, atau None jika Arduino tidak terhubung
+        :param udp_port: port UDP basestation
+        :param protocol: "ascii" (perintah + ">") atau "binary" (protocol.FrameEncoder)
+        :param host: alamat bind UDP
+        :param on_arduino: callback pesan dari Arduino, None = print
+        :param on_control: callback perintah kontrol, contoh on_control("stop") untuk datagram
+                           "!stop"; None = semua datagram diteruskan ke Arduino
+        :param control_prefix: awalan datagram perintah kontrol
+        """
+        self.hub = hub
+        self.udp_port = udp_port
+        self.host = host
+        self.encoder = FrameEncoder() if protocol == "binary" else None
+        self.on_arduino = on_arduino or (lambda pesan: LOG.summary("arduino", "balasan", "Arduino => %s", pesan))
+        self.on_control = on_control if control_prefix else None
+        self.control_prefix = control_prefix.encode() if control_prefix else b""
+
+        self._queue = None
+        self._loop = None
+        self._task = None
+
+        # Statistik
+        self.perintah = 0
+        self.batch = 0
+        self.latensi = deque(maxlen=512)  # detik, perintah terbaru
+        self.latensi_max = 0.0
+        REGISTRY.register_collector("bridge", self.stats)
+
+    def _terima(self, data, addr):
+        if self.on_control is not None and data.startswith(self.control_prefix):
+            # Perintah untuk program ini sendiri (misalnya "!stop"), bukan untuk Arduino
+            perintah = data[len(self.control_prefix):].decode(errors="replace").strip().lower()
+            LOG.info("bridge", "Perintah kontrol dari %s: %s", addr[0], perintah)
+            self.on_control(perintah)
+            return
+        self._queue.put_nowait((time.monotonic(), data))
+
+    def _encode(self, data):
+        msg = data.decode(errors="replace").strip()
+        LOG.summary("bridge", "perintah", "VB.NET => %s", msg)
+        if self.encoder is not None:
+            return self.encoder.encode_command(msg)
+        if not msg.endswith(">"):
+            msg += ">"
+        return msg.encode()
+
+    async def run(self):
+        """
+        Jalankan bridge sampai dibatalkan (Ctrl+C / stop()).
+        """
+        self._loop = asyncio.get_running_loop()
+        self._task = asyncio.current_task()
+        self._queue = asyncio.Queue()
+
+        transport, _ = await self._loop.create_datagram_endpoint(
+            lambda: BasestationProtocol(self), local_addr=(self.host, self.udp_port))
+        serial_async = AsyncSerial(self.hub, self._loop) if self.hub else None
+        tasks = [asyncio.create_task(self._forward(serial_async), name="bridge-forward")]
+        if serial_async is not None:
+            tasks.append(asyncio.create_task(self._baca_arduino(serial_async), name="bridge-arduino"))
+
+        LOG.info("bridge", "Mendengarkan basestation di UDP %d", self.udp_port)
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for t in tasks:
+                t.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            transport.close()
+            if serial_async is not None:
+                serial_async.close()
+            LOG.info("bridge", "Berhenti. %s", self.stats())
+
+    def stop(self):
+        """
+        Hentikan bridge. Aman dipanggil dari thread lain.
+        """
+        if self._loop is not None and self._task is not None:
+            self._loop.call_soon_threadsafe(self._task.cancel)
+
+    async def _forward(self, serial_async):
+        while True:
+            item = await self._queue.get()
+            # Ambil semua perintah yang sudah menunggu: satu write untuk satu burst
+            burst = [item]
+            while not self._queue.empty():
+                burst.append(self._queue.get_nowait())
+
+            payload = b"".join(self._encode(data) for _, data in burst)
+            if serial_async is not None:
+                try:
+                    await serial_async.write(payload)
+                except Exception as e:
+                    LOG.error("bridge", "Kirim serial gagal: %s", e)
+                    continue
+
+            selesai = time.monotonic()
+            for t_terima, _ in burst:
+                latensi = selesai - t_terima
+                REGISTRY.observe("udp_forward", latensi)
+                self.latensi.append(latensi)
+                if latensi > self.latensi_max:
+                    self.latensi_max = latensi
+            self.perintah += len(burst)
+            self.batch += 1
+
+    async def _baca_arduino(self, serial_async):
+        while True:
+            pesan = await serial_async.incoming.get()
+            self.on_arduino(pesan)
+
+    def stats(self):
+        """
+        :return: dict jumlah perintah, jumlah write (batch), dan latensi forward dalam ms
+        """
+        data = sorted(self.latensi)
+        if data:
+            p50 = data[len(data) // 2]
+            p95 = data[min(len(data) - 1, int(len(data) * 0.95))]
+        else:
+            p50 = p95 = 0.0
+        return {
+            "perintah": self.perintah,
+            "batch": self.batch,
+            "latensi_p50_ms": round(p50 * 1000, 3),
+            "latensi_p95_ms": round(p95 * 1000, 3),
+            "latensi_max_ms": round(self.latensi_max * 1000, 3),
+        }
@@ -0,0 +1,87 @@
+# ============ Module Pool Buffer Frame ================
+# Program ini menyediakan buffer gambar yang dialokasikan sekali lalu dipakai ulang,
+# sehingga loop deteksi tidak membuat array baru untuk setiap frame kamera
+# (capture menulis langsung ke buffer pool, preview menulis ke buffer resize tetap)
+
+"""
+Library yang digunakan
+"""
+import threading
+
+import cv2
+import numpy as np
+
+
+class FramePool:
+    """
+    Kumpulan buffer gambar berukuran sama. acquire() mengambil buffer bebas, release()
+    mengembalikannya setelah frame selesai dipakai. Buffer hanya dialokasikan baru jika
+    semua buffer sedang dipegang stage lain, jadi pada kondisi stabil alokasinya nol.
+    """
+    def __init__(self, shape, count=4, dtype=np.uint8):
+        """
+        :param shape: bentuk gambar (h, w, 3)
+        :param count: jumlah buffer awal, minimal jumlah frame yang bisa berada di pipeline
+                      sekaligus (capture + slot + deteksi + output)
+        :param dtype: tipe data gambar
+        """
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self._lock = threading.Lock()
+        self._bebas = [np.empty(self.shape, self.dtype) for _ in range(count)]
+        self.dibuat = count
+        self.tambahan = 0  # Buffer yang dialokasikan karena pool kosong
+
+    def acquire(self):
+        """
+        :return: buffer bebas (isinya sisa frame lama, akan ditimpa)
+        """
+        with self._lock:
+            if self._bebas:
+                return self._bebas.pop()
+            self.dibuat += 1
+            self.tambahan += 1
+        return np.empty(self.shape, self.dtype)
+
+    def release(self, buffer):
+        """
+        Kembalikan buffer ke pool. Array yang bukan berasal dari pool (ukuran lain,
+        misalnya driver mengganti resolusi) diabaikan saja.
+
+        :param buffer: array dari acquire()
+        """
+        if buffer is None or buffer.shape != self.shape or buffer.dtype != self.dtype:
+            return
+        with self._lock:
+            self._bebas.append(buffer)
+
+    def metrics(self):
+        """
+        :return: dict jumlah buffer, yang sedang bebas, dan alokasi tambahan
+        """
+        with self._lock:
+            return {"buffer": self.dibuat, "bebas": len(self._bebas), "tambahan": self.tambahan}
+
+
+class ResizeBuffer:
+    """
+    Tujuan cv2.resize yang dialokasikan sekali. Dipakai untuk preview yang ukurannya
+    tetap, sehingga tiap frame tidak membuat array hasil resize baru.
+    """
+    def __init__(self, size):
+        """
+        :param size: ukuran hasil (width, height)
+        """
+        self.size = (int(size[0]), int(size[1]))
+        self._dst = None
+
+    def resize(self, image):
+        """
+        :param image: gambar sumber
+        :return: gambar hasil resize (array yang sama setiap panggilan, jangan disimpan)
+        """
+        shape = (self.size[1], self.size[0]) + image.shape[2:]
+        if self._dst is None or self._dst.shape != shape or self._dst.dtype != image.dtype:
+            self._dst = np.empty(shape, image.dtype)
+        cv2.resize(image, self.size, dst=self._dst)
+        return self._dst
@@ -0,0 +1,320 @@
+# ============ Module Kalibrasi Kamera dan Lantai Lapangan ================
+# Program ini menghitung intrinsik kamera (checkerboard) dan homography lantai
+# (checkerboard di lantai atau titik tanda lapangan), lalu saat startup membakarnya
+# menjadi tabel remap dan tabel piksel -> (jarak, arah) sehingga tiap target cukup satu lookup
+
+"""
+Library yang digunakan
+"""
+import argparse
+import glob
+import json
+import os
+import time
+
+import cv2
+import numpy as np
+
+from ringlog import LOG
+
+CALIBRATION_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "camera_calibration.json")
+
+
+def find_checkerboard(image, pattern=(9, 6)):
+    """
+    Cari sudut dalam checkerboard dengan presisi sub-piksel.
+
+    :param image: gambar BGR
+    :param pattern: jumlah sudut dalam (kolom, baris)
+    :return: array (N, 2) float32 sudut urut baris, atau None jika tidak ditemukan
+    """
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    ok, corners = cv2.findChessboardCorners(gray, pattern, None)
+    if not ok:
+        return None
+    kriteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 30, 0.001)
+    corners = cv2.cornerSubPix(gray, corners, (11, 11), (-1, -1), kriteria)
+    return corners.reshape(-1, 2)
+
+
+def calibrate_intrinsics(images, pattern=(9, 6), square_mm=25.0):
+    """
+    Hitung matriks kamera dan koefisien distorsi dari beberapa foto checkerboard.
+
+    :param images: list gambar BGR (checkerboard dari berbagai sudut dan posisi)
+    :param pattern: jumlah sudut dalam (kolom, baris)
+    :param square_mm: sisi satu kotak checkerboard (mm)
+    :return: dict resolution, camera_matrix, dist_coeffs, rms, foto
+    """
+    objp = np.zeros((pattern[0] * pattern[1], 3), np.float32)
+    objp[:, :2] = np.mgrid[0:pattern[0], 0:pattern[1]].T.reshape(-1, 2) * square_mm
+
+    obj_points, img_points = [], []
+    for image in images:
+        corners = find_checkerboard(image, pattern)
+        if corners is not None:
+            obj_points.append(objp)
+            img_points.append(corners)
+    if len(img_points) < 3:
+        raise ValueError(f"Checkerboard hanya ditemukan di {len(img_points)} foto, minimal 3")
+
+    height, width = images[0].shape[:2]
+    rms, camera_matrix, dist_coeffs, _, _ = cv2.calibrateCamera(
+        obj_points, img_points, (width, height), None, None)
+    return {
+        "resolution": [width, height],
+        "camera_matrix": camera_matrix.tolist(),
+        "dist_coeffs": dist_coeffs.ravel().tolist(),
+        "rms": float(rms),
+        "foto": len(img_points),
+    }
+
+
+def ground_homography(pixel_points, field_points, camera_matrix=None, dist_coeffs=None):
+    """
+    Hitung homography dari piksel (tanpa distorsi) ke lantai lapangan.
+
+    :param pixel_points: array (N, 2) piksel di gambar kamera mentah, N >= 4
+    :param field_points: array (N, 2) posisi titik yang sama di lantai (mm), X ke kanan
+                         dan Y ke depan, diukur dari titik lantai tepat di bawah kamera
+    :param camera_matrix: matriks kamera; jika diisi, piksel dihilangkan distorsinya dulu
+    :param dist_coeffs: koefisien distorsi
+    :return: array (3, 3) homography
+    """
+    pixel_points = np.asarray(pixel_points, np.float32).reshape(-1, 1, 2)
+    if camera_matrix is not None:
+        K = np.asarray(camera_matrix, np.float64)
+        pixel_points = cv2.undistortPoints(pixel_points, K, np.asarray(dist_coeffs, np.float64), P=K)
+    H, _ = cv2.findHomography(pixel_points, np.asarray(field_points, np.float32), cv2.RANSAC, 5.0)
+    if H is None:
+        raise ValueError("Homography tidak bisa dihitung, periksa pasangan titik")
+    return H
+
+
+def floor_checkerboard_points(image, pattern=(9, 6), square_mm=25.0, origin_mm=(0.0, 300.0)):
+    """
+    Pasangan titik piksel -> lantai dari checkerboard yang diletakkan datar di lantai.
+    Sudut pertama dianggap sudut kiri-dekat papan, kolom ke kanan dan baris menjauh;
+    urutan hasil findChessboardCorners dibalik jika perlu.
+
+    :param origin_mm: posisi sudut kiri-dekat di lantai (X, Y) dalam mm
+    :return: (pixel_points, field_points)
+    """
+    corners = find_checkerboard(image, pattern)
+    if corners is None:
+        raise ValueError("Checkerboard di lantai tidak ditemukan")
+    grid = corners.reshape(pattern[1], pattern[0], 2)
+    # Baris dekat ada di bawah gambar (y besar), kolom kiri di kiri gambar (x kecil)
+    if grid[0, 0, 1] < grid[-1, 0, 1]:
+        grid = grid[::-1]
+    if grid[0, 0, 0] > grid[0, -1, 0]:
+        grid = grid[:, ::-1]
+
+    kolom, baris = np.meshgrid(np.arange(pattern[0]), np.arange(pattern[1]))
+    field = np.stack([origin_mm[0] + kolom * square_mm, origin_mm[1] + baris * square_mm], axis=-1)
+    return grid.reshape(-1, 2), field.reshape(-1, 2).astype(np.float32)
+
+
+def load_calibration(path=CALIBRATION_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_calibration(data, path=CALIBRATION_PATH):
+    """
+    Gabungkan data ke file kalibrasi (intrinsik dan homography disimpan bertahap).
+    """
+    kalibrasi = dict(load_calibration(path), **data, waktu=time.strftime("%Y-%m-%d %H:%M:%S"))
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(kalibrasi, f, indent=2)
+    os.replace(tmp, path)
+    return kalibrasi
+
+
+class FieldMap:
+    """
+    Tabel hasil kalibrasi yang dihitung sekali saat startup:
+    - map remap untuk menghilangkan distorsi frame (cv2.remap),
+    - jarak (mm) dan arah (derajat, + = kanan) ke titik lantai untuk setiap piksel.
+    lookup() hanya mengindeks array, tanpa undistort / homography / trigonometri per frame.
+    """
+    def __init__(self, calibration, resolution, step=2, max_distance_mm=12000, undistorted_input=False):
+        """
+        :param calibration: dict dari file kalibrasi (camera_matrix, dist_coeffs, homography, resolution)
+        :param resolution: resolusi frame yang akan di-lookup (width, height)
+        :param step: tabel disimpan tiap `step` piksel (2 = seperempat memori, galat < 1 piksel)
+        :param max_distance_mm: titik lebih jauh dari ini (dekat horizon) dianggap tidak valid
+        :param undistorted_input: True jika piksel yang di-lookup berasal dari frame yang sudah di-remap
+        """
+        if "homography" not in calibration:
+            raise ValueError("Kalibrasi belum berisi homography lantai")
+        width, height = resolution
+        self.resolution = (width, height)
+        self.step = step
+
+        H = np.asarray(calibration["homography"], np.float64)
+        K = dist = None
+        if "camera_matrix" in calibration:
+            K = np.asarray(calibration["camera_matrix"], np.float64).copy()
+            dist = np.asarray(calibration["dist_coeffs"], np.float64)
+            # Intrinsik mengikuti resolusi saat kalibrasi; skala jika kamera dibuka di resolusi lain
+            kal_w, kal_h = calibration.get("resolution", resolution)
+            K[0] *= width / float(kal_w)
+            K[1] *= height / float(kal_h)
+
+        self.map1 = self.map2 = None
+        if K is not None:
+            self.map1, self.map2 = cv2.initUndistortRectifyMap(K, dist, None, K, (width, height), cv2.CV_16SC2)
+
+        # Tengah sel tabel dalam koordinat piksel
+        xs = np.arange(0, width, step, dtype=np.float32) + (step - 1) / 2.0
+        ys = np.arange(0, height, step, dtype=np.float32) + (step - 1) / 2.0
+        gx, gy = np.meshgrid(xs, ys)
+        pts = np.stack([gx, gy], axis=-1).reshape(-1, 1, 2)
+        # Homography dihitung pada piksel tanpa distorsi jika intrinsik sudah ada saat itu
+        if K is not None and calibration.get("homography_undistorted", True) and not undistorted_input:
+            pts = cv2.undistortPoints(pts, K, dist, P=K)
+        pts = pts.reshape(-1, 2).astype(np.float64)
+        # Homography berlaku pada resolusi foto kalibrasinya
+        hom_w, hom_h = calibration.get("homography_resolution", resolution)
+        pts[:, 0] *= hom_w / float(width)
+        pts[:, 1] *= hom_h / float(height)
+
+        # Homography manual agar titik di atas horizon (w <= 0) bisa ditandai
+        w = H[2, 0] * pts[:, 0] + H[2, 1] * pts[:, 1] + H[2, 2]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            fx = (H[0, 0] * pts[:, 0] + H[0, 1] * pts[:, 1] + H[0, 2]) / w
+            fy = (H[1, 0] * pts[:, 0] + H[1, 1] * pts[:, 1] + H[1, 2]) / w
+        distance = np.hypot(fx, fy)
+        bearing = np.degrees(np.arctan2(fx, fy))
+        invalid = (w <= 0) | (fy <= 0) | (distance > max_distance_mm)
+        distance[invalid] = np.nan
+        bearing[invalid] = np.nan
+
+        shape = (len(ys), len(xs))
+        self.distance = distance.reshape(shape).astype(np.float32)
+        self.bearing = bearing.reshape(shape).astype(np.float32)
+
+    @classmethod
+    def load(cls, field_config, resolution):
+        """
+        Bangun tabel dari bagian "field" di config.json.
+        """
+        path = field_config.get("calibration") or CALIBRATION_PATH
+        if not os.path.isabs(path):
+            path = os.path.join(os.path.dirname(os.path.abspath(__file__)), path)
+        calibration = load_calibration(path)
+        if not calibration:
+            raise ValueError(f"File kalibrasi {path} tidak ada, jalankan calibration.py dulu")
+        mulai = time.perf_counter()
+        field_map = cls(calibration, resolution, step=field_config.get("step", 2),
+                        max_distance_mm=field_config.get("max_distance_mm", 12000))
+        LOG.info("field", "Tabel jarak/arah %dx%d dibangun dalam %.0f ms dari %s",
+                 field_map.distance.shape[1], field_map.distance.shape[0],
+                 1000 * (time.perf_counter() - mulai), path)
+        return field_map
+
+    def lookup(self, x, y):
+        """
+        :param x: piksel x (misalnya titik tengah bawah box bola = titik sentuh lantai)
+        :param y: piksel y
+        :return: (jarak_mm, arah_derajat), atau None jika titik tidak di lantai
+        """
+        i = min(max(int(y) // self.step, 0), self.distance.shape[0] - 1)
+        j = min(max(int(x) // self.step, 0), self.distance.shape[1] - 1)
+        distance = self.distance[i, j]
+        if distance != distance:  # NaN
+            return None
+        return float(distance), float(self.bearing[i, j])
+
+    def undistort(self, frame):
+        """
+        Hilangkan distorsi lensa dengan map yang sudah dihitung (tanpa intrinsik = apa adanya).
+        """
+        if self.map1 is None:
+            return frame
+        return cv2.remap(frame, self.map1, self.map2, cv2.INTER_LINEAR)
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Kalibrasi intrinsik kamera dan homography lantai")
+    sub = parser.add_subparsers(dest="mode", required=True)
+
+    intr = sub.add_parser("intrinsics", help="Intrinsik dari foto checkerboard")
+    intr.add_argument("images", nargs="+", help="Foto checkerboard (boleh pola glob)")
+
+    ground = sub.add_parser("ground", help="Homography dari checkerboard yang diletakkan di lantai")
+    ground.add_argument("image", help="Foto kamera robot dengan checkerboard di lantai")
+    ground.add_argument("--origin", default=[0.0, 300.0], nargs=2, type=float,
+                        help="Posisi sudut kiri-dekat papan di lantai (X Y, mm)")
+
+    marks = sub.add_parser("marks", help="Homography dari titik tanda lapangan")
+    marks.add_argument("points", help='JSON {"pixels": [[u, v], ...], "field_mm": [[x, y], ...]}')
+    marks.add_argument("--resolution", default=[1280, 720], nargs=2, type=int,
+                       help="Resolusi gambar tempat piksel diukur (width height)")
+
+    check = sub.add_parser("check", help="Simpan foto tanpa distorsi + jarak/arah di grid untuk dicek manual")
+    check.add_argument("image", help="Foto dari kamera robot")
+
+    for p in (intr, ground):
+        p.add_argument("--pattern", default=[9, 6], nargs=2, type=int, help="Sudut dalam checkerboard (kolom baris)")
+        p.add_argument("--square", default=25.0, type=float, help="Sisi kotak checkerboard (mm)")
+    parser.add_argument("--output", default=CALIBRATION_PATH, help="File kalibrasi")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+    kalibrasi = load_calibration(args.output)
+    K, dist = kalibrasi.get("camera_matrix"), kalibrasi.get("dist_coeffs")
+
+    if args.mode == "check":
+        image = cv2.imread(args.image)
+        field_map = FieldMap(kalibrasi, (image.shape[1], image.shape[0]))
+        for y in range(image.shape[0] // 2, image.shape[0], image.shape[0] // 8):
+            for x in range(image.shape[1] // 16, image.shape[1], image.shape[1] // 8):
+                hasil = field_map.lookup(x, y)
+                if hasil is not None:
+                    cv2.circle(image, (x, y), 3, (0, 0, 255), -1)
+                    cv2.putText(image, f"{hasil[0] / 10:.0f}cm {hasil[1]:+.0f}", (x + 4, y - 4),
+                                cv2.FONT_HERSHEY_SIMPLEX, 0.4, (0, 0, 255), 1)
+        base = os.path.splitext(args.image)[0]
+        cv2.imwrite(base + "_grid.jpg", image)
+        cv2.imwrite(base + "_undistort.jpg", field_map.undistort(cv2.imread(args.image)))
+        print(f"Disimpan {base}_grid.jpg dan {base}_undistort.jpg")
+        return
+
+    if args.mode == "intrinsics":
+        paths = [p for pola in args.images for p in sorted(glob.glob(pola))]
+        hasil = calibrate_intrinsics([cv2.imread(p) for p in paths], tuple(args.pattern), args.square)
+        print(f"Intrinsik dari {hasil['foto']}/{len(paths)} foto, galat reproyeksi {hasil['rms']:.3f} px")
+        if "homography" in kalibrasi:
+            print("Peringatan: homography lama dihitung dengan intrinsik sebelumnya, ulangi mode ground / marks")
+    else:
+        if args.mode == "ground":
+            image = cv2.imread(args.image)
+            pixels, field = floor_checkerboard_points(image, tuple(args.pattern), args.square, tuple(args.origin))
+            resolution = [image.shape[1], image.shape[0]]
+        else:
+            with open(args.points, encoding="utf-8") as f:
+                titik = json.load(f)
+            pixels, field = titik["pixels"], titik["field_mm"]
+            resolution = args.resolution
+        if K is not None and list(kalibrasi.get("resolution", resolution)) != list(resolution):
+            raise SystemExit("Resolusi foto lantai berbeda dengan foto intrinsik, samakan resolusinya")
+        hasil = {"homography": ground_homography(pixels, field, K, dist).tolist(),
+                 "homography_undistorted": K is not None,
+                 "homography_resolution": resolution}
+        if K is None:
+            print("Peringatan: intrinsik belum ada, homography dihitung tanpa koreksi distorsi")
+        print(f"Homography lantai dari {len(pixels)} titik")
+
+    save_calibration(hasil, args.output)
+    print(f"Disimpan ke {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+# ============ Module Pencarian Kamera ================
+# Program ini mencari kamera yang terpasang secara paralel (dengan batas waktu per device),
+# mencatat kemampuan tiap kamera, dan menyimpan pemetaan peran -> index ke file cache
+# sehingga saat boot index kamera langsung dipakai tanpa probing ulang
+
+"""
+Library yang digunakan
+"""
+import json
+import os
+import threading
+import time
+
+import cv2
+
+from capture import Camera
+from recorder import ReplayCamera
+from ringlog import LOG
+
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "camera_cache.json")
+
+# Mode yang dicoba saat probing, dari yang paling sering dipakai
+CANDIDATE_FOURCC = ("MJPG", "YUYV")
+CANDIDATE_RESOLUTIONS = ((640, 480), (1280, 720), (1920, 1080))
+
+
+def _fourcc_str(kode):
+    kode = int(kode)
+    return "".join(chr((kode >> (8 * i)) & 0xFF) for i in range(4)) if kode else "?"
+
+
+def probe_device(index, hasil=None, stop=None):
+    """
+    Buka satu kamera dan catat mode yang benar-benar diterima driver.
+
+    :param index: index kamera
+    :param hasil: dict tujuan, opsional. Device dicatat di hasil[index] segera setelah kamera
+                  terbukti ada, lalu mode ditambahkan satu per satu, sehingga pemanggil yang
+                  berhenti menunggu tetap mendapat hasil sebagian
+    :param stop: threading.Event, opsional. Jika di-set, enumerasi mode berhenti di mode
+                 berikutnya dan kamera langsung dilepas
+    :return: dict {"index", "backend", "modes": [{"fourcc", "width", "height", "fps"}], "lengkap"},
+             atau None jika kamera tidak ada
+    """
+    cap = cv2.VideoCapture(index)
+    try:
+        if not cap.isOpened() or not cap.grab():
+            return None
+        device = {"index": index, "backend": cap.getBackendName(), "modes": [], "lengkap": False}
+        if hasil is not None:
+            hasil[index] = device
+        for fourcc in CANDIDATE_FOURCC:
+            for width, height in CANDIDATE_RESOLUTIONS:
+                if stop is not None and stop.is_set():
+                    return device
+                cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))
+                cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+                cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+                if not cap.grab():
+                    continue
+                mode = {
+                    "fourcc": _fourcc_str(cap.get(cv2.CAP_PROP_FOURCC)),
+                    "width": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                    "height": int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+                    "fps": round(cap.get(cv2.CAP_PROP_FPS), 1),
+                }
+                if mode not in device["modes"]:  # Driver sering membulatkan ke mode yang sama
+                    device["modes"].append(mode)
+        device["lengkap"] = True
+        return device
+    finally:
+        cap.release()
+
+
+def discover(indices=range(6), timeout=3.0):
+    """
+    Probe semua index secara paralel. Device yang hang tidak menahan yang lain: setelah
+    `timeout`, device yang sudah terbukti ada tetap dilaporkan dengan mode yang sempat
+    tercatat ("lengkap": False), dan thread-nya diminta berhenti agar kamera dilepas
+    sebelum dibuka pemakai.
+
+    :param indices: index kamera yang dicoba
+    :param timeout: batas waktu per device (detik)
+    :return: list dict device yang ditemukan, urut index
+    """
+    hasil = {}
+    stop = threading.Event()
+
+    def probe(index):
+        try:
+            probe_device(index, hasil, stop)
+        except Exception as e:
+            LOG.warning("camera", "Probe index %d gagal: %s", index, e)
+
+    threads = [threading.Thread(target=probe, args=(i,), name=f"probe-{i}", daemon=True) for i in indices]
+    for t in threads:
+        t.start()
+    batas = time.monotonic() + timeout
+    for t in threads:
+        t.join(max(0.0, batas - time.monotonic()))
+    stop.set()
+
+    # Salin dulu, thread yang terlambat masih bisa menambah mode
+    devices = [dict(d, modes=list(d["modes"])) for _, d in sorted(dict(hasil).items())]
+    belum = [d["index"] for d in devices if not d["lengkap"]]
+    if belum:
+        LOG.warning("camera", "Probe mode kamera %s belum selesai dalam %.1fs, mode dicatat sebagian",
+                    belum, timeout)
+    LOG.info("camera", "Kamera ditemukan: %s", [d["index"] for d in devices])
+    return devices
+
+
+def supports(device, width=None, height=None, fourcc=None):
+    """
+    :return: True jika device punya mode dengan resolusi / format yang diminta
+    """
+    for mode in device["modes"]:
+        if ((width is None or mode["width"] == width) and (height is None or mode["height"] == height)
+                and (fourcc is None or mode["fourcc"] == fourcc)):
+            return True
+    return False
+
+
+class CameraRegistry:
+    """
+    Pemetaan peran kamera ("depan", "omni", ...) ke index, disimpan di file cache.
+    resolve() memakai cache apa adanya; probing hanya dijalankan jika cache belum ada
+    atau pemanggil melapor kamera dari cache gagal dibuka (refresh=True).
+    """
+    def __init__(self, roles, cache_path=CACHE_PATH, indices=range(6), timeout=3.0):
+        """
+        :param roles: dict peran -> syarat, contoh {"depan": {"index": 0, "width": 1280, "height": 720}}.
+                      "index" adalah pilihan utama; jika tidak ada, dipilih device lain yang
+                      memenuhi width / height / fourcc
+        :param cache_path: lokasi file cache JSON
+        :param indices: index yang di-probe saat discovery
+        :param timeout: batas waktu probing per device (detik)
+        """
+        self.roles = roles
+        self.cache_path = cache_path
+        self.indices = indices
+        self.timeout = timeout
+        self.cache = self._baca_cache()
+
+    def resolve(self, role, refresh=False):
+        """
+        :param role: nama peran kamera
+        :param refresh: True jika index dari cache gagal dipakai, paksa probing ulang
+        :return: index kamera untuk peran tersebut
+        """
+        if not refresh and role in self.cache.get("roles", {}):
+            return self.cache["roles"][role]
+
+        devices = self.refresh()
+        if role not in self.cache["roles"]:
+            raise RuntimeError(f"Tidak ada kamera untuk peran '{role}' (ditemukan: "
+                               f"{[d['index'] for d in devices]})")
+        return self.cache["roles"][role]
+
+    def refresh(self):
+        """
+        Probing ulang semua index, tetapkan ulang peran, dan simpan ke file cache.
+
+        :return: list dict device yang ditemukan
+        """
+        devices = discover(self.indices, self.timeout)
+        self.cache = {"waktu": time.strftime("%Y-%m-%d %H:%M:%S"), "devices": devices,
+                      "roles": self._assign(devices)}
+        self._simpan_cache()
+        return devices
+
+    def _assign(self, devices):
+        # Peran dengan index pilihan didahulukan, sisanya mengambil device yang memenuhi syarat
+        roles = {}
+        terpakai = set()
+        by_index = {d["index"]: d for d in devices}
+        urutan = sorted(self.roles.items(), key=lambda kv: "index" not in kv[1])
+        for role, syarat in urutan:
+            kandidat = [by_index[syarat["index"]]] if syarat.get("index") in by_index else []
+            kandidat += [d for d in devices if d["index"] != syarat.get("index")]
+            for device in kandidat:
+                if device["index"] in terpakai:
+                    continue
+                if supports(device, syarat.get("width"), syarat.get("height"), syarat.get("fourcc")):
+                    roles[role] = device["index"]
+                    terpakai.add(device["index"])
+                    break
+        return roles
+
+    def _baca_cache(self):
+        if not os.path.exists(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _simpan_cache(self):
+        tmp = self.cache_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.cache, f, indent=2)
+        os.replace(tmp, self.cache_path)
+
+
+def open_camera(camera_config, resolution=(1280, 720)):
+    """
+    Buka sumber frame sesuai bagian "camera" di config.json: rekaman (replay), kamera
+    per peran dari cache discovery, atau index tetap.
+
+    :param camera_config: dict index, fourcc, fps, buffer_size, pool_size, role, roles, replay
+    :param resolution: resolusi yang diminta (width, height)
+    :return: capture.Camera atau recorder.ReplayCamera
+    """
+    if camera_config.get("replay"):
+        return ReplayCamera(camera_config["replay"], realtime=camera_config.get("replay_realtime", True))
+
+    def buka(index):
+        return Camera(
+            index=index,
+            resolution=resolution,
+            fps=camera_config.get("fps", 30),
+            fourcc=camera_config.get("fourcc", "MJPG"),
+            buffer_size=camera_config.get("buffer_size", 1),
+            pool_size=camera_config.get("pool_size", 0),
+        )
+
+    # Kamera dipilih per peran dari cache discovery; probing hanya jika index cache gagal
+    role = camera_config.get("role")
+    if not role:
+        return buka(camera_config.get("index", 0))
+    registry = CameraRegistry(camera_config.get("roles", {}))
+    camera = buka(registry.resolve(role))
+    if not camera.opened:
+        camera.release()
+        LOG.warning("camera", "Kamera cache untuk peran %s gagal dibuka, mencari ulang", role)
+        camera = buka(registry.resolve(role, refresh=True))
+    return camera
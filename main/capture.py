@@ -0,0 +1,156 @@
+# ============ Module Capture Kamera Latensi Rendah ================
+# Program ini membuka kamera dengan format MJPG dan buffer driver sekecil mungkin,
+# membuang frame basi, dan memberi setiap frame nomor urut + waktu capture
+
+"""
+Library yang digunakan
+"""
+import collections
+import time
+
+import cv2
+import numpy as np
+
+from buffer_pool import FramePool
+from ringlog import LOG
+
+# Frame yang berjalan di pipeline: gambar BGR, nomor urut dari kamera, dan waktu capture
+# (time.monotonic). seq yang melompat berarti ada frame yang dibuang di tengah jalan
+Frame = collections.namedtuple("Frame", ["image", "seq", "t_capture"])
+
+
+class Camera:
+    """
+    Pembungkus cv2.VideoCapture untuk loop deteksi. read() selalu mengembalikan frame
+    terbaru: frame yang sudah menumpuk di buffer driver di-grab lalu dibuang tanpa
+    di-decode, baru frame terakhir di-retrieve.
+
+    Jika pool_size > 0, frame di-decode langsung ke buffer FramePool; pemakai wajib
+    memanggil recycle(frame) setelah frame selesai dipakai agar buffernya bisa dipakai ulang.
+    """
+    def __init__(self, index=0, resolution=(1280, 720), fps=30, fourcc="MJPG", buffer_size=1,
+                 drain=True, max_drain=4, pool_size=0):
+        """
+        :param index: index kamera untuk cv2.VideoCapture
+        :param resolution: resolusi yang diminta (width, height)
+        :param fps: FPS yang diminta ke driver
+        :param fourcc: format kompresi kamera, "MJPG" jauh lebih ringan di USB daripada YUYV
+        :param buffer_size: jumlah frame buffer driver (1 = hanya frame terbaru)
+        :param drain: buang frame basi di buffer sebelum membaca
+        :param max_drain: jumlah grab tambahan maksimal per read()
+        :param pool_size: jumlah buffer frame yang dipakai ulang (0 = array baru tiap frame)
+        """
+        self.index = index
+        self.cap = cv2.VideoCapture(index)
+
+        # FOURCC harus diatur sebelum resolusi, beberapa driver mengabaikannya jika terbalik
+        if fourcc:
+            self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, resolution[0])
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, resolution[1])
+        self.cap.set(cv2.CAP_PROP_FPS, fps)
+        # Tidak semua backend mendukung BUFFERSIZE, jadi drain tetap dipakai sebagai cadangan
+        self.buffer_size_ok = bool(self.cap.set(cv2.CAP_PROP_BUFFERSIZE, buffer_size))
+
+        # Nilai yang benar-benar dipakai driver (bisa beda dengan yang diminta)
+        self.resolution = (int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                           int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or fps
+        kode = int(self.cap.get(cv2.CAP_PROP_FOURCC))
+        self.fourcc = "".join(chr((kode >> (8 * i)) & 0xFF) for i in range(4)) if kode else "?"
+
+        self.drain = drain
+        self.max_drain = max_drain
+        # grab() yang kembali lebih cepat dari ini berarti frame sudah menunggu di buffer
+        self._batas_basi = 0.25 / self.fps
+
+        self.seq = 0
+        self.dibuang = 0
+        self.gagal = 0
+        self.umur = collections.deque(maxlen=120)
+
+        # Buffer tujuan retrieve(), ukurannya mengikuti resolusi yang dipakai driver
+        self.pool = None
+        if pool_size > 0 and self.cap.isOpened() and min(self.resolution) > 0:
+            self.pool = FramePool((self.resolution[1], self.resolution[0], 3), pool_size)
+
+        if self.cap.isOpened():
+            LOG.info("camera", "Kamera %s: %dx%d %s %.0ffps, buffersize %s", index, *self.resolution,
+                     self.fourcc, self.fps, "OK" if self.buffer_size_ok else "tidak didukung")
+
+    @property
+    def opened(self):
+        return self.cap.isOpened()
+
+    def read(self):
+        """
+        Ambil frame terbaru dari kamera.
+
+        :return: Frame, atau None jika kamera tidak memberi frame
+        """
+        mulai = time.monotonic()
+        if not self.cap.grab():
+            self.gagal += 1
+            return None
+        t_capture = time.monotonic()
+
+        if self.drain:
+            # grab() yang langsung kembali mengambil frame basi dari buffer; ambil lagi
+            # sampai ada grab yang benar-benar menunggu frame baru dari sensor
+            for _ in range(self.max_drain):
+                if t_capture - mulai >= self._batas_basi:
+                    break
+                mulai = time.monotonic()
+                if not self.cap.grab():
+                    break
+                t_capture = time.monotonic()
+                self.dibuang += 1
+
+        buffer = self.pool.acquire() if self.pool is not None else None
+        ret, image = self.cap.retrieve(buffer)
+        if self.pool is not None and (not ret or image is not buffer):
+            # Decode gagal (buffer bisa tetap dikembalikan apa adanya) atau ukuran frame
+            # berbeda sehingga OpenCV tidak memakai buffer pool
+            self.pool.release(buffer)
+        if not ret:
+            self.gagal += 1
+            return None
+        self.seq += 1
+        return Frame(image, self.seq, t_capture)
+
+    def recycle(self, frame):
+        """
+        Kembalikan buffer frame ke pool setelah semua stage selesai memakainya.
+        Tanpa pool tidak melakukan apa-apa.
+
+        :param frame: Frame dari read()
+        """
+        if self.pool is not None and frame is not None:
+            self.pool.release(frame.image)
+
+    def report_age(self, frame):
+        """
+        Catat umur frame saat mulai diproses (sekarang - waktu capture).
+
+        :param frame: Frame dari read()
+        :return: umur frame dalam detik
+        """
+        umur = time.monotonic() - frame.t_capture
+        self.umur.append(umur)
+        return umur
+
+    def metrics(self):
+        """
+        :return: dict jumlah frame, frame basi yang dibuang, gagal baca, dan umur frame (ms)
+        """
+        hasil = {"frame": self.seq, "dibuang": self.dibuang, "gagal": self.gagal}
+        if self.umur:  # Hanya ada jika pemakai memanggil report_age()
+            umur = np.fromiter(self.umur, float) * 1000
+            hasil["umur_p50_ms"] = round(float(np.percentile(umur, 50)), 1)
+            hasil["umur_max_ms"] = round(float(umur.max()), 1)
+        if self.pool is not None:
+            hasil["pool"] = self.pool.metrics()
+        return hasil
+
+    def release(self):
+        self.cap.release()
@@ -0,0 +1,182 @@
+# ============ Program Cek Alokasi Memori per Frame ================
+# Program ini menjalankan pipeline.Pipeline yang sebenarnya (capture -> infer -> select ->
+# refine -> encode -> annotate) pada video sintetis dengan engine palsu, lalu mengukur
+# alokasi memori per frame dengan tracemalloc, dengan dan tanpa pool buffer kamera
+#
+# Contoh:
+#   python check_alloc.py --frames 300 --limit-kb 64
+
+"""
+Library yang digunakan
+"""
+import argparse
+import os
+import sys
+import tempfile
+import tracemalloc
+
+import cv2
+import numpy as np
+
+from config import load_config
+from pipeline import InferStage, Pipeline, Stage, apply_preset
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Cek alokasi memori loop kamera dengan tracemalloc")
+    parser.add_argument("--frames", default=300, type=int, help="Jumlah frame yang diukur")
+    parser.add_argument("--warmup", default=20, type=int, help="Frame awal yang tidak diukur")
+    parser.add_argument("--width", default=1280, type=int, help="Lebar frame sintetis")
+    parser.add_argument("--height", default=720, type=int, help="Tinggi frame sintetis")
+    parser.add_argument("--pool-size", default=6, type=int, help="Jumlah buffer pool kamera")
+    parser.add_argument("--limit-kb", default=64, type=float,
+                        help="Batas alokasi per frame (median) dengan pool, di atas ini = gagal")
+    return parser.parse_args()
+
+
+def buat_video(path, frames, resolution):
+    """
+    Tulis video MJPG berisi bola oranye yang bergerak, supaya capture benar-benar
+    men-decode JPEG seperti pada kamera MJPG.
+    """
+    width, height = resolution
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 30, resolution)
+    if not writer.isOpened():
+        raise RuntimeError("VideoWriter MJPG tidak tersedia di build OpenCV ini")
+    image = np.zeros((height, width, 3), np.uint8)
+    for i in range(frames):
+        image[:] = (40, 90, 40)
+        x = int(width * (0.1 + 0.8 * (i % 60) / 60))
+        cv2.circle(image, (x, height // 2), 30, (0, 128, 255), -1)
+        writer.write(image)
+    writer.release()
+
+
+class EnginePalsu:
+    """
+    Pengganti model YOLO dengan antarmuka engine.InferenceEngine: hasil deteksi tetap,
+    disalin sekali per frame lalu dipotong menjadi view seperti engine._pisah_boxes.
+    """
+    backend = "palsu"
+    path = "-"
+    names = {0: "bola"}
+
+    def __init__(self):
+        self.data = np.array([[100, 100, 160, 160, 0.9, 0]], np.float32)
+
+    def predict(self, image, imgsz=None):
+        data = self.data.copy()
+        return data[:, :4], data[:, 4], data[:, 5]
+
+    def warmup(self, shape=None):
+        pass
+
+    def close(self):
+        pass
+
+
+class InferPalsu(InferStage):
+    """
+    Stage infer asli, hanya model YOLO-nya yang diganti EnginePalsu. Dipasang lewat
+    stage_classes pada pipeline milik check_alloc saja, registry STAGES tidak diubah.
+    """
+    def open(self):
+        self.engine = EnginePalsu()
+
+
+class UkurStage(Stage):
+    """
+    Stage pertama setiap frame: catat puncak alokasi frame sebelumnya (semua stage +
+    finish) lalu reset puncak tracemalloc. Pipeline dihentikan setelah frame cukup.
+    """
+    name = "ukur"
+    order = 0
+
+    def __init__(self, pipeline, warmup, frames):
+        super().__init__(pipeline, {})
+        self.warmup = warmup
+        self.frames = frames
+        self.per_frame = []
+        self._frame = 0
+        self._awal = None
+
+    def process(self, state):
+        if self._awal is not None:
+            self._frame += 1
+            if self._frame > self.warmup:
+                self.per_frame.append(tracemalloc.get_traced_memory()[1] - self._awal)
+            if len(self.per_frame) >= self.frames:
+                return False
+        tracemalloc.reset_peak()
+        self._awal = tracemalloc.get_traced_memory()[0]
+        return True
+
+
+def ukur(path, args, pool_size):
+    """
+    Jalankan pipeline pada video sintetis dan catat puncak alokasi tracemalloc tiap frame.
+
+    :param path: video sintetis
+    :param pool_size: jumlah buffer pool kamera (0 = array baru tiap frame)
+    :return: tuple (array byte yang dialokasikan per frame, metrics kamera)
+    """
+    config = apply_preset(load_config(), None, {
+        "serial": {"port": None},
+        "stages": {
+            "capture": {"camera": {"index": path, "role": None, "replay": None, "fourcc": None,
+                                   "pool_size": pool_size}},
+            "cascade": {"enabled": False},
+            "track": {"enabled": False},
+            "record": {"enabled": False},
+            "preview": {"enabled": False},
+            "display": {"enabled": False},
+        },
+    })
+    config["headless"] = dict(config["headless"], enabled=False)  # Stage annotate ikut diukur
+
+    pipeline = Pipeline(config, resolution=(args.width, args.height), stage_classes={"infer": InferPalsu})
+    camera = pipeline.stage("capture").camera
+    if not camera.opened:
+        pipeline.close()
+        raise RuntimeError(f"Video sintetis {path} gagal dibuka")
+    # File video selalu punya frame siap, drain akan melompati sebagian besar frame
+    camera.drain = False
+
+    ukur_stage = UkurStage(pipeline, args.warmup, args.frames)
+    pipeline.stages.insert(0, ukur_stage)
+    pipeline.run()
+    return np.array(ukur_stage.per_frame, float), camera.metrics()
+
+
+def main():
+    args = parse_arguments()
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "sintetis.avi")
+        buat_video(path, args.warmup + args.frames + 2, (args.width, args.height))
+
+        tracemalloc.start()
+        try:
+            tanpa, _ = ukur(path, args, 0)
+            dengan, metrics = ukur(path, args, args.pool_size)
+        finally:
+            tracemalloc.stop()
+
+    if not len(tanpa) or not len(dengan):
+        print("Video sintetis tidak memberi frame")
+        return 1
+
+    print(f"{'mode':<12}{'frame':>7}{'median KB':>12}{'p95 KB':>10}{'max KB':>10}")
+    for nama, hasil in (("tanpa pool", tanpa), ("dengan pool", dengan)):
+        print(f"{nama:<12}{len(hasil):>7}{np.median(hasil) / 1024:>12.1f}"
+              f"{np.percentile(hasil, 95) / 1024:>10.1f}{hasil.max() / 1024:>10.1f}")
+    print(f"pool kamera: {metrics.get('pool')}")
+
+    if np.median(dengan) / 1024 > args.limit_kb:
+        print(f"GAGAL: alokasi per frame dengan pool di atas {args.limit_kb} KB")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,309 @@
+# ============ Module Cascade Warna Sebelum YOLO ================
+# Program ini mencari kandidat bola oranye dengan threshold HSV + connected components
+# pada frame yang diperkecil, sehingga YOLO cukup memverifikasi crop kecil di sekitar
+# kandidat. Threshold dikalibrasi dari rekaman match atau dari deteksi YOLO full-frame
+
+"""
+Library yang digunakan
+"""
+import argparse
+import collections
+import json
+import os
+import time
+
+import cv2
+import numpy as np
+
+from ringlog import LOG
+
+CALIBRATION_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "color_calibration.json")
+
+
+def hsv_thresholds(pixels, h_margin=4, sv_margin=30, low_pct=3, high_pct=97):
+    """
+    Turunkan batas HSV dari piksel bola.
+
+    :param pixels: array (N, 3) piksel HSV dari dalam box bola
+    :param h_margin: pelebaran batas hue
+    :param sv_margin: pelebaran batas bawah saturation / value
+    :param low_pct: persentil bawah (membuang piksel tepi / pantulan)
+    :param high_pct: persentil atas hue
+    :return: (lower, upper) tuple 3 nilai untuk cv2.inRange
+    """
+    h_low, s_low, v_low = np.percentile(pixels, low_pct, axis=0)
+    h_high = np.percentile(pixels[:, 0], high_pct)
+    lower = (max(0, int(h_low) - h_margin), max(0, int(s_low) - sv_margin), max(0, int(v_low) - sv_margin))
+    upper = (min(179, int(h_high) + h_margin), 255, 255)
+    return lower, upper
+
+
+def _piksel_bola(frame, box, inner=0.6, max_pixels=400):
+    """
+    Ambil piksel HSV dari bagian tengah box (tepi box berisi lapangan, bukan bola).
+    """
+    x1, y1, x2, y2 = [float(v) for v in box[:4]]
+    cx, cy = (x1 + x2) / 2, (y1 + y2) / 2
+    hw, hh = (x2 - x1) * inner / 2, (y2 - y1) * inner / 2
+    h, w = frame.shape[:2]
+    roi = frame[max(0, int(cy - hh)):min(h, int(cy + hh)), max(0, int(cx - hw)):min(w, int(cx + hw))]
+    if roi.size == 0:
+        return np.empty((0, 3), np.uint8)
+    pixels = cv2.cvtColor(roi, cv2.COLOR_BGR2HSV).reshape(-1, 3)
+    if len(pixels) > max_pixels:
+        pixels = pixels[np.linspace(0, len(pixels) - 1, max_pixels).astype(int)]
+    return pixels
+
+
+def verify_regions(engine, frame, regions):
+    """
+    Jalankan YOLO pada crop kandidat dalam satu panggilan.
+
+    :param engine: InferenceEngine / ProcessEngine
+    :param frame: frame BGR penuh
+    :param regions: list (x1, y1, x2, y2, imgsz) dari ColorCascade.propose
+    :return: tuple (boxes, confidences, class_ids) dalam koordinat frame penuh
+    """
+    crops = [frame[y1:y2, x1:x2] for x1, y1, x2, y2, _ in regions]
+    imgsz = max(r[4] for r in regions)
+    if len(crops) == 1:
+        hasil = [engine.predict(crops[0], imgsz)]
+    else:
+        hasil = engine.predict_batch(crops, imgsz)
+
+    boxes, confidences, class_ids = [], [], []
+    for (x1, y1, _, _, _), (b, c, k) in zip(regions, hasil):
+        if len(b):
+            b = b.copy()
+            b[:, [0, 2]] += x1
+            b[:, [1, 3]] += y1
+            boxes.append(b)
+            confidences.append(c)
+            class_ids.append(k)
+    if not boxes:
+        return np.empty((0, 4), np.float32), np.empty(0, np.float32), np.empty(0, np.float32)
+    return np.concatenate(boxes), np.concatenate(confidences), np.concatenate(class_ids)
+
+
+class ColorCascade:
+    """
+    Pra-detektor warna. propose() mengembalikan crop kandidat (paling banyak
+    `max_candidates`); list kosong berarti harus deteksi full-frame, baik karena
+    tidak ada blob yang masuk akal maupun karena sudah `full_every` frame sejak
+    full-frame terakhir (agar bola di cahaya lain tetap ditemukan).
+    """
+    def __init__(self, lower=(5, 120, 120), upper=(25, 255, 255), scale=0.25, min_area=12,
+                 max_candidates=3, margin=2.5, min_crop=128, max_imgsz=320, full_every=30,
+                 auto_calibrate=True, calibrate_window=60, calibrate_every=30):
+        """
+        :param lower: batas bawah HSV (H 0-179, S, V 0-255)
+        :param upper: batas atas HSV
+        :param scale: skala frame untuk threshold (0.25 = 1280x720 -> 320x180)
+        :param min_area: luas blob minimal dalam piksel frame kecil
+        :param max_candidates: jumlah crop maksimal yang diverifikasi YOLO
+        :param margin: kelipatan ukuran blob untuk sisi crop
+        :param min_crop: sisi crop minimal (piksel frame penuh)
+        :param max_imgsz: imgsz maksimal untuk crop
+        :param full_every: paksa deteksi full-frame setiap N frame
+        :param auto_calibrate: perbarui threshold dari box hasil YOLO full-frame
+        :param calibrate_window: jumlah sampel bola yang disimpan untuk kalibrasi
+        :param calibrate_every: hitung ulang threshold setiap N sampel baru
+        """
+        self.lower = np.array(lower, np.uint8)
+        self.upper = np.array(upper, np.uint8)
+        self.scale = scale
+        self.min_area = min_area
+        self.max_candidates = max_candidates
+        self.margin = margin
+        self.min_crop = min_crop
+        self.max_imgsz = max_imgsz
+        self.full_every = full_every
+
+        self.auto_calibrate = auto_calibrate
+        self.calibrate_every = calibrate_every
+        self._sampel = collections.deque(maxlen=calibrate_window)
+        self._sampel_baru = 0
+
+        self.frame_sejak_full = 0
+
+        # Statistik
+        self.diusulkan = 0
+        self.terverifikasi = 0
+        self.full_frame = 0
+        self.kalibrasi = 0
+
+    @classmethod
+    def from_config(cls, cascade_config):
+        """
+        Buat cascade dari bagian "cascade" di config.json; threshold dari file kalibrasi
+        (jika ada) menimpa lower / upper di config.
+        """
+        lower = cascade_config.get("lower", (5, 120, 120))
+        upper = cascade_config.get("upper", (25, 255, 255))
+        path = cascade_config.get("calibration") or CALIBRATION_PATH
+        if not os.path.isabs(path):
+            path = os.path.join(os.path.dirname(os.path.abspath(__file__)), path)
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                kalibrasi = json.load(f)
+            lower, upper = kalibrasi["lower"], kalibrasi["upper"]
+            LOG.info("cascade", "Threshold dari %s: %s - %s", path, lower, upper)
+        return cls(
+            lower=lower, upper=upper,
+            scale=cascade_config.get("scale", 0.25),
+            min_area=cascade_config.get("min_area", 12),
+            max_candidates=cascade_config.get("max_candidates", 3),
+            max_imgsz=cascade_config.get("max_imgsz", 320),
+            full_every=cascade_config.get("full_every", 30),
+            auto_calibrate=cascade_config.get("auto_calibrate", True),
+        )
+
+    def propose(self, frame):
+        """
+        Cari blob berwarna bola pada frame yang diperkecil.
+
+        :param frame: frame BGR penuh
+        :return: list (x1, y1, x2, y2, imgsz) dalam koordinat frame penuh, urut dari blob
+                 terbesar; list kosong = jalankan deteksi full-frame
+        """
+        if self.frame_sejak_full >= self.full_every:
+            return []
+
+        small = cv2.resize(frame, None, fx=self.scale, fy=self.scale, interpolation=cv2.INTER_AREA)
+        hsv = cv2.cvtColor(small, cv2.COLOR_BGR2HSV)
+        mask = cv2.inRange(hsv, self.lower, self.upper)
+        n, _, stats, _ = cv2.connectedComponentsWithStats(mask, connectivity=8)
+        if n <= 1:
+            return []
+
+        # Baris 0 adalah background; saring blob kecil dan yang jauh dari bentuk bola
+        stats = stats[1:]
+        w, h, area = stats[:, cv2.CC_STAT_WIDTH], stats[:, cv2.CC_STAT_HEIGHT], stats[:, cv2.CC_STAT_AREA]
+        rasio = np.minimum(w, h) / np.maximum(np.maximum(w, h), 1)
+        isi = area / np.maximum(w * h, 1)
+        valid = (area >= self.min_area) & (rasio >= 0.4) & (isi >= 0.3)
+        if not np.any(valid):
+            return []
+        stats = stats[valid]
+        stats = stats[np.argsort(-stats[:, cv2.CC_STAT_AREA])[:self.max_candidates]]
+
+        fh, fw = frame.shape[:2]
+        regions = []
+        for x, y, bw, bh, _ in stats:
+            cx = (x + bw / 2.0) / self.scale
+            cy = (y + bh / 2.0) / self.scale
+            half = max(self.min_crop, self.margin * max(bw, bh) / self.scale) / 2
+            x1, y1 = int(max(0, cx - half)), int(max(0, cy - half))
+            x2, y2 = int(min(fw, cx + half)), int(min(fh, cy + half))
+            if x2 - x1 < 32 or y2 - y1 < 32:
+                continue
+            # imgsz kelipatan 32 supaya YOLO tidak memperbesar crop ke 640
+            imgsz = min(self.max_imgsz, int(np.ceil(max(x2 - x1, y2 - y1) / 32.0) * 32))
+            regions.append((x1, y1, x2, y2, imgsz))
+        self.diusulkan += len(regions)
+        return regions
+
+    def update(self, frame, boxes, confidences, full_frame):
+        """
+        Catat hasil deteksi frame ini. Hanya deteksi full-frame yang dipakai untuk
+        kalibrasi, agar threshold tidak menguatkan dirinya sendiri.
+
+        :param frame: frame BGR asli
+        :param boxes: array (N, 4) xyxy hasil YOLO dalam koordinat frame penuh
+        :param confidences: array (N,)
+        :param full_frame: True jika YOLO dijalankan pada frame penuh
+        """
+        if not full_frame:
+            self.frame_sejak_full += 1
+            self.terverifikasi += 1
+            return
+
+        self.frame_sejak_full = 0
+        self.full_frame += 1
+        if not self.auto_calibrate or not len(boxes):
+            return
+
+        pixels = _piksel_bola(frame, boxes[int(np.argmax(confidences))])
+        if len(pixels) < 20:
+            return
+        self._sampel.append(pixels)
+        self._sampel_baru += 1
+        if self._sampel_baru >= self.calibrate_every:
+            self._sampel_baru = 0
+            lower, upper = hsv_thresholds(np.concatenate(self._sampel))
+            self.lower = np.array(lower, np.uint8)
+            self.upper = np.array(upper, np.uint8)
+            self.kalibrasi += 1
+            LOG.info("cascade", "Threshold dikalibrasi ulang: %s - %s", lower, upper)
+
+    def metrics(self):
+        return {
+            "kandidat": self.diusulkan,
+            "terverifikasi": self.terverifikasi,
+            "full_frame": self.full_frame,
+            "kalibrasi": self.kalibrasi,
+        }
+
+
+def calibrate_recording(path, max_frames=300):
+    """
+    Hitung threshold HSV dari rekaman recorder.py: piksel diambil dari box target
+    setiap frame yang hasil deteksinya memilih bola.
+
+    :param path: path rekaman (tanpa ekstensi atau .rec)
+    :param max_frames: jumlah frame bertarget maksimal (diambil merata)
+    :return: dict lower, upper, sampel, sumber
+    """
+    from recorder import RecordingReader
+
+    reader = RecordingReader(path)
+    try:
+        seqs = []
+        for seq in reader.seqs:
+            hasil = reader.result(seq)
+            if hasil is not None and hasil["target"] is not None:
+                seqs.append(seq)
+        if not seqs:
+            raise ValueError(f"Rekaman {path} tidak berisi frame dengan target bola")
+        if len(seqs) > max_frames:
+            seqs = [seqs[i] for i in np.linspace(0, len(seqs) - 1, max_frames).astype(int)]
+
+        pixels = []
+        for seq in seqs:
+            hasil = reader.result(seq)
+            pixels.append(_piksel_bola(reader.frame(seq).image, hasil["boxes"][hasil["target"]]))
+    finally:
+        reader.close()
+
+    lower, upper = hsv_thresholds(np.concatenate(pixels))
+    return {"lower": list(lower), "upper": list(upper), "sampel": len(seqs), "sumber": path,
+            "waktu": time.strftime("%Y-%m-%d %H:%M:%S")}
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Kalibrasi threshold HSV bola dari rekaman match")
+    parser.add_argument("recordings", nargs="+", help="Path rekaman recorder (tanpa ekstensi atau .rec)")
+    parser.add_argument("--output", default=CALIBRATION_PATH, help="File kalibrasi yang dibaca ColorCascade")
+    parser.add_argument("--max-frames", default=300, type=int, help="Frame bertarget maksimal per rekaman")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+    hasil = [calibrate_recording(path, args.max_frames) for path in args.recordings]
+    # Beberapa rekaman (lapangan / jam berbeda): ambil rentang yang mencakup semuanya
+    kalibrasi = {
+        "lower": [min(h["lower"][i] for h in hasil) for i in range(3)],
+        "upper": [max(h["upper"][i] for h in hasil) for i in range(3)],
+        "sampel": sum(h["sampel"] for h in hasil),
+        "sumber": [h["sumber"] for h in hasil],
+        "waktu": time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(kalibrasi, f, indent=2)
+    print(f"Threshold HSV {kalibrasi['lower']} - {kalibrasi['upper']} "
+          f"dari {kalibrasi['sampel']} frame, disimpan ke {args.output}")
+
+
+if __name__ == "__main__":
+    main()
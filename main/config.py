@@ -0,0 +1,143 @@
+# ============ Module Konfigurasi Robot ================
+# Program ini berisi konfigurasi bawaan dan pembaca file config.json
+# Nilai di config.json menimpa nilai bawaan per bagian (engine, dst)
+
+"""
+Library yang digunakan
+"""
+import copy
+import json
+import os
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.json")
+
+DEFAULT_CONFIG = {
+    "engine": {
+        "backend": "pytorch",       # "pytorch", "onnx", atau "openvino"
+        "weights": "best_ball4.pt",  # Model .pt asli; file hasil export dicari dari nama ini
+        "int8": False,              # Pakai varian INT8 hasil export_model.py --int8
+        "imgsz": 640,
+        "conf": 0.25,
+        "worker_process": False,    # Jalankan model di proses terpisah (frame lewat shared memory)
+    },
+    "camera": {
+        "index": 0,
+        "fourcc": "MJPG",           # MJPG: bandwidth USB kecil, 1280x720 tetap 30 FPS
+        "fps": 30,
+        "buffer_size": 1,           # Buffer driver minimal agar read() tidak memberi frame basi
+        "pool_size": 6,             # Buffer frame yang dipakai ulang (capture + slot + deteksi + output), 0 = mati
+        "role": None,               # Pilih kamera per peran (lihat roles) alih-alih index tetap
+        "roles": {                  # Syarat per peran untuk camera_discovery.CameraRegistry
+            "depan": {"index": 0, "width": 1280, "height": 720},
+            "omni": {"index": 1},
+        },
+        "replay": None,             # Path rekaman recorder: jalankan ulang pipeline pada footage match
+        "replay_realtime": True,    # Putar rekaman sesuai jeda aslinya
+    },
+    "quality": {
+        "enabled": True,            # Sesuaikan imgsz terhadap budget latensi, batas FPS saat CPU throttling
+        "budget_ms": 60,            # Latensi capture -> data serial yang dijaga (p90)
+        "imgsz_steps": [320, 416, 512, 640],
+        "fps_steps": [10, 15, 20, 30],  # Diturunkan hanya saat throttling, bukan untuk mengejar budget
+    },
+    "cascade": {
+        "enabled": False,           # Kandidat bola dari threshold HSV, YOLO hanya memverifikasi crop
+        "lower": [5, 120, 120],     # Batas HSV bola oranye, ditimpa file kalibrasi jika ada
+        "upper": [25, 255, 255],
+        "calibration": "color_calibration.json",  # Hasil: python color_cascade.py <rekaman>
+        "auto_calibrate": True,     # Perbarui threshold dari box YOLO full-frame selama jalan
+        "scale": 0.25,              # Threshold dikerjakan pada frame yang diperkecil
+        "min_area": 12,             # Luas blob minimal (piksel frame kecil)
+        "max_candidates": 3,
+        "max_imgsz": 320,
+        "full_every": 30,           # Tetap deteksi full-frame tiap N frame
+    },
+    "field": {
+        "enabled": False,           # Kirim jarak + arah bola di lantai (x..y..d<cm>a<0,1 derajat>>)
+        "calibration": "camera_calibration.json",  # Hasil: python calibration.py intrinsics / ground
+        "step": 2,                  # Resolusi tabel lookup (piksel)
+        "max_distance_mm": 12000,   # Lebih jauh dari ini (dekat horizon) dianggap bukan lantai
+    },
+    "headless": {
+        "enabled": False,           # Mode pertandingan: tanpa anotasi, jendela, maupun preview
+        "control_prefix": "!",      # Datagram basestation berawalan ini = perintah kontrol ("!stop"),
+                                    # tidak diteruskan ke Arduino; None = perintah kontrol mati
+    },
+    "preview": {
+        "enabled": True,            # Stream MJPEG ke basestation menggantikan jendela cv2.imshow
+        "host": "0.0.0.0",          # Bind semua interface agar basestation di jaringan robot bisa membuka
+        "port": 8090,               # Buka http://<ip-robot>:8090/
+        "fps": 5,                   # Preview cukup beberapa frame per detik
+        "scale": 0.5,               # Anotasi digambar pada frame yang sudah diperkecil
+        "jpeg_quality": 70,
+    },
+    "multi_camera": {
+        "enabled": False,           # Beberapa kamera, satu model, inferensi dalam satu batch
+        "cameras": [                # Urutan = id kamera di protokol serial (0 = kamera utama)
+            {"index": 0, "role": "depan"},
+            {"index": 1, "role": "omni"},
+        ],
+        "batch_wait_ms": 5,         # Tunggu frame kamera lain sebelum batch dijalankan
+    },
+    "recorder": {
+        "enabled": False,           # Rekam semua frame + hasil deteksi + byte serial selama match
+        "folder": "rekaman_match",
+        "jpeg_quality": 85,
+        "max_queue_mb": 32,         # Batas frame mentah yang menunggu ditulis (720p ~2.7 MB/frame)
+    },
+    "pipeline": {
+        "enabled": False,           # main.py memakai pipeline.Pipeline (stage di bawah) alih-alih Detector
+        "preset": None,             # Nama di pipeline.PRESETS, ditimpa di atas bagian ini
+        "serial": {                 # Hanya dipakai jika pipeline dijalankan tanpa main.py
+            "port": None,
+            "baudrate": 115200,
+            "settle_s": 2.0,        # Arduino reset saat port dibuka; jeda ini paralel dengan load model
+        },
+        "stages": {                 # Urutan tetap per frame, "enabled" memilih stage yang dijalankan
+            "capture": {"enabled": True},
+            "cascade": {"enabled": False},  # Opsi lain menimpa bagian "cascade" di atas
+            "infer": {"enabled": True, "imgsz": None},
+            "select": {"enabled": True, "min_conf": 0.25},
+            "refine": {"enabled": True, "center": "circle"},  # "circle" atau "box"
+            "track": {"enabled": False, "max_interval": 3},
+            "encode": {"enabled": True, "format": "ascii", "only_changes": True, "field": False,
+                       "no_ball": None},  # ascii / csv / binary; no_ball = pesan pengganti saat bola hilang
+            "record": {"enabled": False, "folder": "rekaman_match", "jpeg_quality": 85, "max_queue_mb": 32},
+            "annotate": {"enabled": True, "labels": False, "center_line": True},
+            "display": {"enabled": True, "scale": 0.5, "window": "YOLOv8 Detection"},
+            "preview": {"enabled": False},  # Stream MJPEG, opsi lain menimpa bagian "preview" di atas
+        },
+    },
+    "log": {
+        "level": "INFO",            # Level bawaan: DEBUG, INFO, WARNING, ERROR, OFF
+        "levels": {},               # Level per subsystem, contoh {"serial": "WARNING"}
+        "summary_interval": 1.0,    # Pesan berulang (tiap frame / datagram) diringkas per N detik
+        "jsonl_path": None,         # Isi path file untuk menyimpan semua record sebagai JSON
+    },
+}
+
+
+def gabung_config(dasar, tambahan):
+    """
+    Gabungkan dict secara rekursif, nilai `tambahan` menimpa `dasar`.
+    """
+    hasil = copy.deepcopy(dasar)
+    for kunci, nilai in tambahan.items():
+        if isinstance(nilai, dict) and isinstance(hasil.get(kunci), dict):
+            hasil[kunci] = gabung_config(hasil[kunci], nilai)
+        else:
+            hasil[kunci] = nilai
+    return hasil
+
+
+def load_config(path=CONFIG_PATH):
+    """
+    Baca konfigurasi dari file JSON dan gabungkan dengan DEFAULT_CONFIG.
+
+    :param path: lokasi file config.json
+    :return: dict konfigurasi lengkap
+    """
+    if not os.path.exists(path):
+        return copy.deepcopy(DEFAULT_CONFIG)
+    with open(path, encoding="utf-8") as f:
+        return gabung_config(DEFAULT_CONFIG, json.load(f))
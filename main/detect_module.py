@@ -7,130 +7,584 @@ Library yang digunakan
 """
 import cv2
 import numpy as np
-import serial
+import os
 import time
-from ultralytics import YOLO
-import supervision as sv
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from frame_slot import LatestSlot
+from buffer_pool import ResizeBuffer
+from preview import PreviewServer
+from camera_discovery import open_camera
+from color_cascade import ColorCascade, verify_regions
+from calibration import FieldMap
+from recorder import Recorder
+from search_window import SearchWindow
+from tracker import BallTracker
+from target_select import TargetSelector
+from protocol import FrameEncoder
+from serial_writer import SerialWriter
+from config import DEFAULT_CONFIG
+from engine import create_engine
+from quality import QualityController
+from metrics import REGISTRY
+from ringlog import LOG
 
 class Detector:
     """
     Kelas untuk mendeteksi objek menggunakan YOLOv8 dan mengirimkan koordinat deteksi ke Arduino.
     """
-    def __init__(self, arduino, resolution=(1280, 720), scale=0.5):
+    def __init__(self, arduino, resolution=(1280, 720), scale=0.5, pipelined=False,
+                 tracking=False, redetect_interval=15, detect_interval=1,
+                 protocol="ascii", engine_config=None, quality_config=None, camera_config=None,
+                 recorder_config=None, cascade_config=None, field_config=None, preview_config=None,
+                 headless=False, t_start=None):
         """
         Inisialisasi kamera, model YOLOv8, dan parameter tampilan.
 
-        :param arduino: objek serial dari main.py
+        :param arduino: SerialHub dari main.py (cukup objek dengan write() dan baudrate),
+                        tidak ditutup oleh Detector
         :param resolution: resolusi kamera (width, height)
         :param scale: skala tampilan (untuk preview)
+        :param pipelined: jalankan capture, deteksi, dan output di thread terpisah
+        :param tracking: setelah bola terkunci, YOLO hanya dijalankan pada crop di sekitar bola
+        :param redetect_interval: jumlah frame crop sebelum deteksi full-frame ulang
+        :param detect_interval: YOLO maksimal dijalankan tiap N frame, di antaranya posisi
+                                bola diperkirakan tracker (1 = YOLO setiap frame)
+        :param protocol: format data serial, "ascii" ("x640y360>") atau "binary" (protocol.py)
+        :param engine_config: bagian "engine" dari config.json (backend, weights, int8, ...)
+        :param quality_config: bagian "quality" dari config.json (budget latensi, imgsz, FPS)
+        :param camera_config: bagian "camera" dari config.json (index, fourcc, fps, buffer_size)
+        :param recorder_config: bagian "recorder" dari config.json (rekam frame + hasil deteksi)
+        :param cascade_config: bagian "cascade" dari config.json (kandidat warna sebelum YOLO)
+        :param field_config: bagian "field" dari config.json (jarak + arah bola di lantai)
+        :param preview_config: bagian "preview" dari config.json (stream MJPEG pengganti jendela)
+        :param headless: tanpa anotasi, jendela, maupun preview; berhenti lewat stop()
+                         (sinyal / perintah kontrol), bukan tombol 'q'
+        :param t_start: waktu mulai program (time.perf_counter), untuk metrik startup
         """
+        self.t_start = t_start if t_start is not None else time.perf_counter()
         self.arduino = arduino
         self.frame_width, self.frame_height = resolution
         self.display_scale = scale
         self.running = True
+        self.pipelined = pipelined
+        self.headless = headless
 
-        # Inisialisasi kamera
-        self.cap = cv2.VideoCapture(0)
-        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.frame_width)
-        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.frame_height)
+        # Metrik startup (detik sejak t_start), first_detection diisi saat bola pertama terlihat
+        self.startup = {}
 
-        # Load model YOLOv8
-        self.model = YOLO("best_ball4.pt")
-        self.box_annotator = sv.BoxAnnotator(thickness=2)
+        # Kamera dibuka sambil model dimuat + warm-up; keduanya sama-sama menunggu I/O
+        # atau library native, jadi berjalan paralel di thread terpisah
+        with ThreadPoolExecutor(max_workers=3, thread_name_prefix="startup") as pool:
+            f_kamera = pool.submit(self._buka_kamera, camera_config or DEFAULT_CONFIG["camera"])
+            f_engine = pool.submit(self._muat_engine, engine_config or DEFAULT_CONFIG["engine"])
+            # Headless tidak pernah menggambar, supervision tidak perlu di-import
+            f_annotator = pool.submit(self._muat_annotator) if not headless else None
+            self.camera = f_kamera.result()
+            try:
+                self.engine = f_engine.result()
+                if f_annotator is not None:
+                    f_annotator.result()
+            except Exception:
+                self.camera.release()
+                raise
+
+        # Driver boleh menolak resolusi yang diminta; koordinat mengikuti frame sebenarnya
+        if all(self.camera.resolution):
+            resolution = self.camera.resolution
+            self.frame_width, self.frame_height = resolution
+
+        self.startup["siap"] = time.perf_counter() - self.t_start
+        LOG.info("detector", "Engine %s: %s", self.engine.backend, self.engine.path)
+        LOG.info("startup", "Siap dalam %.2fs (kamera %.2fs, model %.2fs, warm-up %.2fs)",
+                 self.startup["siap"], self.startup["kamera"], self.startup["model"], self.startup["warmup"])
+
+        # Tabel piksel -> (jarak, arah) di lantai, dibangun sekali untuk resolusi kamera sebenarnya
+        field_config = field_config or DEFAULT_CONFIG["field"]
+        self.field = None
+        if field_config.get("enabled", False):
+            mulai = time.perf_counter()
+            self.field = FieldMap.load(field_config, resolution)
+            self.startup["tabel_lapangan"] = time.perf_counter() - mulai
+
+        # Preview MJPEG untuk basestation; jika aktif, tidak ada jendela cv2.imshow
+        preview_config = preview_config or DEFAULT_CONFIG["preview"]
+        self.preview = None
+        if preview_config.get("enabled", False) and not headless:
+            try:
+                self.preview = PreviewServer.from_config(preview_config, resolution)
+            except OSError as e:
+                LOG.error("preview", "Server preview tidak bisa dibuka, kembali ke jendela: %s", e)
+
+        # Jendela pencarian bola untuk mode tracking
+        self.search_window = SearchWindow(resolution, redetect_interval) if tracking else None
+
+        # Tracker Kalman + optical flow di antara frame yang dideteksi YOLO
+        self.tracker = BallTracker(max_interval=detect_interval) if detect_interval > 1 else None
+
+        # Pemilih target: satu box terbaik per frame, bukan box terakhir di loop
+        self.selector = TargetSelector(resolution)
+
+        # Pengatur imgsz dan batas FPS agar latensi tetap di bawah budget
+        quality_config = quality_config or DEFAULT_CONFIG["quality"]
+        self.quality = None
+        if quality_config.get("enabled", True):
+            self.quality = QualityController(
+                budget_ms=quality_config.get("budget_ms", 60),
+                imgsz_steps=quality_config.get("imgsz_steps", (320, 416, 512, 640)),
+                fps_steps=quality_config.get("fps_steps", (10, 15, 20, 30)),
+            )
+
+        # Kandidat bola dari threshold HSV; YOLO hanya memverifikasi crop kandidat
+        cascade_config = cascade_config or DEFAULT_CONFIG["cascade"]
+        self.cascade = ColorCascade.from_config(cascade_config) if cascade_config.get("enabled", False) else None
+
+        # Encoder frame biner, hanya dipakai jika protocol="binary"
+        self.encoder = FrameEncoder() if protocol == "binary" else None
 
-        # Simpan data terakhir yang dikirim agar tidak redundant
-        self.last_sent = ""
+        # Penulis serial di thread sendiri, loop kamera hanya menitipkan data terbaru
+        self.writer = SerialWriter(arduino).start() if arduino else None
+
+        # Simpan target terakhir yang dikirim agar tidak redundant
+        self.last_sent = None
+
+        # Nomor urut frame terakhir di output, untuk menghitung frame yang terlewat
+        self.last_seq = None
+        self.frame_terlewat = 0
+
+        # Durasi YOLO pada frame yang sedang diproses (bisa lebih dari satu panggilan)
+        self._durasi_inferensi = 0.0
+
+        # Hasil resize jendela tampilan ditulis ke buffer yang sama setiap frame
+        self.display_buffer = ResizeBuffer((int(self.frame_width * self.display_scale),
+                                     int(self.frame_height * self.display_scale)))
+
+        # Angka yang dibaca endpoint metrik saat di-scrape, bukan tiap frame
+        REGISTRY.register_collector("camera", self.camera.metrics)
+        REGISTRY.register_collector("startup", lambda: dict(self.startup))
+        if self.quality is not None:
+            REGISTRY.register_collector("quality", self.quality.metrics)
+        if self.cascade is not None:
+            REGISTRY.register_collector("cascade", self.cascade.metrics)
+        if self.preview is not None:
+            REGISTRY.register_collector("preview", self.preview.metrics)
+        if self.writer is not None:
+            REGISTRY.register_collector("serial", self.writer.stats)
+
+        # Flight recorder: semua frame, hasil deteksi, dan byte serial ke file mmap
+        recorder_config = recorder_config or DEFAULT_CONFIG["recorder"]
+        self.recorder = None
+        if recorder_config.get("enabled", False):
+            path = os.path.join(recorder_config.get("folder", "rekaman_match"),
+                                time.strftime("match_%Y%m%d_%H%M%S"))
+            self.recorder = Recorder(path, jpeg_quality=recorder_config.get("jpeg_quality", 85),
+                                     max_queue_mb=recorder_config.get("max_queue_mb", 32)).start()
+            LOG.info("recorder", "Merekam ke %s.rec", path)
+
+    def _buka_kamera(self, camera_config):
+        """
+        Buka kamera MJPG dengan buffer driver minimal (dijalankan di thread startup).
+        Jika "replay" diisi path rekaman, frame diambil dari rekaman tersebut.
+        """
+        mulai = time.perf_counter()
+        camera = open_camera(camera_config, (self.frame_width, self.frame_height))
+        self.startup["kamera"] = time.perf_counter() - mulai
+        return camera
+
+    def _muat_engine(self, engine_config):
+        """
+        Load model YOLOv8 lewat engine (PyTorch / ONNX Runtime / OpenVINO), lalu warm-up
+        dengan frame kosong seukuran frame kamera agar frame pertama tidak ikut menanggung
+        biaya inisialisasi.
+        """
+        mulai = time.perf_counter()
+        engine = create_engine(engine_config, (self.frame_height, self.frame_width, 3))
+        self.startup["model"] = time.perf_counter() - mulai
+
+        mulai = time.perf_counter()
+        engine.warmup((self.frame_height, self.frame_width, 3))
+        self.startup["warmup"] = time.perf_counter() - mulai
+        return engine
+
+    def _muat_annotator(self):
+        """
+        Import supervision hanya saat Detector dibuat karena import-nya lambat.
+        """
+        import supervision as sv
+        self.sv = sv
+        self.box_annotator = sv.BoxAnnotator(thickness=2)
 
     def run(self):
         """
         Fungsi utama untuk mendeteksi objek, menggambar anotasi, dan mengirim koordinat ke Arduino.
         """
+        if self.pipelined:
+            self._run_pipelined()
+        else:
+            self._run_sequential()
+
+        self.cleanup()
+
+    def _run_sequential(self):
+        """
+        Mode lama: capture, deteksi, kirim, dan tampil berurutan di satu thread.
+        """
         while self.running:
-            ret, frame = self.cap.read()
-            if not ret:
+            if self.quality is not None:
+                self.quality.pace()
+            with REGISTRY.timer("capture"):
+                item = self.camera.read()
+            if item is None:
                 break
+            if self.recorder is not None:
+                self.recorder.record_frame(item)
 
-            # Jalankan deteksi objek menggunakan YOLOv8
-            results = self.model(frame)[0]
-            boxes = results.boxes.xyxy.cpu().numpy()
-            confidences = results.boxes.conf.cpu().numpy()
-            class_ids = results.boxes.cls.cpu().numpy()
-            class_names = self.model.names
-
-            # Konversi hasil ke format Detections dari supervision
-            detections = sv.Detections(
-                xyxy=boxes,
-                confidence=confidences,
-                class_id=class_ids.astype(int)
-            )
+            self.camera.report_age(item)
+            hasil = self._deteksi(item.image)
+            lanjut = self._output(item, hasil)
+            # Buffer frame kembali ke pool kamera setelah anotasi + tampil selesai
+            self.camera.recycle(item)
+            if not lanjut:
+                break
 
-            # Gambar bounding box
-            frame = self.box_annotator.annotate(scene=frame, detections=detections)
+    def _run_pipelined(self):
+        """
+        Mode pipeline: capture, deteksi, dan output berjalan di thread masing-masing.
+        Antar stage dihubungkan LatestSlot sehingga frame basi dibuang, bukan diantrikan.
+        Stage output tetap di thread pemanggil karena cv2.imshow harus di satu thread.
+        Frame yang ditimpa di slot langsung dikembalikan ke pool kamera.
+        """
+        slot_frame = LatestSlot(on_drop=self.camera.recycle)
+        slot_hasil = LatestSlot(on_drop=lambda item: self.camera.recycle(item[0]))
+
+        def capture_loop():
+            while self.running:
+                if self.quality is not None:
+                    self.quality.pace()
+                with REGISTRY.timer("capture"):
+                    item = self.camera.read()
+                if item is None:
+                    self.running = False
+                    break
+                if self.recorder is not None:
+                    self.recorder.record_frame(item)
+                slot_frame.put(item)
+            slot_frame.close()
 
-            # Titik tengah frame kamera
-            center_camera_x = self.frame_width // 2
-            center_camera_y = self.frame_height // 2
+        def inference_loop():
+            while self.running:
+                item = slot_frame.get(timeout=0.1)
+                if item is None:
+                    if slot_frame.closed:
+                        break
+                    continue
+                # Umur frame saat deteksi mulai: waktu tunggu di kamera + slot
+                self.camera.report_age(item)
+                slot_hasil.put((item, self._deteksi(item.image)))
+            slot_hasil.close()
 
-            # Data default jika tidak ada deteksi
-            current_data = "x0y0>\n"
+        threads = [
+            threading.Thread(target=capture_loop, name="capture", daemon=True),
+            threading.Thread(target=inference_loop, name="inference", daemon=True),
+        ]
+        for t in threads:
+            t.start()
+
+        while self.running:
+            item = slot_hasil.get(timeout=0.1)
+            if item is None:
+                if slot_hasil.closed:
+                    break
+                continue
+            frame, hasil = item
+            lanjut = self._output(frame, hasil)
+            self.camera.recycle(frame)
+            if not lanjut:
+                break
 
-            # Iterasi setiap deteksi
-            for box, confidence, class_id in zip(boxes, confidences, class_ids):
-                x1, y1, x2, y2 = box.astype(int)
-                x_center = (x1 + x2) // 2
-                y_center = (y1 + y2) // 2
+        # Hentikan thread lain sebelum kamera dilepas
+        self.running = False
+        for t in threads:
+            t.join(timeout=2)
+
+        LOG.info("detector", "Frame dibuang: capture=%d, deteksi=%d", slot_frame.ditimpa, slot_hasil.ditimpa)
+
+    def _deteksi(self, frame):
+        """
+        Jalankan _deteksi_frame dan catat waktunya, dipisah menjadi stage "inference"
+        (YOLO) dan "postprocess" (tracker, pemilihan target, koreksi box).
+
+        :param frame: frame BGR dari kamera
+        :return: tuple (boxes, confidences, class_ids, target)
+        """
+        self._durasi_inferensi = 0.0
+        mulai = time.perf_counter()
+        hasil = self._deteksi_frame(frame)
+        total = time.perf_counter() - mulai
 
-                current_data = f"x{x_center}y{y_center}>\n"
+        if self._durasi_inferensi > 0:  # Frame tracker tidak menjalankan YOLO
+            REGISTRY.observe("inference", self._durasi_inferensi)
+        REGISTRY.observe("postprocess", total - self._durasi_inferensi)
+        return hasil
 
-                # Gambar titik tengah objek
-                print(f"Bola Terdeteksi pada: X={x_center}, Y={y_center}")
-                cv2.circle(frame, (x_center, y_center), 5, (0, 255, 0), -1)
+    def _deteksi_frame(self, frame):
+        """
+        Tentukan posisi bola pada satu frame dan pilih satu target. Jika tracker aktif,
+        YOLO hanya dijalankan saat tracker meminta deteksi ulang dan koordinat target
+        adalah hasil fusi tracker, sehingga data serial tetap mengikuti laju kamera.
 
-                # Gambar garis dari titik tengah kamera ke objek
-                cv2.line(
-                    frame,
-                    (center_camera_x, center_camera_y),
-                    (int(x_center), int(y_center)),
-                    (255, 255, 0),
-                    2
+        :param frame: frame BGR dari kamera
+        :return: tuple (boxes, confidences, class_ids, target) dengan target berupa
+                 index box terpilih atau None jika tidak ada bola
+        """
+        if self.tracker is not None and not self.tracker.need_detection():
+            box = self.tracker.track(frame)
+            if box is not None:
+                self.selector.update(box)
+                return (
+                    box[np.newaxis, :],
+                    np.array([self.tracker.confidence], np.float32),
+                    np.array([self.tracker.class_id], np.float32),
+                    0,
                 )
 
-            # Kirim data ke Arduino hanya jika berbeda dari sebelumnya
-            if self.arduino and current_data != self.last_sent:
-                try:
-                    self.arduino.write(current_data.encode())
-                    self.last_sent = current_data
-                    print(f"[Kamera => Arduino] {current_data.strip()}")
-                except Exception as e:
-                    print(f"[ERROR Kirim Serial]: {e}")
-
-            # Tampilkan hasil deteksi (diperbesar sesuai skala)
-            frame_resized = cv2.resize(
+        boxes, confidences, class_ids = self._deteksi_yolo(frame)
+        target = self.selector.select(boxes, confidences, class_ids)
+
+        if self.tracker is not None:
+            if target is None:
+                self.tracker.correct(frame, None)
+            else:
+                # Box target diganti estimasi fusi tracker
+                boxes[target] = self.tracker.correct(frame, boxes[target], int(class_ids[target]))
+                self.selector.update(boxes[target])
+
+        return boxes, confidences, class_ids, target
+
+    def _deteksi_yolo(self, frame):
+        """
+        Jalankan YOLOv8 pada satu frame. Pada mode tracking, deteksi dijalankan pada
+        crop di sekitar bola terakhir; jika cascade warna aktif, berikutnya YOLO mencoba
+        crop kandidat warna, dan baru kembali ke full-frame jika keduanya tidak menemukan bola.
+
+        :param frame: frame BGR dari kamera
+        :return: tuple (boxes, confidences, class_ids) dalam bentuk numpy
+        """
+        # imgsz full-frame dipilih QualityController, None = bawaan engine
+        imgsz_full = self.quality.imgsz if self.quality is not None else None
+
+        region = self.search_window.next_region() if self.search_window is not None else None
+        if region is not None:
+            x1, y1, x2, y2, imgsz = region
+            if imgsz_full is not None:
+                imgsz = min(imgsz, imgsz_full)
+            boxes, confidences, class_ids = self._deteksi_region(frame[y1:y2, x1:x2], imgsz)
+            if len(boxes):
+                # Kembalikan koordinat crop ke koordinat frame penuh
+                boxes[:, [0, 2]] += x1
+                boxes[:, [1, 3]] += y1
+                self.search_window.update(boxes, full_frame=False)
+                return boxes, confidences, class_ids
+
+        # Kandidat warna: YOLO hanya memverifikasi crop kecil di sekitar blob oranye
+        if self.cascade is not None:
+            with REGISTRY.timer("cascade"):
+                regions = self.cascade.propose(frame)
+            if regions:
+                mulai = time.perf_counter()
+                boxes, confidences, class_ids = verify_regions(self.engine, frame, regions)
+                self._durasi_inferensi += time.perf_counter() - mulai
+                if len(boxes):
+                    self.cascade.update(frame, boxes, confidences, full_frame=False)
+                    if self.search_window is not None:
+                        self.search_window.update(boxes, full_frame=False)
+                    return boxes, confidences, class_ids
+
+        # Bola belum terkunci, sudah waktunya re-deteksi, atau bola hilang dari crop
+        boxes, confidences, class_ids = self._deteksi_region(frame, imgsz_full)
+        if self.cascade is not None:
+            self.cascade.update(frame, boxes, confidences, full_frame=True)
+        if self.search_window is not None:
+            self.search_window.update(boxes, full_frame=True)
+        return boxes, confidences, class_ids
+
+    def _deteksi_region(self, image, imgsz=None):
+        """
+        Jalankan model YOLOv8 pada gambar (frame penuh atau crop).
+
+        :param image: gambar BGR
+        :param imgsz: ukuran input model, None = bawaan engine
+        :return: tuple (boxes, confidences, class_ids) dalam bentuk numpy
+        """
+        mulai = time.perf_counter()
+        hasil = self.engine.predict(image, imgsz)
+        self._durasi_inferensi += time.perf_counter() - mulai
+        return hasil
+
+    def _output(self, item, hasil):
+        """
+        Stage output: kirim koordinat ke Arduino, gambar anotasi, dan tampilkan.
+
+        :param item: Frame (image, seq, t_capture) yang dideteksi
+        :param hasil: tuple (boxes, confidences, class_ids, target) dari _deteksi
+        :return: False jika pengguna menekan 'q'
+        """
+        frame, t_capture = item.image, item.t_capture
+        boxes, confidences, class_ids, target = hasil
+
+        # Lompatan seq = frame kamera yang tidak pernah sampai ke output
+        if self.last_seq is not None:
+            self.frame_terlewat += item.seq - self.last_seq - 1
+        self.last_seq = item.seq
+
+        # Titik tengah frame kamera
+        center_camera_x = self.frame_width // 2
+        center_camera_y = self.frame_height // 2
+
+        # Titik tengah semua box dihitung sekaligus
+        centers = ((boxes[:, 0:2] + boxes[:, 2:4]) // 2).astype(int)
+
+        # Target default None jika tidak ada deteksi
+        target_data = None
+        lapangan = None
+        if target is not None:
+            x_center, y_center = centers[target]
+            target_data = (int(x_center), int(y_center), int(class_ids[target]), float(confidences[target]))
+            if self.field is not None:
+                # Titik sentuh bola dengan lantai = tengah sisi bawah box
+                lapangan = self.field.lookup(x_center, boxes[target, 3])
+            # Tiap frame: cukup diringkas, bukan satu baris console per frame
+            LOG.summary("detector", "bola", "Bola Terdeteksi pada: X=%d, Y=%d", x_center, y_center)
+            if "first_detection" not in self.startup:
+                self.startup["first_detection"] = time.perf_counter() - self.t_start
+                LOG.info("startup", "Time-to-first-detection: %.2fs", self.startup["first_detection"])
+
+        # Kirim data ke Arduino lebih dulu agar tidak menunggu proses gambar
+        with REGISTRY.timer("serial_submit"):
+            data_serial = self._kirim(target_data, t_capture, lapangan)
+        if self.recorder is not None:
+            self.recorder.record_result(item.seq, t_capture, boxes, confidences, class_ids, target, data_serial)
+
+        # Latensi yang dijaga controller: dari frame ditangkap sampai data serial dititipkan
+        latensi = time.monotonic() - t_capture
+        REGISTRY.observe("end_to_end", latensi)
+        if self.quality is not None:
+            self.quality.record(latensi)
+
+        # Mode pertandingan: hasil sudah terkirim, tidak ada yang digambar
+        if self.headless:
+            return True
+
+        if self.preview is not None:
+            # Anotasi hanya untuk penonton preview, digambar thread encoder pada frame kecil
+            if self.preview.wants_frame():
+                mulai = time.perf_counter()
+                teks = f"{lapangan[0] / 10:.0f} cm {lapangan[1]:+.1f} deg" if lapangan is not None else None
+                self.preview.submit(frame, boxes, target, teks)
+                REGISTRY.observe("preview", time.perf_counter() - mulai)
+            return True
+
+        mulai = time.perf_counter()
+
+        # Konversi hasil ke format Detections dari supervision
+        detections = self.sv.Detections(
+            xyxy=boxes,
+            confidence=confidences,
+            class_id=class_ids.astype(int)
+        )
+
+        # Gambar bounding box
+        frame = self.box_annotator.annotate(scene=frame, detections=detections)
+
+        # Loop per box hanya untuk menggambar
+        for x_center, y_center in centers:
+            # Gambar titik tengah objek
+            cv2.circle(frame, (int(x_center), int(y_center)), 5, (0, 255, 0), -1)
+
+            # Gambar garis dari titik tengah kamera ke objek
+            cv2.line(
                 frame,
-                (int(self.frame_width * self.display_scale), int(self.frame_height * self.display_scale))
+                (center_camera_x, center_camera_y),
+                (int(x_center), int(y_center)),
+                (255, 255, 0),
+                2
             )
-            cv2.imshow("YOLOv8 Detection", frame_resized)
-
-            # Baca feedback dari Arduino jika ada
-            if self.arduino and self.arduino.in_waiting:
-                try:
-                    line = self.arduino.readline().decode().strip()
-                    if line:
-                        print(f"[Arduino => Kamera] {line}")
-                except Exception as e:
-                    print(f"[Serial Error]: {e}")
-
-            # Tekan tombol 'q' untuk keluar
-            if cv2.waitKey(1) & 0xFF == ord('q'):
-                break
 
-        self.cleanup()
+        if lapangan is not None:
+            cv2.putText(frame, f"{lapangan[0] / 10:.0f} cm {lapangan[1]:+.1f} deg",
+                        (int(centers[target][0]) + 10, int(centers[target][1]) + 20),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
+
+        selesai_anotasi = time.perf_counter()
+        REGISTRY.observe("annotate", selesai_anotasi - mulai)
+
+        # Tampilkan hasil deteksi (diperbesar sesuai skala) tanpa alokasi array baru
+        cv2.imshow("YOLOv8 Detection", self.display_buffer.resize(frame))
+
+        # Feedback Arduino tidak dibaca di sini lagi: SerialHub membacanya di thread
+        # sendiri dan membagikannya ke subscriber, jadi frame tidak pernah tertahan readline()
+
+        # Tekan tombol 'q' untuk keluar
+        keluar = cv2.waitKey(1) & 0xFF == ord('q')
+        REGISTRY.observe("display", time.perf_counter() - selesai_anotasi)
+        return not keluar
+
+    def _kirim(self, target_data, t_capture, lapangan=None):
+        """
+        Kirim target ke Arduino hanya jika berbeda dari sebelumnya.
+
+        :param target_data: tuple (x, y, class_id, confidence), atau None jika bola tidak terlihat
+        :param t_capture: waktu capture frame, ikut dikirim pada protokol biner
+        :param lapangan: (jarak_mm, arah_derajat) dari FieldMap, atau None
+        :return: byte yang dititipkan ke penulis serial, atau None jika tidak ada yang dikirim
+        """
+        key = target_data[:2] if target_data is not None else None
+        if self.writer is None or key == self.last_sent:
+            return None
+
+        if self.encoder is not None and lapangan is not None:
+            data = self.encoder.encode_field([(lapangan[0] / 10.0, lapangan[1]) + target_data[2:]], t_capture)
+        elif self.encoder is not None:
+            data = self.encoder.encode_targets([target_data] if target_data else [], t_capture)
+        elif target_data is None:
+            data = b"x0y0>\n"
+        elif lapangan is not None:
+            # d = jarak (cm), a = arah (0,1 derajat, + = kanan): Arduino tidak perlu trigonometri
+            data = (f"x{target_data[0]}y{target_data[1]}"
+                    f"d{int(round(lapangan[0] / 10.0))}a{int(round(lapangan[1] * 10))}>\n").encode()
+        else:
+            data = f"x{target_data[0]}y{target_data[1]}>\n".encode()
+
+        # Tidak pernah blok: data lama yang belum terkirim ditimpa data ini
+        self.writer.submit(data)
+        self.last_sent = key
+        LOG.summary("serial", "kirim", "Kamera => Arduino x%dy%d", *(key or (0, 0)))
+        return data
+
+    def stop(self):
+        """
+        Minta loop deteksi berhenti; run() selesai setelah frame yang sedang diproses
+        lalu membersihkan kamera. Aman dipanggil dari thread lain / handler sinyal.
+        """
+        self.running = False
 
     def cleanup(self):
         """
         Bersihkan kamera dan tutup semua jendela saat selesai.
         """
-        self.cap.release()
-        cv2.destroyAllWindows()
-        if self.arduino:
-            self.arduino.close()
+        self.camera.release()
+        if self.preview is not None:
+            self.preview.close()
+            LOG.info("preview", "%s", self.preview.metrics())
+        elif not self.headless:
+            cv2.destroyAllWindows()
+        LOG.info("camera", "%s, terlewat sebelum output=%d", self.camera.metrics(), self.frame_terlewat)
+        if self.quality is not None:
+            LOG.info("quality", "%s", self.quality.metrics())
+        if self.writer:
+            self.writer.stop()
+            LOG.info("serial", "%s", self.writer.stats())
+        if self.recorder is not None:
+            self.recorder.close()
+        self.engine.close()
+        # Port Arduino milik main.py (dipakai juga oleh bridge basestation), ditutup di sana
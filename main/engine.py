@@ -0,0 +1,182 @@
+# ============ Module Engine Inferensi ================
+# Program ini berisi abstraksi engine YOLO untuk Detector
+# Backend PyTorch (.pt), ONNX Runtime (.onnx), atau OpenVINO, dipilih dari config
+
+"""
+Library yang digunakan
+"""
+import os
+
+import numpy as np
+
+from ringlog import LOG
+
+BACKENDS = ("pytorch", "onnx", "openvino")
+
+
+def exported_path(weights, backend, int8=False):
+    """
+    Tentukan lokasi model hasil export untuk satu backend.
+
+    :param weights: path model .pt asli, contoh "best_ball4.pt"
+    :param backend: "pytorch", "onnx", atau "openvino"
+    :param int8: varian INT8 hasil kuantisasi
+    :return: path file / folder model untuk backend tersebut
+    """
+    if backend == "pytorch":
+        return weights
+    stem = os.path.splitext(weights)[0] + ("_int8" if int8 else "")
+    if backend == "onnx":
+        return stem + ".onnx"
+    if backend == "openvino":
+        return stem + "_openvino_model"
+    raise ValueError(f"Backend tidak dikenal: {backend} (pilih dari {BACKENDS})")
+
+
+def fused_cache_path(weights):
+    """
+    Lokasi cache model .pt yang sudah di-fuse. Ukuran dan waktu modifikasi file asli
+    ikut di nama file, jadi cache otomatis diperbarui jika model diganti.
+    """
+    stat = os.stat(weights)
+    folder = os.path.join(os.path.dirname(os.path.abspath(weights)), ".model_cache")
+    stem = os.path.splitext(os.path.basename(weights))[0]
+    return os.path.join(folder, f"{stem}_{stat.st_size}_{int(stat.st_mtime)}_fused.pt")
+
+
+def build_fused_cache(weights):
+    """
+    Simpan model yang sudah di-fuse (Conv+BN) tanpa state optimizer/EMA,
+    sehingga start berikutnya memuat file lebih kecil dan tidak perlu fuse ulang.
+
+    :return: path cache, atau path asli jika cache gagal dibuat
+    """
+    path = fused_cache_path(weights)
+    if os.path.exists(path):
+        return path
+
+    import torch
+    from ultralytics import YOLO
+
+    try:
+        yolo = YOLO(weights)
+        yolo.model.fuse()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        ckpt = dict(yolo.ckpt or {})
+        ckpt.update({"model": yolo.model, "ema": None, "optimizer": None, "updates": None})
+        tmp = path + ".tmp"
+        torch.save(ckpt, tmp)
+        os.replace(tmp, path)  # Atomic: proses yang crash tidak meninggalkan cache rusak
+        return path
+    except Exception as e:
+        LOG.warning("engine", "Cache model gagal dibuat, pakai %s: %s", weights, e)
+        return weights
+
+
+def _pisah_boxes(boxes):
+    """
+    Ambil hasil deteksi dengan satu kali salin ke numpy: boxes.data (N, 6) berisi
+    x1 y1 x2 y2 conf cls, lalu dipotong menjadi view tanpa salinan tambahan.
+
+    :param boxes: ultralytics Boxes
+    :return: tuple (boxes, confidences, class_ids), view dari array yang sama
+    """
+    data = boxes.data.cpu().numpy()
+    return data[:, :4], data[:, -2], data[:, -1]
+
+
+class InferenceEngine:
+    """
+    Pembungkus model YOLO yang sama untuk semua backend. Ultralytics sendiri yang
+    memanggil ONNX Runtime / OpenVINO saat model hasil export dimuat, jadi hasil
+    predict() selalu berbentuk sama.
+    """
+    def __init__(self, weights="best_ball4.pt", backend="pytorch", int8=False, imgsz=640, conf=0.25,
+                 cache_fused=True):
+        """
+        :param weights: path model .pt asli
+        :param backend: "pytorch", "onnx", atau "openvino"
+        :param int8: pakai varian INT8 (hanya untuk onnx / openvino)
+        :param imgsz: ukuran input bawaan
+        :param conf: confidence threshold
+        :param cache_fused: untuk backend pytorch, muat model fused dari cache di disk
+        """
+        # Import ultralytics di sini (bukan di atas) agar program utama cepat start
+        from ultralytics import YOLO
+
+        self.backend = backend
+        self.path = exported_path(weights, backend, int8 and backend != "pytorch")
+        if not os.path.exists(self.path):
+            raise FileNotFoundError(
+                f"Model {self.path} belum ada. Jalankan: python export_model.py "
+                f"--weights {weights} --format {backend}{' --int8' if int8 else ''}")
+
+        load_path = self.path
+        if backend == "pytorch" and cache_fused:
+            load_path = build_fused_cache(self.path)
+
+        # Model hasil export tidak menyimpan jenis task, jadi ditulis eksplisit
+        self.model = YOLO(load_path, task="detect")
+        self.imgsz = imgsz
+        self.conf = conf
+
+    @property
+    def names(self):
+        return self.model.names
+
+    def predict(self, image, imgsz=None):
+        """
+        Jalankan deteksi pada satu gambar.
+
+        :param image: gambar BGR (frame penuh atau crop)
+        :param imgsz: ukuran input, None = imgsz bawaan engine
+        :return: tuple (boxes, confidences, class_ids) dalam bentuk numpy
+        """
+        results = self.model(image, imgsz=imgsz or self.imgsz, conf=self.conf, verbose=False)[0]
+        return _pisah_boxes(results.boxes)
+
+    def predict_batch(self, images, imgsz=None):
+        """
+        Jalankan deteksi pada beberapa gambar dalam satu forward pass (satu batch).
+
+        :param images: list gambar BGR, misalnya frame terbaru dari tiap kamera
+        :param imgsz: ukuran input, None = imgsz bawaan engine
+        :return: list tuple (boxes, confidences, class_ids), urutannya sama dengan `images`
+        """
+        return [_pisah_boxes(results.boxes)
+                for results in self.model(list(images), imgsz=imgsz or self.imgsz, conf=self.conf, verbose=False)]
+
+    def close(self):
+        # Model di proses yang sama tidak perlu ditutup (lihat ProcessEngine.close)
+        pass
+
+    def warmup(self, shape=(720, 1280, 3)):
+        """
+        Jalankan satu inferensi pada frame kosong supaya biaya pertama (setup predictor,
+        alokasi memori, kompilasi graph backend) tidak jatuh ke frame kamera pertama.
+
+        :param shape: bentuk frame kamera (h, w, 3)
+        """
+        self.predict(np.zeros(shape, np.uint8))
+
+
+def create_engine(engine_config, frame_shape=(720, 1280, 3)):
+    """
+    Buat engine dari bagian "engine" di config.json.
+
+    :param engine_config: dict berisi backend, weights, int8, imgsz, conf, worker_process
+    :param frame_shape: bentuk frame terbesar, untuk ukuran slot shared memory worker
+    :return: InferenceEngine, atau ProcessEngine jika worker_process aktif
+    """
+    if engine_config.get("worker_process", False):
+        # Model dijalankan di proses lain agar tidak berebut GIL dengan bridge / serial
+        from inference_worker import ProcessEngine
+        return ProcessEngine(engine_config, frame_shape)
+
+    return InferenceEngine(
+        weights=engine_config.get("weights", "best_ball4.pt"),
+        backend=engine_config.get("backend", "pytorch"),
+        int8=engine_config.get("int8", False),
+        imgsz=engine_config.get("imgsz", 640),
+        conf=engine_config.get("conf", 0.25),
+    )
@@ -0,0 +1,153 @@
+# ============ Program Export & Kuantisasi Model ================
+# Program ini meng-export model YOLO .pt ke ONNX / OpenVINO untuk inferensi CPU
+# Opsi --int8 mengkalibrasi kuantisasi INT8 memakai frame hasil rekaman robot
+#
+# Contoh:
+#   python export_model.py --weights best_ball4.pt --format onnx
+#   python export_model.py --weights best_ball4.pt --format openvino --int8 --calib rekaman/
+
+"""
+Library yang digunakan
+"""
+import argparse
+import glob
+import os
+import tempfile
+
+import cv2
+import numpy as np
+from ultralytics import YOLO
+
+from engine import exported_path
+
+IMAGE_EXT = (".jpg", ".jpeg", ".png", ".bmp")
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Export YOLOv8 ke ONNX / OpenVINO")
+    parser.add_argument("--weights", default="best_ball4.pt", help="Model .pt asli")
+    parser.add_argument("--format", default="onnx", choices=["onnx", "openvino"], help="Backend tujuan")
+    parser.add_argument("--int8", action="store_true", help="Kuantisasi INT8 dengan kalibrasi frame rekaman")
+    parser.add_argument("--calib", default=None, help="Folder gambar atau file video untuk kalibrasi INT8")
+    parser.add_argument("--calib-frames", default=200, type=int, help="Jumlah frame kalibrasi maksimal")
+    parser.add_argument("--imgsz", default=640, type=int, help="Ukuran input model")
+    return parser.parse_args()
+
+
+def load_frames(source, limit=200):
+    """
+    Ambil frame BGR dari folder gambar atau file video.
+
+    :param source: folder berisi gambar, atau path video
+    :param limit: jumlah frame maksimal (diambil merata dari seluruh sumber)
+    :return: list frame BGR
+    """
+    if os.path.isdir(source):
+        files = sorted(f for f in glob.glob(os.path.join(source, "*")) if f.lower().endswith(IMAGE_EXT))
+        if len(files) > limit:
+            files = [files[i] for i in np.linspace(0, len(files) - 1, limit).astype(int)]
+        return [img for img in (cv2.imread(f) for f in files) if img is not None]
+
+    cap = cv2.VideoCapture(source)
+    total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) or limit
+    step = max(1, total // limit)
+    frames = []
+    index = 0
+    while len(frames) < limit:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        if index % step == 0:
+            frames.append(frame)
+        index += 1
+    cap.release()
+    return frames
+
+
+def letterbox(image, imgsz):
+    """
+    Praproses sama seperti ultralytics: resize proporsional, padding abu-abu 114,
+    BGR -> RGB, HWC -> NCHW float32 0..1.
+    """
+    h, w = image.shape[:2]
+    r = min(imgsz / h, imgsz / w)
+    nh, nw = int(round(h * r)), int(round(w * r))
+    canvas = np.full((imgsz, imgsz, 3), 114, np.uint8)
+    top, left = (imgsz - nh) // 2, (imgsz - nw) // 2
+    canvas[top:top + nh, left:left + nw] = cv2.resize(image, (nw, nh), interpolation=cv2.INTER_LINEAR)
+    return np.ascontiguousarray(canvas[:, :, ::-1].transpose(2, 0, 1))[None].astype(np.float32) / 255.0
+
+
+def quantize_onnx(fp32_path, int8_path, frames, imgsz):
+    """
+    Kuantisasi statis ONNX (QDQ, bobot INT8 per-channel) dengan ONNX Runtime.
+    """
+    import onnxruntime as ort
+    from onnxruntime.quantization import CalibrationDataReader, QuantFormat, QuantType, quantize_static
+
+    input_name = ort.InferenceSession(fp32_path, providers=["CPUExecutionProvider"]).get_inputs()[0].name
+
+    class FrameReader(CalibrationDataReader):
+        def __init__(self):
+            self._iter = iter(frames)
+
+        def get_next(self):
+            frame = next(self._iter, None)
+            return None if frame is None else {input_name: letterbox(frame, imgsz)}
+
+    quantize_static(
+        fp32_path, int8_path, FrameReader(),
+        quant_format=QuantFormat.QDQ,
+        per_channel=True,
+        weight_type=QuantType.QInt8,
+        activation_type=QuantType.QUInt8,
+    )
+
+
+def calibration_yaml(frames, names, folder):
+    """
+    Tulis frame kalibrasi + file data.yaml yang dibutuhkan export INT8 OpenVINO (NNCF).
+    """
+    for i, frame in enumerate(frames):
+        cv2.imwrite(os.path.join(folder, f"calib_{i:04d}.jpg"), frame)
+    path = os.path.join(folder, "calib.yaml")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"path: {folder}\ntrain: .\nval: .\nnames:\n")
+        for class_id, name in names.items():
+            f.write(f"  {class_id}: {name}\n")
+    return path
+
+
+def main():
+    args = parse_arguments()
+    model = YOLO(args.weights)
+
+    if args.int8 and not args.calib:
+        print("Export INT8 butuh --calib (folder frame rekaman atau video).")
+        return
+
+    frames = load_frames(args.calib, args.calib_frames) if args.int8 else []
+    if args.int8:
+        print(f"[Export] {len(frames)} frame kalibrasi dari {args.calib}")
+
+    # dynamic=True supaya crop mode tracking (imgsz kecil) tetap bisa dipakai
+    if args.format == "onnx":
+        fp32_path = model.export(format="onnx", imgsz=args.imgsz, dynamic=True, simplify=True)
+        hasil = fp32_path
+        if args.int8:
+            hasil = exported_path(args.weights, "onnx", int8=True)
+            quantize_onnx(fp32_path, hasil, frames, args.imgsz)
+    else:
+        if args.int8:
+            with tempfile.TemporaryDirectory() as folder:
+                data = calibration_yaml(frames, model.names, folder)
+                hasil = model.export(format="openvino", imgsz=args.imgsz, dynamic=True, int8=True, data=data)
+        else:
+            hasil = model.export(format="openvino", imgsz=args.imgsz, dynamic=True)
+
+    print(f"[Export] Selesai: {hasil}")
+    print("Bandingkan dengan model .pt: python benchmark_engine.py --source <rekaman>")
+
+
+if __name__ == "__main__":
+    main()
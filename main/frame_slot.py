@@ -0,0 +1,73 @@
+# ============ Module Slot Data Terbaru ================
+# Program ini berisi slot satu-isi ("latest frame wins") untuk menghubungkan
+# thread-thread pipeline tanpa menumpuk antrian frame yang sudah basi
+
+"""
+Library yang digunakan
+"""
+import threading
+
+
+class LatestSlot:
+    """
+    Slot berkapasitas satu item. Penulis selalu menimpa isi lama sehingga
+    pembaca hanya pernah mendapat data paling baru, bukan antrian frame basi.
+    """
+    def __init__(self, on_drop=None):
+        """
+        :param on_drop: dipanggil dengan item yang ditimpa sebelum sempat dibaca, misalnya
+                        untuk mengembalikan buffer frame ke pool (None = item lama dibiarkan)
+        """
+        self.on_drop = on_drop
+        self._cond = threading.Condition()
+        self._item = None
+        self._ada = False
+        self._tertutup = False
+        self.ditimpa = 0  # Jumlah item yang dibuang karena belum sempat dibaca
+
+    def put(self, item):
+        """
+        Simpan item baru, menimpa item lama yang belum diambil.
+
+        :param item: data yang akan dikirim ke stage berikutnya
+        """
+        lama = None
+        with self._cond:
+            if self._ada:
+                self.ditimpa += 1
+                lama = self._item
+            self._item = item
+            self._ada = True
+            self._cond.notify()
+        # Di luar lock agar callback tidak menahan pembaca
+        if lama is not None and self.on_drop is not None:
+            self.on_drop(lama)
+
+    def get(self, timeout=None):
+        """
+        Ambil item terbaru, menunggu jika slot masih kosong.
+
+        :param timeout: batas waktu tunggu dalam detik (None = tunggu terus)
+        :return: item terbaru, atau None jika timeout / slot sudah ditutup
+        """
+        with self._cond:
+            if not self._ada and not self._tertutup:
+                self._cond.wait(timeout)
+            if not self._ada:
+                return None
+            item = self._item
+            self._item = None
+            self._ada = False
+            return item
+
+    def close(self):
+        """
+        Tutup slot dan bangunkan semua pembaca yang sedang menunggu.
+        """
+        with self._cond:
+            self._tertutup = True
+            self._cond.notify_all()
+
+    @property
+    def closed(self):
+        return self._tertutup
@@ -0,0 +1,265 @@
+# ============ Module Worker Inferensi (Proses Terpisah) ================
+# Program ini menjalankan model YOLO di proses sendiri agar tidak berebut GIL dengan
+# bridge UDP dan pembaca serial. Frame dan hasil dipertukarkan lewat shared memory,
+# yang dikirim lewat antrian hanya nomor slot (beberapa byte), bukan gambar
+
+"""
+Library yang digunakan
+"""
+import multiprocessing as mp
+import queue
+import threading
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from ringlog import LOG
+
+# Hasil per slot: jumlah box (int32) lalu array float32 (max_det, 6): x1 y1 x2 y2 conf cls
+RESULT_COLS = 6
+
+
+def _layout(frame_shape, max_det):
+    ukuran_frame = int(np.prod(frame_shape))
+    ukuran_hasil = 4 + max_det * RESULT_COLS * 4
+    return ukuran_frame, ukuran_hasil
+
+
+def _lepas_shm(shm, tertunda):
+    """
+    Tutup mapping shared memory di worker. Jika masih ada view yang mengekspor buffer,
+    close() melempar BufferError; mapping disimpan di `tertunda` dan dicoba ditutup lagi
+    saat worker berhenti, bukan membuat worker mati.
+    """
+    try:
+        shm.close()
+    except BufferError:
+        tertunda.append(shm)
+
+
+def _worker_main(frame_name, result_name, frame_shape, max_det, engine_config, requests, responses):
+    """
+    Fungsi utama proses worker. Harus di level modul agar bisa di-spawn (Windows).
+    """
+    from engine import create_engine
+
+    engine_config = dict(engine_config, worker_process=False)
+    shm_frame = shared_memory.SharedMemory(name=frame_name)
+    shm_result = shared_memory.SharedMemory(name=result_name)
+    ukuran_frame, ukuran_hasil = _layout(frame_shape, max_det)
+    tertunda = []  # Mapping lama yang belum bisa ditutup (masih ada view)
+    lokal = {}  # Buffer lokal per slot, lihat komentar di loop
+    try:
+        engine = create_engine(engine_config)
+        engine.warmup(frame_shape)
+        responses.put(("siap", engine.backend, engine.path, dict(engine.names)))
+    except Exception as e:
+        responses.put(("error", repr(e)))
+        shm_frame.close()
+        shm_result.close()
+        return
+
+    while True:
+        request = requests.get()
+        if request is None:
+            break
+        if request[0] == "shm":
+            # Parent memperbesar slot frame: pindah ke segment baru, yang lama di-unlink parent
+            try:
+                _, frame_name, frame_shape = request
+                shm_baru = shared_memory.SharedMemory(name=frame_name)
+            except Exception as e:
+                responses.put(("error", repr(e)))  # Tetap di segment lama, parent juga
+                continue
+            _lepas_shm(shm_frame, tertunda)
+            shm_frame = shm_baru
+            ukuran_frame, _ = _layout(frame_shape, max_det)
+            lokal.clear()
+            responses.put(("ok", []))
+            continue
+        slot_list, shapes, imgsz = request
+        try:
+            # Gambar disalin dari shared memory ke buffer lokal per slot (dipakai ulang).
+            # Predictor boleh menyimpan referensi ke gambar input; jika itu view ke shared
+            # memory, segment tidak bisa ditutup (BufferError) atau view-nya menggantung
+            # setelah parent memperbesar slot
+            images = []
+            for slot, shape in zip(slot_list, shapes):
+                if slot not in lokal:
+                    lokal[slot] = np.empty(ukuran_frame, np.uint8)
+                n = int(np.prod(shape))
+                image = lokal[slot][:n].reshape(shape)
+                image[...] = np.ndarray(shape, np.uint8, shm_frame.buf, slot * ukuran_frame)
+                images.append(image)
+            if len(images) == 1:
+                hasil = [engine.predict(images[0], imgsz)]
+            else:
+                hasil = engine.predict_batch(images, imgsz)
+            del images
+
+            for slot, (boxes, confidences, class_ids) in zip(slot_list, hasil):
+                n = min(len(boxes), max_det)
+                offset = slot * ukuran_hasil
+                np.ndarray(1, np.int32, shm_result.buf, offset)[0] = n
+                out = np.ndarray((max_det, RESULT_COLS), np.float32, shm_result.buf, offset + 4)
+                out[:n, :4] = boxes[:n]
+                out[:n, 4] = confidences[:n]
+                out[:n, 5] = class_ids[:n]
+                del out
+            responses.put(("ok", slot_list))
+        except Exception as e:
+            responses.put(("error", repr(e)))
+
+    del engine  # Lepas predictor beserta view yang mungkin masih dipegangnya
+    for shm in [shm_frame, shm_result] + tertunda:
+        try:
+            shm.close()
+        except BufferError:
+            pass  # Mapping dilepas OS saat proses keluar
+
+
+class ProcessEngine:
+    """
+    Pengganti InferenceEngine yang menjalankan model di proses worker. Antarmukanya
+    sama (predict, predict_batch, warmup, backend, path, names) sehingga Detector
+    dan MultiDetector tidak perlu tahu inferensi berjalan di proses lain.
+
+    Gambar disalin ke slot ring buffer shared memory (lalu sekali lagi ke buffer lokal
+    worker); antrian hanya membawa nomor slot dan ukuran gambar. Satu panggilan berjalan pada satu waktu.
+    """
+    def __init__(self, engine_config, frame_shape=(720, 1280, 3), slots=4, max_det=64, start_timeout=120.0):
+        """
+        :param engine_config: bagian "engine" dari config.json, diteruskan ke worker
+        :param frame_shape: bentuk frame terbesar yang diperkirakan (h, w, 3); crop yang lebih
+                            kecil juga muat, gambar yang lebih besar membuat slot diperbesar
+        :param slots: jumlah slot ring buffer = ukuran batch maksimal
+        :param max_det: jumlah box maksimal per gambar di struct hasil
+        :param start_timeout: batas waktu worker memuat model dan warm-up (detik)
+        """
+        self.frame_shape = tuple(frame_shape)
+        self.slots = slots
+        self.max_det = max_det
+        self.imgsz = engine_config.get("imgsz", 640)
+        self._ukuran_frame, self._ukuran_hasil = _layout(self.frame_shape, max_det)
+
+        self._shm_frame = shared_memory.SharedMemory(create=True, size=self._ukuran_frame * slots)
+        self._shm_result = shared_memory.SharedMemory(create=True, size=self._ukuran_hasil * slots)
+        self._berikut = 0  # Slot ring berikutnya
+        self._lock = threading.Lock()
+
+        # spawn: perilaku sama di Windows dan Linux, worker tidak mewarisi thread parent
+        ctx = mp.get_context("spawn")
+        self._requests = ctx.Queue()
+        self._responses = ctx.Queue()
+        self._proc = ctx.Process(
+            target=_worker_main, name="inference-worker", daemon=True,
+            args=(self._shm_frame.name, self._shm_result.name, self.frame_shape, max_det,
+                  engine_config, self._requests, self._responses))
+        self._proc.start()
+
+        try:
+            pesan = self._responses.get(timeout=start_timeout)
+        except queue.Empty:
+            self.close()
+            raise RuntimeError("Worker inferensi tidak siap dalam batas waktu")
+        if pesan[0] != "siap":
+            self.close()
+            raise RuntimeError(f"Worker inferensi gagal memuat model: {pesan[1]}")
+        _, self.backend, self.path, self.names = pesan
+        LOG.info("engine", "Worker inferensi pid %d siap (%s)", self._proc.pid, self.backend)
+
+    def predict(self, image, imgsz=None):
+        """
+        Sama seperti InferenceEngine.predict, dijalankan di proses worker.
+        """
+        return self.predict_batch([image], imgsz)[0]
+
+    def predict_batch(self, images, imgsz=None):
+        """
+        Sama seperti InferenceEngine.predict_batch, dijalankan di proses worker.
+        """
+        if len(images) > self.slots:
+            raise ValueError(f"Batch {len(images)} melebihi jumlah slot {self.slots}")
+
+        with self._lock:
+            # Driver / rekaman bisa memberi frame lebih besar dari resolusi yang diminta
+            terbesar = max(images, key=lambda image: image.nbytes)
+            if terbesar.nbytes > self._ukuran_frame:
+                self._perbesar_slot(terbesar.shape)
+
+            slot_list, shapes = [], []
+            for image in images:
+                slot = self._berikut
+                self._berikut = (self._berikut + 1) % self.slots
+                view = np.ndarray(image.shape, np.uint8, self._shm_frame.buf, slot * self._ukuran_frame)
+                view[...] = image
+                del view
+                slot_list.append(slot)
+                shapes.append(image.shape)
+
+            self._requests.put((slot_list, shapes, imgsz or self.imgsz))
+            self._tunggu_balasan()
+
+            hasil = []
+            for slot in slot_list:
+                offset = slot * self._ukuran_hasil
+                n = int(np.ndarray(1, np.int32, self._shm_result.buf, offset)[0])
+                det = np.array(np.ndarray((self.max_det, RESULT_COLS), np.float32,
+                                          self._shm_result.buf, offset + 4)[:n])
+                hasil.append((det[:, :4], det[:, 4], det[:, 5]))
+            return hasil
+
+    def _tunggu_balasan(self):
+        while True:
+            try:
+                pesan = self._responses.get(timeout=1.0)
+                break
+            except queue.Empty:
+                if not self._proc.is_alive():
+                    raise RuntimeError("Worker inferensi berhenti")
+        if pesan[0] != "ok":
+            raise RuntimeError(f"Inferensi di worker gagal: {pesan[1]}")
+        return pesan
+
+    def _perbesar_slot(self, shape):
+        """
+        Buat segment shared memory baru yang muat `shape`, pindahkan worker ke sana,
+        lalu lepas segment lama. Dipanggil dengan self._lock terkunci.
+
+        :param shape: bentuk gambar yang tidak muat di slot sekarang
+        """
+        frame_shape = tuple(max(a, b) for a, b in zip(self.frame_shape, shape))
+        ukuran_frame, _ = _layout(frame_shape, self.max_det)
+        shm_baru = shared_memory.SharedMemory(create=True, size=ukuran_frame * self.slots)
+        try:
+            self._requests.put(("shm", shm_baru.name, frame_shape))
+            self._tunggu_balasan()
+        except Exception:
+            shm_baru.close()
+            shm_baru.unlink()
+            raise
+        LOG.warning("engine", "Slot shared memory diperbesar %s -> %s", self.frame_shape, frame_shape)
+        self._shm_frame.close()
+        self._shm_frame.unlink()
+        self._shm_frame = shm_baru
+        self.frame_shape = frame_shape
+        self._ukuran_frame = ukuran_frame
+        self._berikut = 0
+
+    def warmup(self, shape=None):
+        # Worker sudah warm-up sebelum melapor siap
+        pass
+
+    def close(self):
+        """
+        Hentikan worker dan lepas shared memory.
+        """
+        if self._proc.is_alive():
+            self._requests.put(None)
+            self._proc.join(timeout=5)
+            if self._proc.is_alive():
+                self._proc.terminate()
+        self._shm_frame.close()
+        self._shm_frame.unlink()
+        self._shm_result.close()
+        self._shm_result.unlink()
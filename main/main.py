@@ -6,68 +6,146 @@
 """
 Library yang digunakan
 """
+import time
+
+# Dicatat paling awal agar metrik startup mencakup waktu import
+T_START = time.perf_counter()
 
+import asyncio
 import threading
-import socket
-import serial
-import time
-from detect_module import Detector
+from bridge_async import BasestationBridge
+from serial_hub import SerialHub
+from config import load_config
+from metrics import start_server
+from ringlog import LOG
+from shutdown import install_shutdown_handlers
 
 # === Konfigurasi Serial dan UDP ===
 UDP_PORT = 28098
 SERIAL_PORT = "COM7"
 BAUDRATE = 115200
+PIPELINED = True  # Capture, deteksi, dan output di thread terpisah
+TRACKING = True   # Setelah bola terkunci, YOLO hanya jalan di crop sekitar bola
+DETECT_INTERVAL = 3  # YOLO maksimal tiap N frame, di antaranya pakai tracker
+PROTOCOL = "ascii"  # "ascii" ("x640y360>") atau "binary" (lihat protocol.py)
+METRICS_PORT = 9108  # Latensi per stage: curl http://127.0.0.1:9108/metrics
 
-# Inisialisasi socket UDP
-udp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-udp_socket.bind(("0.0.0.0", UDP_PORT))  # Dengarkan semua alamat IP
-
-# Inisialisasi Serial untuk komunikasi dengan Arduino
-try:
-    arduino = serial.Serial(SERIAL_PORT, BAUDRATE, timeout=1)
-    print(f"[Python] Terhubung ke Arduino di {SERIAL_PORT}")
-except Exception as e:
-    print(f"[ERROR] Tidak bisa terhubung ke Arduino: {e}")
-    arduino = None
-
-# === Thread untuk menerima data dari VB.NET via UDP dan kirim ke Arduino ===
-def udp_receiver():
-    while True:
-        data, addr = udp_socket.recvfrom(1024)
-        msg = data.decode().strip()
-        print(f"[VB.NET =>] {msg}")
+# Backend inferensi (pytorch / onnx / openvino, FP32 / INT8) dan budget latensi
+# (imgsz / FPS adaptif) diatur di config.json
+config = load_config()
 
-        if arduino:
-            if not msg.endswith(">"):
-                msg += ">"
-            arduino.write(msg.encode())
-            print(f"[Arduino <=] {msg}")
-
-# === Thread untuk membaca respon serial dari Arduino ===
-def baca_serial():
-    while True:
-        if arduino and arduino.in_waiting:
-            balasan = arduino.readline().decode().strip()
-            if balasan:
-                print(f"[Arduino =>] {balasan}")
+# Level log per subsystem (detector, serial, bridge, ...) dari config.json
+LOG.configure(config["log"])
+
+# Mode pertandingan (headless): tanpa anotasi / jendela, berhenti lewat sinyal atau "!stop" dari basestation
+HEADLESS = config["headless"]["enabled"]
+
+# Detector yang sedang berjalan, agar bisa dihentikan dari handler sinyal / perintah kontrol
+detektor = None
+berhenti = threading.Event()
+
+# === Respon serial dari Arduino (diteruskan bridge dari SerialHub) ===
+def baca_serial(balasan):
+    LOG.summary("arduino", "balasan", "Arduino => %s", balasan)
+
+def jalankan_detektor(obj):
+    global detektor
+    detektor = obj
+    if berhenti.is_set():  # Permintaan berhenti datang saat model masih dimuat
+        obj.stop()
+    obj.run()  # Setelah stop(), run() tetap melepas kamera, rekaman, dan engine
+
+def hentikan_detektor():
+    berhenti.set()
+    if detektor is not None:
+        detektor.stop()
 
 # === Thread untuk menjalankan deteksi kamera berbasis YOLOv8 ===
-def kamera_detection():
-    detector = Detector(arduino=arduino)
-    detector.run()
-
-# === Jalankan semua fungsi di thread terpisah ===
-threading.Thread(target=udp_receiver, daemon=True).start()
-threading.Thread(target=baca_serial, daemon=True).start()
-threading.Thread(target=kamera_detection, daemon=True).start()
-
-print("[Python] Semua sistem aktif. Tekan Ctrl+C untuk keluar.")
-
-# Loop utama (idle loop) agar program tetap hidup dan ringan
-try:
-    while True:
-        time.sleep(0.1)  # CPU-friendly idle loop
-except KeyboardInterrupt:
-    print("Program dihentikan.")
+def kamera_detection(arduino):
+    # Import di thread ini (bukan di atas) supaya bridge dan serial sudah aktif
+    # selama ultralytics / supervision masih dimuat
+    from detect_module import Detector
+    from multi_detect import MultiDetector
+
+    if config["pipeline"]["enabled"]:
+        # Pipeline berbasis stage: hanya stage yang diaktifkan di config.json yang dijalankan
+        from pipeline import Pipeline, apply_preset
+        jalankan_detektor(Pipeline(apply_preset(config, config["pipeline"]["preset"]), arduino=arduino,
+                                   t_start=T_START))
+        return
+
+    multi = config["multi_camera"]
+    if multi["enabled"]:
+        # Beberapa kamera berbagi satu model, frame digabung per batch
+        jalankan_detektor(MultiDetector(arduino, multi["cameras"], protocol=PROTOCOL,
+                                        engine_config=config["engine"], batch_wait_ms=multi["batch_wait_ms"],
+                                        camera_config=config["camera"], headless=HEADLESS))
+        return
+
+    jalankan_detektor(Detector(arduino=arduino, pipelined=PIPELINED, tracking=TRACKING,
+                               detect_interval=DETECT_INTERVAL, protocol=PROTOCOL,
+                               engine_config=config["engine"], quality_config=config["quality"],
+                               camera_config=config["camera"], recorder_config=config["recorder"],
+                               cascade_config=config["cascade"], field_config=config["field"],
+                               preview_config=config["preview"], headless=HEADLESS, t_start=T_START))
+
+def main():
+    # Inisialisasi Serial untuk komunikasi dengan Arduino
+    # SerialHub jadi satu-satunya pemilik port: baca di thread sendiri, tulis dikunci
+    try:
+        arduino = SerialHub(SERIAL_PORT, BAUDRATE)
+        LOG.info("main", "Terhubung ke Arduino di %s", SERIAL_PORT)
+    except Exception as e:
+        LOG.error("main", "Tidak bisa terhubung ke Arduino: %s", e)
+        arduino = None
+
+    # === Endpoint metrik lokal (format Prometheus) ===
+    try:
+        start_server(METRICS_PORT)
+    except OSError as e:
+        LOG.error("main", "Endpoint metrik tidak bisa dibuka: %s", e)
+
+    # === Jalankan deteksi kamera di thread terpisah ===
     if arduino:
-        arduino.close()
+        arduino.start()
+    deteksi = threading.Thread(target=kamera_detection, args=(arduino,), name="detection", daemon=True)
+    deteksi.start()
+
+    # Perintah kontrol dari basestation, contoh datagram "!stop"
+    def perintah_kontrol(perintah):
+        if perintah in ("stop", "shutdown"):
+            hentikan(f"perintah {perintah}")
+        else:
+            LOG.warning("main", "Perintah kontrol tidak dikenal: %s", perintah)
+
+    # Bridge basestation (VB.NET via UDP => Arduino) berjalan di event loop asyncio thread utama
+    bridge = BasestationBridge(arduino, UDP_PORT, PROTOCOL, on_arduino=baca_serial, on_control=perintah_kontrol,
+                               control_prefix=config["headless"]["control_prefix"])
+
+    def hentikan(alasan):
+        LOG.info("main", "Menghentikan program (%s)", alasan)
+        hentikan_detektor()
+        bridge.stop()
+
+    # Ctrl+C, SIGTERM, atau konsol ditutup: deteksi dan bridge dihentikan dengan rapi
+    install_shutdown_handlers(hentikan)
+    LOG.info("main", "Semua sistem aktif. Tekan Ctrl+C atau kirim \"%sstop\" untuk keluar.",
+             config["headless"]["control_prefix"] or "")
+
+    try:
+        asyncio.run(bridge.run())
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+    finally:
+        # Tunggu detector melepas kamera dan menutup rekaman sebelum port serial ditutup
+        hentikan_detektor()
+        deteksi.join(timeout=5)
+        LOG.info("main", "Program dihentikan.")
+        if arduino:
+            arduino.close()
+        LOG.stop()
+
+# Program hanya dijalankan dari sini: worker inferensi (engine.worker_process) di-spawn
+# dengan meng-import ulang file ini, jadi serial dan bridge tidak boleh ikut terbuka di sana
+if __name__ == "__main__":
+    main()
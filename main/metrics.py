@@ -0,0 +1,160 @@
+# ============ Module Metrik Latensi ================
+# Program ini berisi histogram latensi per stage (p50/p95/p99) dan endpoint HTTP lokal
+# berformat teks Prometheus, contoh: curl http://127.0.0.1:9108/metrics
+
+"""
+Library yang digunakan
+"""
+import collections
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from ringlog import LOG
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class Histogram:
+    """
+    Histogram bergulir: hanya `window` sampel terbaru yang dipakai untuk kuantil,
+    sedangkan count dan sum dihitung sejak program mulai (seperti summary Prometheus).
+    """
+    def __init__(self, window=1024):
+        self.samples = collections.deque(maxlen=window)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        # Tanpa lock: tiap stage hanya diukur dari satu thread, dan deque.append atomic
+        # sehingga pembaca endpoint tidak pernah melihat deque rusak
+        self.samples.append(value)
+        self.count += 1
+        self.sum += value
+
+    def quantiles(self, qs=QUANTILES):
+        """
+        :return: dict kuantil -> nilai (detik) dari sampel terbaru
+        """
+        data = sorted(self.samples)
+        if not data:
+            return {q: 0.0 for q in qs}
+        return {q: data[min(len(data) - 1, int(len(data) * q))] for q in qs}
+
+
+class Registry:
+    """
+    Kumpulan histogram latensi per stage dan gauge. Gauge diambil dari collector
+    (fungsi yang mengembalikan dict) saat endpoint dibaca, jadi loop kamera tidak
+    perlu memperbarui angka yang jarang dilihat.
+    """
+    def __init__(self, prefix="robot"):
+        self.prefix = prefix
+        self.stages = {}
+        self.collectors = {}
+        self._lock = threading.Lock()
+
+    def stage(self, name):
+        """
+        Ambil (atau buat) histogram untuk satu stage.
+        """
+        hist = self.stages.get(name)
+        if hist is None:
+            with self._lock:
+                hist = self.stages.setdefault(name, Histogram())
+        return hist
+
+    def observe(self, name, seconds):
+        """
+        Catat durasi satu stage dalam detik.
+        """
+        self.stage(name).observe(seconds)
+
+    def timer(self, name):
+        """
+        Context manager pengukur durasi, contoh: `with REGISTRY.timer("inference"): ...`
+        """
+        return _Timer(self.stage(name))
+
+    def register_collector(self, name, fn):
+        """
+        :param name: awalan nama gauge, contoh "camera"
+        :param fn: fungsi tanpa argumen yang mengembalikan dict angka
+        """
+        self.collectors[name] = fn
+
+    def render(self):
+        """
+        :return: teks format Prometheus (text exposition 0.0.4)
+        """
+        nama = f"{self.prefix}_stage_latency_seconds"
+        baris = [f"# HELP {nama} Latensi per stage pipeline", f"# TYPE {nama} summary"]
+        for stage, hist in sorted(self.stages.items()):
+            for q, nilai in hist.quantiles().items():
+                baris.append(f'{nama}{{stage="{stage}",quantile="{q}"}} {nilai:.6f}')
+            baris.append(f'{nama}_sum{{stage="{stage}"}} {hist.sum:.6f}')
+            baris.append(f'{nama}_count{{stage="{stage}"}} {hist.count}')
+
+        for grup, fn in sorted(self.collectors.items()):
+            try:
+                data = fn()
+            except Exception as e:
+                baris.append(f"# collector {grup} gagal: {e}")
+                continue
+            for kunci, nilai in data.items():
+                if isinstance(nilai, bool):
+                    nilai = int(nilai)
+                if not isinstance(nilai, (int, float)):
+                    continue
+                gauge = f"{self.prefix}_{grup}_{kunci}"
+                baris.append(f"# TYPE {gauge} gauge")
+                baris.append(f"{gauge} {nilai}")
+        return "\n".join(baris) + "\n"
+
+
+class _Timer:
+    __slots__ = ("hist", "mulai")
+
+    def __init__(self, hist):
+        self.hist = hist
+
+    def __enter__(self):
+        self.mulai = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.hist.observe(time.perf_counter() - self.mulai)
+        return False
+
+
+# Registry bersama untuk seluruh program (Detector, SerialWriter, bridge)
+REGISTRY = Registry()
+
+
+def start_server(port=9108, host="127.0.0.1", registry=REGISTRY):
+    """
+    Jalankan endpoint HTTP /metrics di thread daemon.
+
+    :param port: port HTTP
+    :param host: alamat bind, default hanya localhost
+    :return: ThreadingHTTPServer (panggil shutdown() untuk berhenti)
+    """
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = registry.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass  # Jangan ikut memenuhi terminal dengan log akses
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    LOG.info("metrics", "http://%s:%d/metrics", host, port)
+    return server
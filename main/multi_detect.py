@@ -0,0 +1,319 @@
+# ============ Module Deteksi Multi Kamera ================
+# Program ini menjalankan beberapa kamera (misalnya depan + omni) dengan satu model YOLO
+# Frame terbaru semua kamera digabung menjadi satu batch, hasilnya dikirim per kamera
+
+"""
+Library yang digunakan
+"""
+import cv2
+import numpy as np
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from frame_slot import LatestSlot
+from camera_discovery import CameraRegistry, open_camera
+from target_select import TargetSelector
+from protocol import FrameEncoder
+from serial_writer import SerialWriter
+from config import DEFAULT_CONFIG
+from engine import create_engine
+from metrics import REGISTRY
+from ringlog import LOG
+
+
+class CameraChannel:
+    """
+    Keadaan satu kamera: sumber frame, pemilih target, dan target terakhir yang dikirim.
+    """
+    def __init__(self, camera_id, role, camera):
+        """
+        :param camera_id: id kamera di protokol (0..15), 0 = kamera utama
+        :param role: nama peran kamera, contoh "depan" atau "omni"
+        :param camera: capture.Camera yang sudah dibuka
+        """
+        self.camera_id = camera_id
+        self.role = role
+        self.camera = camera
+        self.frame_width, self.frame_height = camera.resolution
+        self.selector = TargetSelector(camera.resolution)
+        self.slot = LatestSlot(on_drop=camera.recycle)  # Frame yang ditimpa kembali ke pool
+        self.last_sent = None
+        self.target = None  # Target terakhir kamera ini, ikut setiap pesan gabungan
+
+
+class MultiDetector:
+    """
+    Detector untuk beberapa kamera dengan satu model bersama. Tiap kamera punya thread
+    capture sendiri; thread inferensi mengambil frame terbaru dari semua kamera dan
+    menjalankan satu forward pass untuk semuanya. Target semua kamera digabung dalam satu
+    pesan lewat satu penulis serial, sehingga jeda baudrate tetap berlaku untuk seluruh
+    link dan update satu kamera tidak menimpa target kamera lain di mailbox.
+
+    Tracker dan search window tidak dipakai di mode ini karena batch butuh ukuran
+    input yang sama untuk semua gambar.
+    """
+    def __init__(self, arduino, cameras, resolution=(1280, 720), scale=0.5, protocol="ascii",
+                 engine_config=None, batch_wait_ms=5, camera_config=None, headless=False):
+        """
+        :param arduino: SerialHub dari main.py, atau None; tidak ditutup oleh MultiDetector
+        :param cameras: list dict {"index": 0, "role": "depan"} per kamera, urutan = id kamera.
+                        Tanpa "index", index dicari dari camera.roles lewat CameraRegistry
+        :param resolution: resolusi kamera (width, height)
+        :param scale: skala tampilan (untuk preview)
+        :param protocol: "ascii" atau "binary". Pada ascii, kamera selain id 0 diberi awalan
+                         "c<id>", contoh "c1x320y240>"; pada binary id kamera ada di field target
+        :param engine_config: bagian "engine" dari config.json
+        :param batch_wait_ms: setelah frame pertama datang, tunggu frame kamera lain selama ini
+                              supaya batch terisi
+        :param camera_config: bagian "camera" dari config.json (fourcc, fps, pool_size, roles, ...),
+                              dipakai untuk semua kamera
+        :param headless: tanpa anotasi dan jendela; berhenti lewat stop(), bukan tombol 'q'
+        """
+        self.arduino = arduino
+        self.display_scale = scale
+        self.protocol = protocol
+        self.batch_wait = batch_wait_ms / 1000.0
+        self.running = True
+        self.headless = headless
+        self._ada_frame = threading.Event()
+
+        # Kamera tanpa "index" dipilih dari cache discovery berdasarkan perannya. Satu
+        # registry untuk semua kamera, supaya probing ulang hanya dijalankan sekali
+        self.camera_config = dict(camera_config or DEFAULT_CONFIG["camera"], replay=None, role=None)
+        self.resolution = resolution
+        registry = CameraRegistry(self.camera_config.get("roles", {}))
+        indices = [cam["index"] if "index" in cam else registry.resolve(cam["role"]) for cam in cameras]
+
+        # Semua kamera dibuka sambil model dimuat + warm-up
+        with ThreadPoolExecutor(max_workers=len(cameras) + 1, thread_name_prefix="startup") as pool:
+            f_kamera = [pool.submit(self._buka_kamera, index) for index in indices]
+            f_engine = pool.submit(self._muat_engine, engine_config or DEFAULT_CONFIG["engine"],
+                                   len(cameras), resolution)
+            kamera = [f.result() for f in f_kamera]
+            try:
+                kamera = self._buka_ulang(registry, cameras, indices, kamera)
+                self.engine = f_engine.result()
+            except Exception:
+                for cam in kamera:
+                    cam.release()
+                raise
+
+        self.channels = [CameraChannel(i, cam.get("role", f"kamera{i}"), kamera[i])
+                         for i, cam in enumerate(cameras)]
+        self.encoder = FrameEncoder() if protocol == "binary" else None
+        self.writer = SerialWriter(arduino).start() if arduino else None
+
+        if not headless:
+            import supervision as sv
+            self.sv = sv
+            self.box_annotator = sv.BoxAnnotator(thickness=2)
+
+        self.batch = 0
+        self.frame_per_batch = 0
+        for ch in self.channels:
+            REGISTRY.register_collector(f"camera_{ch.role}", ch.camera.metrics)
+        if self.writer is not None:
+            REGISTRY.register_collector("serial", self.writer.stats)
+        REGISTRY.register_collector("batch", lambda: {
+            "jumlah": self.batch,
+            "rata_frame": self.frame_per_batch / self.batch if self.batch else 0.0,
+        })
+        LOG.info("detector", "Multi kamera: %s, engine %s: %s",
+                 ", ".join(ch.role for ch in self.channels), self.engine.backend, self.engine.path)
+
+    def _buka_kamera(self, index):
+        return open_camera(dict(self.camera_config, index=index), self.resolution)
+
+    def _buka_ulang(self, registry, cameras, indices, kamera):
+        """
+        Jika kamera per peran gagal dibuka (index cache basi), probing ulang dijalankan sekali
+        lalu setiap kamera per peran yang index-nya berubah dibuka ulang. Jika masih ada
+        kamera yang gagal, RuntimeError.
+
+        :param registry: CameraRegistry yang dipakai saat membuka
+        :param cameras: list dict kamera dari config
+        :param indices: index yang dipakai saat pembukaan pertama
+        :param kamera: list Camera hasil pembukaan pertama (diganti di tempat)
+        :return: list Camera yang semuanya terbuka
+        """
+        per_peran = [i for i, cam in enumerate(cameras) if "index" not in cam]
+        gagal = [cameras[i]["role"] for i in per_peran if not kamera[i].opened]
+        if gagal:
+            LOG.warning("camera", "Kamera cache untuk peran %s gagal dibuka, mencari ulang", gagal)
+            registry.refresh()
+            for i in per_peran:
+                index = registry.resolve(cameras[i]["role"])
+                if index != indices[i] or not kamera[i].opened:
+                    kamera[i].release()
+                    kamera[i] = self._buka_kamera(index)
+
+        gagal = [cameras[i].get("role", f"kamera{i}") for i, cam in enumerate(kamera) if not cam.opened]
+        if gagal:
+            raise RuntimeError(f"Kamera {gagal} gagal dibuka")
+        return kamera
+
+    def _muat_engine(self, engine_config, jumlah, resolution):
+        """
+        Load engine bersama lalu warm-up dengan ukuran batch yang akan dipakai.
+        """
+        engine = create_engine(engine_config, (resolution[1], resolution[0], 3))
+        engine.predict_batch([np.zeros((resolution[1], resolution[0], 3), np.uint8)] * jumlah)
+        return engine
+
+    def run(self):
+        """
+        Jalankan capture per kamera, inferensi batch, dan output di thread pemanggil.
+        """
+        def buang_batch(hasil_batch):
+            for (ch, item), _ in hasil_batch:
+                ch.camera.recycle(item)
+
+        slot_hasil = LatestSlot(on_drop=buang_batch)
+
+        def capture_loop(ch):
+            while self.running:
+                with REGISTRY.timer("capture"):
+                    item = ch.camera.read()
+                if item is None:
+                    LOG.error("camera", "Kamera %s berhenti memberi frame", ch.role)
+                    break
+                ch.slot.put(item)
+                self._ada_frame.set()
+            ch.slot.close()
+            self._ada_frame.set()  # Bangunkan inferensi agar tahu kamera ini sudah berhenti
+
+        def inference_loop():
+            while self.running:
+                if not self._ada_frame.wait(0.1):
+                    continue
+                # Beri kesempatan kamera lain menyusul agar batch terisi
+                time.sleep(self.batch_wait)
+                self._ada_frame.clear()
+
+                batch = []
+                for ch in self.channels:
+                    item = ch.slot.get(timeout=0)
+                    if item is not None:
+                        ch.camera.report_age(item)
+                        batch.append((ch, item))
+                if not batch:
+                    if all(ch.slot.closed for ch in self.channels):
+                        break
+                    continue
+
+                with REGISTRY.timer("inference"):
+                    hasil = self.engine.predict_batch([item.image for _, item in batch])
+                self.batch += 1
+                self.frame_per_batch += len(batch)
+                slot_hasil.put(list(zip(batch, hasil)))
+            slot_hasil.close()
+
+        threads = [threading.Thread(target=capture_loop, args=(ch,), name=f"capture-{ch.role}", daemon=True)
+                   for ch in self.channels]
+        threads.append(threading.Thread(target=inference_loop, name="inference", daemon=True))
+        for t in threads:
+            t.start()
+
+        while self.running:
+            hasil_batch = slot_hasil.get(timeout=0.1)
+            if hasil_batch is None:
+                if slot_hasil.closed:
+                    break
+                continue
+            for (ch, item), hasil in hasil_batch:
+                self._output(ch, item, hasil)
+                ch.camera.recycle(item)
+            # Tekan tombol 'q' untuk keluar
+            if not self.headless and cv2.waitKey(1) & 0xFF == ord('q'):
+                break
+
+        self.running = False
+        for t in threads:
+            t.join(timeout=2)
+        self.cleanup()
+
+    def _output(self, ch, item, hasil):
+        """
+        Pilih target satu kamera, kirim ke Arduino, dan tampilkan di jendela kamera itu.
+
+        :param ch: CameraChannel asal frame
+        :param item: Frame yang dideteksi
+        :param hasil: tuple (boxes, confidences, class_ids) dari predict_batch
+        """
+        boxes, confidences, class_ids = hasil
+        target = ch.selector.select(boxes, confidences, class_ids)
+        centers = ((boxes[:, 0:2] + boxes[:, 2:4]) // 2).astype(int)
+
+        target_data = None
+        if target is not None:
+            x, y = centers[target]
+            target_data = (int(x), int(y), int(class_ids[target]), float(confidences[target]))
+            LOG.summary("detector", f"bola-{ch.role}", "Bola di kamera %s: X=%d, Y=%d", ch.role, x, y)
+
+        with REGISTRY.timer("serial_submit"):
+            self._kirim(ch, target_data, item.t_capture)
+        REGISTRY.observe("end_to_end", time.monotonic() - item.t_capture)
+        if self.headless:
+            return
+
+        with REGISTRY.timer("annotate"):
+            frame = self.box_annotator.annotate(
+                scene=item.image,
+                detections=self.sv.Detections(xyxy=boxes, confidence=confidences, class_id=class_ids.astype(int)),
+            )
+            for x, y in centers:
+                cv2.circle(frame, (int(x), int(y)), 5, (0, 255, 0), -1)
+
+        with REGISTRY.timer("display"):
+            frame_resized = cv2.resize(
+                frame, (int(ch.frame_width * self.display_scale), int(ch.frame_height * self.display_scale)))
+            cv2.imshow(f"YOLOv8 Detection - {ch.role}", frame_resized)
+
+    def _kirim(self, ch, target_data, t_capture):
+        """
+        Jika target satu kamera berubah, kirim pesan gabungan berisi target terakhir semua
+        kamera. Mailbox penulis hanya menyimpan pesan terbaru, dan pesan itu selalu
+        memuat semua kamera, jadi tidak ada update kamera yang hilang karena ditimpa.
+        """
+        key = target_data[:2] if target_data is not None else None
+        if self.writer is None or key == ch.last_sent:
+            return
+        ch.target = target_data
+        ch.last_sent = key
+
+        if self.encoder is not None:
+            # Satu frame TARGETS, id kamera ada di field target
+            data = self.encoder.encode_targets(
+                [c.target + (c.camera_id,) for c in self.channels if c.target is not None], t_capture)
+        else:
+            baris = []
+            for c in self.channels:
+                awalan = f"c{c.camera_id}" if c.camera_id else ""
+                x, y = c.last_sent or (0, 0)
+                baris.append(f"{awalan}x{x}y{y}>\n")
+            data = "".join(baris).encode()
+
+        self.writer.submit(data)
+
+    def stop(self):
+        """
+        Minta semua loop berhenti. Aman dipanggil dari thread lain / handler sinyal.
+        """
+        self.running = False
+
+    def cleanup(self):
+        """
+        Lepas semua kamera, hentikan penulis serial, dan tutup jendela.
+        """
+        for ch in self.channels:
+            ch.camera.release()
+            LOG.info("camera", "%s: %s", ch.role, ch.camera.metrics())
+        if self.writer is not None:
+            self.writer.stop()
+            LOG.info("serial", "%s", self.writer.stats())
+        LOG.info("detector", "%d batch, rata-rata %.2f frame per batch",
+                 self.batch, self.frame_per_batch / self.batch if self.batch else 0.0)
+        if not self.headless:
+            cv2.destroyAllWindows()
+        self.engine.close()
+        # Port Arduino milik main.py (dipakai juga oleh bridge basestation), ditutup di sana
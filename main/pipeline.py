@@ -0,0 +1,739 @@
+# ============ Module Pipeline Deteksi Berbasis Stage ================
+# Program ini menggantikan varian script detect_*.py dengan satu pipeline: tiap langkah
+# (capture, cascade, infer, select, refine, track, encode, record, annotate, preview, display) adalah stage
+# terdaftar yang diaktifkan lewat bagian "pipeline" di config.json atau preset,
+# dan biaya tiap stage dicatat sehingga konfigurasi match hanya membayar stage yang dipakai
+
+"""
+Library yang digunakan
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+from buffer_pool import ResizeBuffer
+from calibration import FieldMap
+from camera_discovery import open_camera
+from color_cascade import ColorCascade, verify_regions
+from config import gabung_config, load_config
+from engine import create_engine
+from metrics import REGISTRY
+from preview import PreviewServer
+from protocol import FrameEncoder
+from recorder import Recorder
+from refine import CircleRefiner
+from ringlog import LOG
+from serial_writer import SerialWriter
+from shutdown import install_shutdown_handlers
+from target_select import TargetSelector
+from tracker import BallTracker
+
+# Registry stage: nama di config.json -> kelas stage
+STAGES = {}
+
+# Stage yang hanya menggambar / menampilkan, tidak pernah dibuat pada mode headless
+DISPLAY_STAGES = ("annotate", "preview", "display")
+
+# Preset pengganti script detect_*.py lama, hanya berisi bagian yang berbeda
+# dari "pipeline" di config.json
+PRESETS = {
+    # detect.py: model train2.pt, semua box diberi label + koordinat, tanpa Arduino
+    "detect": {"stages": {
+        "capture": {"camera": {"index": 1}},
+        "infer": {"engine": {"weights": "train2.pt"}},
+        "select": {"enabled": False},
+        "refine": {"enabled": False},
+        "encode": {"enabled": False},
+        "annotate": {"labels": True},
+        "display": {"scale": 1.0},
+    }},
+    # detect_XY.py: best.pt + refinement lingkaran, tanpa Arduino
+    "detect_xy": {"stages": {
+        "infer": {"engine": {"weights": "best.pt"}},
+        "encode": {"enabled": False},
+    }},
+    # detect_XY_arduino.py: best_ball.pt, "x,y" dikirim setiap frame ke COM4 @ 9600
+    "detect_xy_arduino": {"serial": {"port": "COM4", "baudrate": 9600}, "stages": {
+        "capture": {"camera": {"index": 1}},
+        "infer": {"engine": {"weights": "best_ball.pt"}},
+        "encode": {"format": "csv", "only_changes": False},
+    }},
+    # detect_XY_ard_ver2.py: best_ball.pt + tracker di antara frame YOLO, COM7 @ 9600
+    "detect_xy_ard_ver2": {"serial": {"port": "COM7", "baudrate": 9600}, "stages": {
+        "infer": {"engine": {"weights": "best_ball.pt"}},
+        "track": {"enabled": True},
+        "encode": {"no_ball": "0,0\n"},  # Script lama mengirim "0,0" saat bola tidak terdeteksi
+    }},
+    # detect_cubo_nangkep_moda.py: best_ball4.pt, koordinat = titik tengah box, COM7 @ 115200
+    "cubo_nangkep_moda": {"serial": {"port": "COM7", "baudrate": 115200}, "stages": {
+        "infer": {"engine": {"weights": "best_ball4.pt"}},
+        "refine": {"center": "box"},
+    }},
+    # detect_robot_jalan.py: best_ball2.pt, COM7 @ 115200
+    "robot_jalan": {"serial": {"port": "COM7", "baudrate": 115200}, "stages": {
+        "infer": {"engine": {"weights": "best_ball2.pt"}},
+    }},
+}
+
+
+def register_stage(name, order):
+    """
+    Decorator pendaftar kelas stage.
+
+    :param name: nama stage di config.json
+    :param order: urutan stage dalam satu frame (kecil = lebih dulu)
+    """
+    def daftar(cls):
+        cls.name = name
+        cls.order = order
+        STAGES[name] = cls
+        return cls
+    return daftar
+
+
+def apply_preset(config, preset=None, override=None):
+    """
+    Timpa bagian "pipeline" dengan preset lalu override (misalnya dari argumen CLI).
+
+    :param config: konfigurasi lengkap dari load_config()
+    :param preset: nama di PRESETS, None = apa adanya
+    :param override: dict dengan bentuk sama seperti bagian "pipeline"
+    :return: salinan config
+    """
+    pipeline_config = config["pipeline"]
+    if preset:
+        if preset not in PRESETS:
+            raise ValueError(f"Preset '{preset}' tidak dikenal, pilihan: {sorted(PRESETS)}")
+        pipeline_config = gabung_config(pipeline_config, PRESETS[preset])
+    if override:
+        pipeline_config = gabung_config(pipeline_config, override)
+    return dict(config, pipeline=pipeline_config)
+
+
+def _tengah(box):
+    return int((box[0] + box[2]) // 2), int((box[1] + box[3]) // 2)
+
+
+class FrameState:
+    """
+    Data satu frame yang diteruskan dari stage ke stage.
+    """
+    def __init__(self):
+        self.item = None  # capture.Frame
+        self.boxes = np.empty((0, 4), np.float32)
+        self.confidences = np.empty(0, np.float32)
+        self.class_ids = np.empty(0, np.float32)
+        self.regions = None  # Crop kandidat dari stage cascade, None = cascade tidak aktif
+        self.order = np.empty(0, dtype=int)  # Index box urut skor dari stage select
+        self.target = None  # Index box terpilih
+        self.point = None  # (x, y) yang dikirim ke Arduino
+        self.tracked = False  # Box berasal dari tracker, bukan YOLO
+        self.data = None  # Byte serial yang dikirim untuk frame ini
+        self.canvas = None  # Gambar hasil anotasi
+
+
+class Stage:
+    """
+    Dasar semua stage. open() berisi pekerjaan berat (kamera, model, import lambat) dan
+    dijalankan paralel saat startup; start() dijalankan setelahnya, saat resolusi kamera
+    sebenarnya sudah diketahui; process() dipanggil tiap frame, lalu finish() setelah
+    semua stage selesai memakai frame tersebut.
+    """
+    name = None
+    order = 0
+
+    def __init__(self, pipeline, options):
+        """
+        :param pipeline: Pipeline pemilik stage
+        :param options: bagian stage ini di config.json ("pipeline" -> "stages" -> nama)
+        """
+        self.pipeline = pipeline
+        self.options = options
+
+    def open(self):
+        pass
+
+    def start(self):
+        pass
+
+    def process(self, state):
+        """
+        :param state: FrameState frame yang sedang diproses
+        :return: False untuk menghentikan pipeline
+        """
+        return True
+
+    def finish(self, state):
+        pass
+
+    def close(self):
+        pass
+
+
+@register_stage("capture", 10)
+class CaptureStage(Stage):
+    """
+    Ambil frame terbaru dari kamera (atau rekaman jika camera.replay diisi).
+    """
+    def open(self):
+        camera_config = gabung_config(self.pipeline.config["camera"], self.options.get("camera", {}))
+        self.camera = open_camera(camera_config, self.pipeline.resolution)
+        REGISTRY.register_collector("camera", self.camera.metrics)
+
+    def process(self, state):
+        state.item = self.camera.read()
+        if state.item is None:
+            LOG.info("pipeline", "Kamera berhenti memberi frame")
+            return False
+        self.camera.report_age(state.item)
+        return True
+
+    def finish(self, state):
+        # Buffer frame kembali ke pool kamera untuk read() berikutnya
+        self.camera.recycle(state.item)
+
+    def close(self):
+        self.camera.release()
+        LOG.info("camera", "%s", self.camera.metrics())
+
+
+@register_stage("cascade", 15)
+class CascadeStage(Stage):
+    """
+    Cari kandidat bola dengan threshold HSV; stage infer lalu hanya memverifikasi
+    crop kandidat dan kembali ke full-frame jika tidak ada yang terkonfirmasi.
+    Opsi stage menimpa bagian "cascade" di config.json.
+    """
+    def start(self):
+        self.cascade = ColorCascade.from_config(gabung_config(self.pipeline.config["cascade"], self.options))
+        REGISTRY.register_collector("cascade", self.cascade.metrics)
+
+    def process(self, state):
+        state.regions = self.cascade.propose(state.item.image)
+        return True
+
+
+@register_stage("infer", 20)
+class InferStage(Stage):
+    """
+    Jalankan YOLO pada frame penuh, atau hanya pada crop kandidat jika stage cascade
+    aktif. Jika stage track aktif dan tracker masih yakin, YOLO dilewati dan box
+    diambil dari tracker.
+    """
+    def open(self):
+        engine_config = gabung_config(self.pipeline.config["engine"], self.options.get("engine", {}))
+        width, height = self.pipeline.resolution
+        self.engine = create_engine(engine_config, (height, width, 3))
+        self.engine.warmup((height, width, 3))
+        LOG.info("pipeline", "Engine %s: %s", self.engine.backend, self.engine.path)
+
+    def start(self):
+        self.imgsz = self.options.get("imgsz")
+        self.track = self.pipeline.stage("track")
+        cascade = self.pipeline.stage("cascade")
+        self.cascade = cascade.cascade if cascade is not None else None
+
+    def process(self, state):
+        if self.track is not None and self.track.predict(state):
+            return True
+        image = state.item.image
+        if state.regions:
+            boxes, confidences, class_ids = verify_regions(self.engine, image, state.regions)
+            if len(boxes):
+                self.cascade.update(image, boxes, confidences, full_frame=False)
+                state.boxes, state.confidences, state.class_ids = boxes, confidences, class_ids
+                return True
+        state.boxes, state.confidences, state.class_ids = self.engine.predict(image, self.imgsz)
+        if self.cascade is not None:
+            self.cascade.update(image, state.boxes, state.confidences, full_frame=True)
+        return True
+
+    def close(self):
+        self.engine.close()
+
+
+@register_stage("select", 30)
+class SelectStage(Stage):
+    """
+    Urutkan semua box dengan TargetSelector dan ambil yang terbaik sebagai target.
+    """
+    def start(self):
+        self.selector = TargetSelector(self.pipeline.resolution, min_conf=self.options.get("min_conf", 0.25))
+
+    def process(self, state):
+        if state.tracked:
+            state.order = np.zeros(1, dtype=int)
+        else:
+            state.order = self.selector.select_topk(state.boxes, state.confidences, state.class_ids)
+        state.target = int(state.order[0]) if len(state.order) else None
+        self.selector.update(state.boxes[state.target] if state.target is not None else None)
+        state.point = _tengah(state.boxes[state.target]) if state.target is not None else None
+        return True
+
+
+@register_stage("refine", 40)
+class RefineStage(Stage):
+    """
+    Periksa box sesuai urutan stage select dengan CircleRefiner dan pakai box valid
+    pertama sebagai target. center="circle" mengirim titik tengah lingkaran,
+    center="box" mengirim titik tengah box (lingkaran hanya sebagai syarat valid).
+    """
+    def start(self):
+        self.refiner = CircleRefiner(max_side=self.options.get("max_side", 96))
+        self.selector = self.pipeline.stage("select").selector
+
+    def process(self, state):
+        if state.tracked:
+            return True
+        # Dijalankan sebelum anotasi agar garis box tidak ikut terbaca sebagai tepi
+        idx, circle = self.refiner.refine_first(state.item.image, state.boxes, state.order)
+        if idx != state.target:
+            self.selector.update(state.boxes[idx] if idx is not None else None)
+        state.target = idx
+        if idx is None:
+            state.point = None
+        elif self.options.get("center", "circle") == "circle":
+            state.point = (int(circle[0]), int(circle[1]))
+        else:
+            state.point = _tengah(state.boxes[idx])
+        return True
+
+
+@register_stage("track", 50)
+class TrackStage(Stage):
+    """
+    Tracker Kalman + optical flow di antara frame YOLO. predict() dipanggil stage infer
+    sebelum YOLO; process() mengoreksi tracker dengan target hasil select / refine dan
+    mengganti box target + titik yang dikirim dengan estimasi fusi tracker.
+    """
+    def start(self):
+        self.tracker = BallTracker(max_interval=self.options.get("max_interval", 3))
+        select = self.pipeline.stage("select")
+        self.selector = select.selector if select is not None else None
+
+    def predict(self, state):
+        """
+        :return: True jika box frame ini diisi tracker (YOLO tidak perlu dijalankan)
+        """
+        if self.tracker.need_detection():
+            return False
+        box = self.tracker.track(state.item.image)
+        if box is None:
+            return False
+        state.boxes = box[np.newaxis, :4]
+        state.confidences = np.array([self.tracker.confidence], np.float32)
+        state.class_ids = np.array([self.tracker.class_id], np.float32)
+        state.tracked = True
+        return True
+
+    def process(self, state):
+        if state.tracked:
+            return True
+        if state.target is None:
+            self.tracker.correct(state.item.image, None)
+        else:
+            # Box target dan titik yang dikirim diganti estimasi fusi tracker, sama seperti Detector
+            box = self.tracker.correct(state.item.image, state.boxes[state.target],
+                                       int(state.class_ids[state.target]))
+            state.boxes[state.target] = box
+            state.point = _tengah(box)
+            if self.selector is not None:
+                self.selector.update(box)
+        return True
+
+
+@register_stage("encode", 60)
+class EncodeStage(Stage):
+    """
+    Ubah target menjadi byte serial dan titipkan ke SerialWriter.
+    format: "ascii" ("x640y360>"), "csv" ("640,360") atau "binary" (protocol.py).
+    field=True menambahkan jarak + arah bola di lantai dari calibration.FieldMap.
+    no_ball mengganti pesan "tidak ada bola" pada ascii / csv (default koordinat 0,0).
+    """
+    writer = None  # Dibuat di start(), close() tetap aman jika start() tidak sempat jalan
+
+    def start(self):
+        self.format = self.options.get("format", "ascii")
+        if self.format not in ("ascii", "csv", "binary"):
+            raise ValueError(f"Format encode '{self.format}' tidak dikenal")
+        self.only_changes = self.options.get("only_changes", True)
+        self.no_ball = self.options.get("no_ball")
+        self.encoder = FrameEncoder() if self.format == "binary" else None
+        self.field = None
+        if self.options.get("field", False):
+            self.field = FieldMap.load(self.pipeline.config["field"], self.pipeline.resolution)
+        arduino = self.pipeline.arduino
+        self.writer = SerialWriter(arduino).start() if arduino else None
+        if self.writer is not None:
+            REGISTRY.register_collector("serial", self.writer.stats)
+        self.last_sent = False  # False = belum pernah kirim, None = terakhir kirim "tidak ada bola"
+
+    def process(self, state):
+        key = state.point
+        if self.only_changes and key == self.last_sent:
+            return True
+
+        lapangan = None
+        if self.field is not None and key is not None:
+            # Titik sentuh bola dengan lantai = tengah sisi bawah box
+            lapangan = self.field.lookup(key[0], state.boxes[state.target, 3])
+
+        if self.encoder is not None:
+            targets = []
+            if key is not None:
+                t = state.target
+                targets = [(key[0], key[1], int(state.class_ids[t]), float(state.confidences[t]))]
+            if lapangan is not None:
+                data = self.encoder.encode_field([(lapangan[0] / 10.0, lapangan[1]) + targets[0][2:]],
+                                                 state.item.t_capture)
+            else:
+                data = self.encoder.encode_targets(targets, state.item.t_capture)
+        elif key is None and self.no_ball is not None:
+            data = self.no_ball.encode()
+        elif self.format == "csv":
+            data = "{},{}".format(*(key or (0, 0)))
+            if lapangan is not None:
+                data += f",{int(round(lapangan[0] / 10.0))},{int(round(lapangan[1] * 10))}"
+            data = (data + "\n").encode()
+        else:
+            data = "x{}y{}".format(*(key or (0, 0)))
+            if lapangan is not None:
+                data += f"d{int(round(lapangan[0] / 10.0))}a{int(round(lapangan[1] * 10))}"
+            data = (data + ">\n").encode()
+
+        state.data = data
+        self.last_sent = key
+        if self.writer is not None:
+            self.writer.submit(data)
+            LOG.summary("serial", "kirim", "Kamera => Arduino x%dy%d", *(key or (0, 0)))
+        return True
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.stop()
+            LOG.info("serial", "%s", self.writer.stats())
+
+
+@register_stage("record", 70)
+class RecordStage(Stage):
+    """
+    Flight recorder: frame asli, hasil deteksi, dan byte serial ke file mmap.
+    """
+    def open(self):
+        path = os.path.join(self.options.get("folder", "rekaman_match"), time.strftime("match_%Y%m%d_%H%M%S"))
+        self.recorder = Recorder(path, jpeg_quality=self.options.get("jpeg_quality", 85),
+                                 max_queue_mb=self.options.get("max_queue_mb", 32)).start()
+        LOG.info("recorder", "Merekam ke %s.rec", path)
+
+    def process(self, state):
+        item = state.item
+        self.recorder.record_frame(item)
+        self.recorder.record_result(item.seq, item.t_capture, state.boxes, state.confidences,
+                                    state.class_ids, state.target, state.data)
+        return True
+
+    def close(self):
+        self.recorder.close()
+
+
+@register_stage("annotate", 80)
+class AnnotateStage(Stage):
+    """
+    Gambar box, titik tengah, garis dari tengah kamera, dan (opsional) label per box
+    langsung di frame.
+    """
+    def open(self):
+        # Import supervision lambat, jadi ikut berjalan paralel saat startup
+        import supervision as sv
+        self.sv = sv
+        self.box_annotator = sv.BoxAnnotator(thickness=2)
+
+    def start(self):
+        infer = self.pipeline.stage("infer")
+        self.names = infer.engine.names if infer is not None else {}
+        self.labels = self.options.get("labels", False)
+        self.center_line = self.options.get("center_line", True)
+
+    def process(self, state):
+        frame = state.item.image
+        detections = self.sv.Detections(xyxy=state.boxes, confidence=state.confidences,
+                                        class_id=state.class_ids.astype(int))
+        frame = self.box_annotator.annotate(scene=frame, detections=detections)
+
+        height, width = frame.shape[:2]
+        centers = ((state.boxes[:, 0:2] + state.boxes[:, 2:4]) // 2).astype(int)
+        for box, confidence, class_id, (x, y) in zip(state.boxes, state.confidences, state.class_ids, centers):
+            if self.labels:
+                label = f"{self.names.get(int(class_id), int(class_id))} {confidence:.2f}"
+                x1, y1 = int(box[0]), int(box[1])
+                cv2.putText(frame, label, (x1, y1 - 10 if y1 - 10 > 10 else y1 + 10),
+                            cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 2)
+                cv2.putText(frame, f"({x}, {y})", (int(x) - 20, int(y) - 10),
+                            cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 2)
+            cv2.circle(frame, (int(x), int(y)), 5, (0, 255, 0), -1)
+            if self.center_line:
+                cv2.line(frame, (width // 2, height // 2), (int(x), int(y)), (255, 255, 0), 2)
+
+        if state.point is not None:
+            # Titik yang dikirim ke Arduino; kuning = posisi dari tracker
+            cv2.circle(frame, state.point, 8, (0, 255, 255) if state.tracked else (0, 0, 255), 2)
+        state.canvas = frame
+        return True
+
+
+@register_stage("preview", 85)
+class PreviewStage(Stage):
+    """
+    Stream MJPEG ke basestation dengan FPS rendah. Jika stage annotate aktif, frame
+    hasil anotasinya yang dikirim; jika tidak, box digambar thread encoder preview
+    pada frame kecil. Tanpa penonton stage ini tidak mengerjakan apa-apa.
+    Opsi stage menimpa bagian "preview" di config.json.
+    """
+    preview = None  # Dibuat di start(), close() tetap aman jika start() tidak sempat jalan
+
+    def start(self):
+        self.preview = PreviewServer.from_config(gabung_config(self.pipeline.config["preview"], self.options),
+                                                 self.pipeline.resolution)
+        REGISTRY.register_collector("preview", self.preview.metrics)
+
+    def process(self, state):
+        if self.preview.wants_frame():
+            if state.canvas is not None:
+                self.preview.submit(state.canvas)
+            else:
+                self.preview.submit(state.item.image, state.boxes, state.target)
+        return True
+
+    def close(self):
+        if self.preview is not None:
+            self.preview.close()
+            LOG.info("preview", "%s", self.preview.metrics())
+
+
+@register_stage("display", 90)
+class DisplayStage(Stage):
+    """
+    Tampilkan frame (diperkecil sesuai scale). Tombol 'q' menghentikan pipeline.
+    """
+    def start(self):
+        self.scale = self.options.get("scale", 0.5)
+        self.window = self.options.get("window", "YOLOv8 Detection")
+        width, height = self.pipeline.resolution
+        self.preview = ResizeBuffer((int(width * self.scale), int(height * self.scale)))
+
+    def process(self, state):
+        frame = state.canvas if state.canvas is not None else state.item.image
+        if self.scale != 1.0:
+            frame = self.preview.resize(frame)
+        cv2.imshow(self.window, frame)
+        return cv2.waitKey(1) & 0xFF != ord('q')
+
+    def close(self):
+        cv2.destroyAllWindows()
+
+
+class Pipeline:
+    """
+    Menjalankan stage yang aktif secara berurutan untuk setiap frame dan mencatat
+    durasi tiap stage di REGISTRY dengan nama stage tersebut.
+    """
+    def __init__(self, config, arduino=None, resolution=(1280, 720), t_start=None, stage_classes=None):
+        """
+        :param config: konfigurasi lengkap (load_config / apply_preset)
+        :param arduino: SerialHub yang sudah dibuka (tetap milik pemanggil, tidak ditutup di sini),
+                        None = buka sendiri dari pipeline.serial.port
+        :param resolution: resolusi kamera yang diminta (width, height)
+        :param t_start: waktu mulai program (time.perf_counter), untuk metrik startup
+        :param stage_classes: dict nama -> kelas stage pengganti STAGES hanya untuk pipeline ini
+                              (misalnya stage infer dengan engine palsu di check_alloc.py)
+        """
+        self.t_start = t_start if t_start is not None else time.perf_counter()
+        self.config = config
+        self.arduino = arduino
+        self._milik_serial = False  # True jika port dibuka sendiri oleh _buka_serial()
+        self.resolution = tuple(resolution)
+        self.running = True
+        self.frame = 0
+
+        pipeline_config = config["pipeline"]
+        self.headless = config["headless"]["enabled"]
+        kelas = dict(STAGES, **(stage_classes or {}))
+        self.stages = []
+        for name, options in pipeline_config["stages"].items():
+            if name not in kelas:
+                raise ValueError(f"Stage '{name}' tidak dikenal, pilihan: {sorted(kelas)}")
+            if self.headless and name in DISPLAY_STAGES:
+                continue
+            if options.get("enabled", True):
+                self.stages.append(kelas[name](self, options))
+        self.stages.sort(key=lambda stage: stage.order)
+        self._by_name = {stage.name: stage for stage in self.stages}
+        if "capture" not in self._by_name:
+            raise ValueError("Stage capture wajib aktif")
+        if "refine" in self._by_name and "select" not in self._by_name:
+            raise ValueError("Stage refine membutuhkan stage select")
+
+        # Kamera, model, import supervision, dan port serial dibuka bersamaan. Stage yang
+        # open()-nya berhasil dicatat agar close() hanya menutup stage tersebut
+        self._terbuka = set()
+        serial_config = pipeline_config.get("serial", {})
+        with ThreadPoolExecutor(max_workers=len(self.stages) + 1, thread_name_prefix="startup") as pool:
+            futures = [pool.submit(self._open_stage, stage) for stage in self.stages]
+            if arduino is None and serial_config.get("port"):
+                futures.append(pool.submit(self._buka_serial, serial_config))
+            errors = [f.exception() for f in futures if f.exception() is not None]
+        if errors:
+            self.close()
+            raise errors[0]
+
+        # Driver boleh menolak resolusi yang diminta; stage berikutnya memakai frame sebenarnya
+        camera = self._by_name["capture"].camera
+        if all(camera.resolution):
+            self.resolution = tuple(camera.resolution)
+        try:
+            for stage in self.stages:
+                stage.start()
+        except Exception:
+            self.close()
+            raise
+
+        REGISTRY.register_collector("pipeline", lambda: {"frame": self.frame})
+        LOG.info("startup", "Pipeline siap dalam %.2fs: %s", time.perf_counter() - self.t_start,
+                 " -> ".join(stage.name for stage in self.stages))
+
+    def stage(self, name):
+        """
+        :return: stage aktif dengan nama tersebut, atau None
+        """
+        return self._by_name.get(name)
+
+    def _open_stage(self, stage):
+        stage.open()
+        self._terbuka.add(stage)
+
+    def _buka_serial(self, serial_config):
+        """
+        Buka port Arduino sendiri (script tanpa main.py). Arduino reset saat port dibuka,
+        jeda settle_s berjalan bersamaan dengan load model, bukan sebelum loop kamera.
+        """
+        from serial_hub import SerialHub
+        arduino = SerialHub(serial_config["port"], serial_config.get("baudrate", 115200))
+        time.sleep(serial_config.get("settle_s", 2.0))
+        arduino.subscribe(lambda balasan: LOG.summary("arduino", "balasan", "Arduino => %s", balasan))
+        self.arduino = arduino.start()
+        self._milik_serial = True
+        LOG.info("pipeline", "Terhubung ke Arduino di %s @ %d", serial_config["port"], arduino.baudrate)
+
+    def run(self):
+        """
+        Loop utama: semua stage aktif dijalankan berurutan per frame sampai kamera
+        berhenti, stage meminta berhenti, atau stop() dipanggil.
+        """
+        timers = [(stage, REGISTRY.stage(stage.name)) for stage in self.stages]
+        try:
+            while self.running:
+                state = FrameState()
+                for stage, hist in timers:
+                    mulai = time.perf_counter()
+                    lanjut = stage.process(state)
+                    hist.observe(time.perf_counter() - mulai)
+                    if not lanjut:
+                        self.running = False
+                        break
+                else:
+                    self.frame += 1
+                for stage, _ in timers:
+                    stage.finish(state)
+        finally:
+            self.close()
+
+    def stop(self):
+        """
+        Minta loop berhenti setelah frame yang sedang diproses.
+        """
+        self.running = False
+
+    def report(self):
+        """
+        :return: dict stage -> {"rata_ms", "p95_ms"} dari histogram REGISTRY
+        """
+        hasil = {}
+        for stage in self.stages:
+            hist = REGISTRY.stage(stage.name)
+            hasil[stage.name] = {
+                "rata_ms": round(1000.0 * hist.sum / hist.count, 2) if hist.count else 0.0,
+                "p95_ms": round(1000.0 * hist.quantiles((0.95,))[0.95], 2),
+            }
+        return hasil
+
+    def close(self):
+        """
+        Tutup stage yang sudah terbuka dengan urutan kebalikan urutan stage, lalu port Arduino
+        jika port itu dibuka sendiri oleh pipeline.
+        """
+        for stage in reversed(self.stages):
+            if stage not in self._terbuka:
+                continue
+            try:
+                stage.close()
+            except Exception as e:
+                LOG.error("pipeline", "Gagal menutup stage %s: %s", stage.name, e)
+        self._terbuka = set()
+        if self.arduino and self._milik_serial:
+            self.arduino.close()
+            self.arduino = None
+        if self.frame:
+            LOG.info("pipeline", "%d frame, biaya per stage: %s", self.frame, self.report())
+
+
+def parse_arguments(preset=None):
+    parser = argparse.ArgumentParser(description="YOLOv8 live")
+    parser.add_argument("--preset", default=preset, choices=sorted(PRESETS), help="Preset pengganti script detect_*.py")
+    parser.add_argument("--webcam-resolution", default=[1280, 720], nargs=2, type=int, help="Resolution of the webcam feed (width height)")
+    parser.add_argument("--display-scale", default=None, type=float, help="Scaling factor for display window")
+    parser.add_argument("--camera-role", default=None, help="Peran kamera (depan / omni) dari cache discovery")
+    parser.add_argument("--detect-interval", default=None, type=int, help="Run YOLO at most every N frames, track in between (1 = every frame)")
+    parser.add_argument("--serial-port", default=None, help="Port Arduino, menimpa preset")
+    parser.add_argument("--headless", action="store_true", help="Tanpa anotasi dan jendela, berhenti lewat sinyal (Ctrl+C / SIGTERM)")
+    return parser.parse_args()
+
+
+def main(preset=None):
+    """
+    Titik masuk script detect_*.py: preset + argumen CLI di atas config.json.
+
+    :param preset: preset bawaan script, bisa ditimpa --preset
+    """
+    args = parse_arguments(preset)
+    config = load_config()
+    LOG.configure(config["log"])
+
+    override = {"stages": {}}
+    if args.display_scale is not None:
+        override["stages"]["display"] = {"scale": args.display_scale}
+    if args.camera_role:
+        override["stages"]["capture"] = {"camera": {"role": args.camera_role}}
+    if args.detect_interval is not None:
+        override["stages"]["track"] = {"enabled": args.detect_interval > 1, "max_interval": args.detect_interval}
+    if args.serial_port:
+        override["serial"] = {"port": args.serial_port}
+    if args.headless:
+        config["headless"]["enabled"] = True
+
+    pipeline = Pipeline(apply_preset(config, args.preset, override), resolution=args.webcam_resolution)
+    # Sinyal menghentikan loop setelah frame berjalan, stage tetap ditutup dengan rapi
+    install_shutdown_handlers(lambda alasan: pipeline.stop())
+    try:
+        pipeline.run()
+    except KeyboardInterrupt:
+        LOG.info("pipeline", "Program dihentikan.")
+    finally:
+        LOG.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+# ============ Module Preview MJPEG ================
+# Program ini mengirim preview kamera ke basestation lewat HTTP (MJPEG) dengan FPS rendah,
+# menggantikan cv2.imshow tiap frame. Anotasi digambar pada frame yang sudah diperkecil
+# dan JPEG di-encode di thread sendiri; tanpa penonton, loop deteksi tidak mengerjakan apa-apa
+#
+# Buka di browser basestation: http://<ip-robot>:8090/
+
+"""
+Library yang digunakan
+"""
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import cv2
+import numpy as np
+
+from buffer_pool import FramePool
+from frame_slot import LatestSlot
+from ringlog import LOG
+
+BOUNDARY = "frame"
+
+HALAMAN = b"""<!doctype html>
+<html><head><title>Preview Robot</title></head>
+<body style="margin:0;background:#111"><img src="/stream.mjpg" style="width:100%"></body></html>
+"""
+
+
+def gambar_overlay(image, scale, boxes, target=None, teks=None):
+    """
+    Gambar box, titik tengah, dan garis ke target pada frame yang sudah diperkecil.
+
+    :param image: frame kecil BGR, digambar langsung
+    :param scale: skala frame kecil terhadap frame kamera
+    :param boxes: array (N, 4) xyxy dalam koordinat frame kamera
+    :param target: index box target, atau None
+    :param teks: keterangan tambahan di dekat target (misalnya jarak), atau None
+    """
+    height, width = image.shape[:2]
+    for i, box in enumerate(np.asarray(boxes) * scale):
+        x1, y1, x2, y2 = (int(v) for v in box)
+        warna = (0, 0, 255) if i == target else (0, 255, 0)
+        cv2.rectangle(image, (x1, y1), (x2, y2), warna, 1)
+        cx, cy = (x1 + x2) // 2, (y1 + y2) // 2
+        cv2.circle(image, (cx, cy), 3, warna, -1)
+        if i == target:
+            cv2.line(image, (width // 2, height // 2), (cx, cy), (255, 255, 0), 1)
+            if teks:
+                cv2.putText(image, teks, (cx + 6, cy + 14), cv2.FONT_HERSHEY_SIMPLEX, 0.4, (0, 255, 255), 1)
+
+
+class PreviewServer:
+    """
+    Server MJPEG untuk preview. Loop deteksi memanggil wants_frame() (hanya membaca dua
+    angka) dan submit() jika perlu; frame diperkecil ke buffer milik preview sehingga
+    buffer kamera bisa langsung dipakai ulang, lalu thread encoder menggambar anotasi,
+    meng-encode JPEG, dan membagikannya ke semua penonton.
+    """
+    def __init__(self, frame_size, port=8090, host="0.0.0.0", fps=5, scale=0.5, jpeg_quality=70):
+        """
+        :param frame_size: ukuran frame kamera (width, height)
+        :param port: port HTTP
+        :param host: alamat bind, "0.0.0.0" agar basestation di jaringan robot bisa membuka
+        :param fps: batas frame preview per detik
+        :param scale: skala preview terhadap frame kamera
+        :param jpeg_quality: kualitas JPEG (0-100)
+        """
+        self.scale = scale
+        self.size = (int(frame_size[0] * scale), int(frame_size[1] * scale))
+        self.interval = 1.0 / fps if fps > 0 else 0.0
+        self.encode_param = [int(cv2.IMWRITE_JPEG_QUALITY), int(jpeg_quality)]
+
+        self.penonton = 0  # Koneksi stream + snapshot yang sedang menunggu frame
+        self.frame = 0
+        self.durasi_encode = 0.0
+        self._terakhir = 0.0
+        self._lock = threading.Lock()
+        self._cond = threading.Condition()
+        self._jpeg = None
+        self._nomor = 0
+        self._tutup = False
+
+        # Buffer frame kecil: satu sedang diisi, satu di slot, satu sedang di-encode
+        self._pool = FramePool((self.size[1], self.size[0], 3), 3)
+        self._slot = LatestSlot(on_drop=lambda item: self._pool.release(item[0]))
+
+        # Bind lebih dulu: jika port terpakai, OSError terjadi sebelum thread apa pun berjalan
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+        self.server.daemon_threads = True
+        self._worker = threading.Thread(target=self._encode_loop, name="preview-encode", daemon=True)
+        self._worker.start()
+        threading.Thread(target=self.server.serve_forever, name="preview-http", daemon=True).start()
+        LOG.info("preview", "http://%s:%d/ (%dx%d, maks %.0f FPS)", host, port, *self.size, fps)
+
+    @classmethod
+    def from_config(cls, preview_config, frame_size):
+        """
+        :param preview_config: bagian "preview" dari config.json
+        :param frame_size: ukuran frame kamera (width, height)
+        """
+        return cls(frame_size,
+                   port=preview_config.get("port", 8090),
+                   host=preview_config.get("host", "0.0.0.0"),
+                   fps=preview_config.get("fps", 5),
+                   scale=preview_config.get("scale", 0.5),
+                   jpeg_quality=preview_config.get("jpeg_quality", 70))
+
+    def wants_frame(self):
+        """
+        :return: True jika ada penonton dan jeda FPS preview sudah lewat
+        """
+        return self.penonton > 0 and time.monotonic() - self._terakhir >= self.interval
+
+    def submit(self, image, boxes=None, target=None, teks=None):
+        """
+        Perkecil frame ke buffer preview dan titipkan ke thread encoder. Setelah fungsi
+        ini kembali, `image` tidak dipakai lagi oleh preview.
+
+        :param image: frame kamera BGR
+        :param boxes: array (N, 4) xyxy koordinat frame kamera, None = tanpa anotasi
+        :param target: index box target
+        :param teks: keterangan target
+        """
+        self._terakhir = time.monotonic()
+        buffer = self._pool.acquire()
+        cv2.resize(image, self.size, dst=buffer, interpolation=cv2.INTER_AREA)
+        # Box disalin karena pemanggil boleh mengubahnya setelah submit
+        self._slot.put((buffer, None if boxes is None else np.array(boxes), target, teks))
+
+    def _encode_loop(self):
+        while True:
+            item = self._slot.get()
+            if item is None:
+                break
+            buffer, boxes, target, teks = item
+            mulai = time.perf_counter()
+            if boxes is not None:
+                gambar_overlay(buffer, self.scale, boxes, target, teks)
+            ok, jpeg = cv2.imencode(".jpg", buffer, self.encode_param)
+            self._pool.release(buffer)
+            self.durasi_encode += time.perf_counter() - mulai
+            if not ok:
+                continue
+            with self._cond:
+                self._jpeg = jpeg.tobytes()
+                self._nomor += 1
+                self.frame += 1
+                self._cond.notify_all()
+
+    def _tunggu_frame(self, nomor, timeout=2.0):
+        """
+        :param nomor: nomor frame terakhir yang sudah dikirim ke penonton ini
+        :return: (nomor, jpeg) frame yang lebih baru, atau (nomor, None) jika timeout
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self._nomor != nomor, timeout)
+            if self._nomor == nomor:
+                return nomor, None
+            return self._nomor, self._jpeg
+
+    def _tambah_penonton(self, n):
+        with self._lock:
+            self.penonton += n
+
+    def _handler(self):
+        preview = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = self.path.split("?")[0]
+                if path == "/":
+                    self._kirim(200, "text/html", HALAMAN)
+                elif path == "/snapshot.jpg":
+                    preview._tambah_penonton(1)
+                    try:
+                        _, jpeg = preview._tunggu_frame(preview._nomor)
+                    finally:
+                        preview._tambah_penonton(-1)
+                    if jpeg is None:
+                        self.send_error(503, "Belum ada frame")
+                    else:
+                        self._kirim(200, "image/jpeg", jpeg)
+                elif path == "/stream.mjpg":
+                    self._stream()
+                else:
+                    self.send_error(404)
+
+            def _kirim(self, status, content_type, body):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _stream(self):
+                self.send_response(200)
+                self.send_header("Content-Type", f"multipart/x-mixed-replace; boundary={BOUNDARY}")
+                self.send_header("Cache-Control", "no-cache")
+                self.end_headers()
+                preview._tambah_penonton(1)
+                LOG.info("preview", "Penonton terhubung dari %s", self.client_address[0])
+                try:
+                    nomor = 0
+                    while not preview._tutup:
+                        nomor, jpeg = preview._tunggu_frame(nomor)
+                        if jpeg is None:
+                            continue
+                        self.wfile.write(f"--{BOUNDARY}\r\nContent-Type: image/jpeg\r\n"
+                                         f"Content-Length: {len(jpeg)}\r\n\r\n".encode())
+                        self.wfile.write(jpeg)
+                        self.wfile.write(b"\r\n")
+                except (BrokenPipeError, ConnectionResetError, ConnectionAbortedError):
+                    pass
+                finally:
+                    preview._tambah_penonton(-1)
+                    LOG.info("preview", "Penonton %s terputus", self.client_address[0])
+
+            def log_message(self, *args):
+                pass  # Jangan ikut memenuhi terminal dengan log akses
+
+        return Handler
+
+    def metrics(self):
+        """
+        :return: dict jumlah penonton, frame preview, dan rata-rata waktu gambar + encode (ms)
+        """
+        return {
+            "penonton": self.penonton,
+            "frame": self.frame,
+            "encode_ms": round(1000.0 * self.durasi_encode / self.frame, 2) if self.frame else 0.0,
+        }
+
+    def close(self):
+        """
+        Hentikan server HTTP dan thread encoder.
+        """
+        self._tutup = True
+        self.server.shutdown()
+        self.server.server_close()
+        self._slot.close()
+        self._worker.join(timeout=2)
@@ -0,0 +1,299 @@
+# ============ Module Protokol Biner Kamera <-> Arduino ================
+# Program ini berisi framing biner berversi untuk link serial ke Arduino
+# Parser referensi untuk sisi Arduino ada di arduino/robot_protocol.h
+
+"""
+Library yang digunakan
+"""
+import struct
+import time
+from collections import namedtuple
+
+"""
+Format frame (little-endian):
+
+    offset  ukuran  isi
+    0       1       SYNC = 0xA5
+    1       1       versi (4 bit atas) | tipe frame (4 bit bawah)
+    2       1       sequence number (0..255, berputar)
+    3       2       timestamp capture, milidetik monotonic (berputar tiap 65,5 detik)
+    5       1       panjang payload (byte)
+    6       N       payload
+    6+N     2       CRC-16/CCITT-FALSE dari byte 1 s.d. akhir payload
+
+Payload FRAME_TARGETS berisi 0..MAX_TARGETS target, masing-masing 6 byte:
+
+    x (int16), y (int16), kamera (4 bit atas) | kelas (4 bit bawah), confidence (0..255)
+
+Jumlah target = panjang payload / 6. Frame tanpa target berarti bola tidak terlihat
+(setara "x0y0>" pada protokol ASCII). Payload FRAME_COMMAND berisi teks perintah
+basestation apa adanya (tanpa penutup ">"). Header FRAME_TARGETS / FRAME_FIELD dengan
+panjang yang bukan kelipatan 6, atau tipe yang tidak dikenal, dianggap SYNC palsu.
+
+Payload FRAME_FIELD (posisi bola di lantai, dari tabel calibration.FieldMap) berisi
+target 6 byte dengan susunan yang sama, tetapi dua field pertama diganti:
+
+    jarak (uint16, cm), arah (int16, 0,1 derajat, + = kanan), kamera | kelas, confidence
+"""
+
+SYNC = 0xA5
+VERSION = 1
+
+FRAME_TARGETS = 0x1
+FRAME_COMMAND = 0x2
+FRAME_FIELD = 0x3
+
+HEADER = struct.Struct("<BBBHB")
+TARGET = struct.Struct("<hhBB")
+FIELD_TARGET = struct.Struct("<HhBB")
+CRC = struct.Struct("<H")
+
+MAX_PAYLOAD = 255
+MAX_TARGETS = MAX_PAYLOAD // TARGET.size
+
+Frame = namedtuple("Frame", ["version", "type", "seq", "timestamp", "payload"])
+Target = namedtuple("Target", ["x", "y", "camera", "class_id", "confidence"])
+FieldTarget = namedtuple("FieldTarget", ["distance_cm", "bearing_deg", "camera", "class_id", "confidence"])
+
+
+def _crc_table():
+    table = []
+    for i in range(256):
+        crc = i << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x1021) if crc & 0x8000 else (crc << 1)
+        table.append(crc & 0xFFFF)
+    return tuple(table)
+
+
+_CRC_TABLE = _crc_table()
+
+
+def crc16(data, crc=0xFFFF):
+    """
+    CRC-16/CCITT-FALSE (poly 0x1021, init 0xFFFF) berbasis tabel.
+
+    :param data: bytes / bytearray / memoryview
+    :return: nilai CRC 16 bit
+    """
+    table = _CRC_TABLE
+    for b in data:
+        crc = ((crc << 8) & 0xFFFF) ^ table[(crc >> 8) ^ b]
+    return crc
+
+
+class FrameEncoder:
+    """
+    Encoder frame biner. Buffer dialokasikan sekali dan diisi dengan struct.pack_into,
+    sehingga loop kamera tidak lagi membangun string dengan f-string + encode().
+    """
+    def __init__(self, camera=0):
+        """
+        :param camera: id kamera default untuk target (0..15)
+        """
+        self.camera = camera
+        self.seq = 0
+        self._buf = bytearray(HEADER.size + MAX_PAYLOAD + CRC.size)
+
+    def encode_targets(self, targets, t_capture=None):
+        """
+        Bangun frame FRAME_TARGETS.
+
+        :param targets: iterable (x, y) atau (x, y, class_id, confidence[, camera]),
+                        confidence dalam rentang 0..1
+        :param t_capture: waktu capture dari time.monotonic(), None = sekarang
+        :return: bytes frame siap kirim
+        """
+        buf = self._buf
+        offset = HEADER.size
+        count = 0
+        for target in targets:
+            if count == MAX_TARGETS:
+                break
+            x, y = int(target[0]), int(target[1])
+            class_id = int(target[2]) if len(target) > 2 else 0
+            confidence = float(target[3]) if len(target) > 3 else 1.0
+            camera = int(target[4]) if len(target) > 4 else self.camera
+            TARGET.pack_into(
+                buf, offset,
+                max(-32768, min(32767, x)), max(-32768, min(32767, y)),
+                ((camera & 0x0F) << 4) | (class_id & 0x0F),
+                max(0, min(255, int(confidence * 255 + 0.5))),
+            )
+            offset += TARGET.size
+            count += 1
+        return self._finish(FRAME_TARGETS, offset - HEADER.size, t_capture)
+
+    def encode_field(self, targets, t_capture=None):
+        """
+        Bangun frame FRAME_FIELD.
+
+        :param targets: iterable (jarak_cm, arah_derajat, class_id, confidence[, camera])
+        :param t_capture: waktu capture dari time.monotonic(), None = sekarang
+        :return: bytes frame siap kirim
+        """
+        buf = self._buf
+        offset = HEADER.size
+        count = 0
+        for target in targets:
+            if count == MAX_TARGETS:
+                break
+            class_id = int(target[2]) if len(target) > 2 else 0
+            confidence = float(target[3]) if len(target) > 3 else 1.0
+            camera = int(target[4]) if len(target) > 4 else self.camera
+            FIELD_TARGET.pack_into(
+                buf, offset,
+                max(0, min(65535, int(round(target[0])))),
+                max(-1800, min(1800, int(round(target[1] * 10)))),
+                ((camera & 0x0F) << 4) | (class_id & 0x0F),
+                max(0, min(255, int(confidence * 255 + 0.5))),
+            )
+            offset += FIELD_TARGET.size
+            count += 1
+        return self._finish(FRAME_FIELD, offset - HEADER.size, t_capture)
+
+    def encode_command(self, text, t_capture=None):
+        """
+        Bangun frame FRAME_COMMAND dari perintah teks basestation.
+
+        :param text: str atau bytes perintah (penutup ">" dibuang)
+        :return: bytes frame siap kirim
+        """
+        if isinstance(text, str):
+            text = text.encode()
+        text = text.rstrip(b">")[:MAX_PAYLOAD]
+        self._buf[HEADER.size:HEADER.size + len(text)] = text
+        return self._finish(FRAME_COMMAND, len(text), t_capture)
+
+    def _finish(self, frame_type, length, t_capture):
+        if t_capture is None:
+            t_capture = time.monotonic()
+        buf = self._buf
+        HEADER.pack_into(
+            buf, 0, SYNC, (VERSION << 4) | frame_type, self.seq,
+            int(t_capture * 1000) & 0xFFFF, length,
+        )
+        end = HEADER.size + length
+        CRC.pack_into(buf, end, crc16(memoryview(buf)[1:end]))
+        self.seq = (self.seq + 1) & 0xFF
+        return bytes(buf[:end + CRC.size])
+
+
+def valid_length(frame_type, length):
+    """
+    Cek panjang payload terhadap tipe frame. Header dengan panjang mustahil berarti
+    SYNC palsu, sehingga parser tidak perlu menunggu sampai 255 byte untuk tahu.
+
+    :param frame_type: tipe frame (4 bit bawah byte versi)
+    :param length: panjang payload dari header
+    :return: True jika panjang mungkin untuk tipe tersebut
+    """
+    if length > MAX_PAYLOAD:
+        return False
+    if frame_type in (FRAME_TARGETS, FRAME_FIELD):
+        return length % TARGET.size == 0
+    return frame_type == FRAME_COMMAND
+
+
+def decode_targets(payload):
+    """
+    Urai payload FRAME_TARGETS.
+
+    :param payload: bytes payload
+    :return: list Target dengan confidence 0..1
+    """
+    targets = []
+    for x, y, cam_cls, conf in TARGET.iter_unpack(payload[:len(payload) - len(payload) % TARGET.size]):
+        targets.append(Target(x, y, cam_cls >> 4, cam_cls & 0x0F, conf / 255.0))
+    return targets
+
+
+def decode_field(payload):
+    """
+    Urai payload FRAME_FIELD.
+
+    :param payload: bytes payload
+    :return: list FieldTarget dengan arah dalam derajat dan confidence 0..1
+    """
+    targets = []
+    usable = payload[:len(payload) - len(payload) % FIELD_TARGET.size]
+    for distance, bearing, cam_cls, conf in FIELD_TARGET.iter_unpack(usable):
+        targets.append(FieldTarget(distance, bearing / 10.0, cam_cls >> 4, cam_cls & 0x0F, conf / 255.0))
+    return targets
+
+
+def decode(data):
+    """
+    Urai satu frame lengkap.
+
+    :param data: bytes berisi tepat satu frame
+    :return: Frame
+    :raises ValueError: jika sync, versi, tipe, panjang, atau CRC tidak cocok
+    """
+    if len(data) < HEADER.size + CRC.size or data[0] != SYNC:
+        raise ValueError("Frame tidak valid: sync atau panjang salah")
+    sync, ver_type, seq, timestamp, length = HEADER.unpack_from(data, 0)
+    if ver_type >> 4 != VERSION:
+        raise ValueError("Frame tidak valid: versi protokol tidak dikenal")
+    if not valid_length(ver_type & 0x0F, length):
+        raise ValueError("Frame tidak valid: tipe atau panjang payload mustahil")
+    end = HEADER.size + length
+    if len(data) != end + CRC.size:
+        raise ValueError("Frame tidak valid: panjang payload tidak cocok")
+    (crc,) = CRC.unpack_from(data, end)
+    if crc != crc16(memoryview(data)[1:end]):
+        raise ValueError("Frame tidak valid: CRC salah")
+    return Frame(ver_type >> 4, ver_type & 0x0F, seq, timestamp, bytes(data[HEADER.size:end]))
+
+
+class FrameParser:
+    """
+    Parser inkremental untuk aliran byte serial. Byte sampah, header dengan panjang
+    mustahil, dan frame dengan CRC salah dibuang, lalu parser mencari SYNC berikutnya
+    (resinkronisasi). Perilakunya sama dengan RobotFrameParser di robot_protocol.h.
+    """
+    def __init__(self):
+        self._buf = bytearray()
+        self.crc_error = 0
+        self.length_error = 0
+
+    def feed(self, data):
+        """
+        Masukkan potongan byte dari serial.
+
+        :param data: bytes hasil read()
+        :return: list Frame yang selesai diurai dari potongan ini
+        """
+        self._buf += data
+        frames = []
+        buf = self._buf
+        while True:
+            start = buf.find(SYNC)
+            if start < 0:
+                buf.clear()
+                break
+            if start:
+                del buf[:start]
+            if len(buf) < 2:
+                break
+            if buf[1] >> 4 != VERSION:
+                # Byte SYNC palsu: versi tidak cocok, langsung cari SYNC berikutnya
+                del buf[:1]
+                continue
+            if len(buf) < HEADER.size:
+                break
+            if not valid_length(buf[1] & 0x0F, buf[5]):
+                self.length_error += 1
+                del buf[:1]
+                continue
+            end = HEADER.size + buf[5] + CRC.size
+            if len(buf) < end:
+                break
+            try:
+                frames.append(decode(bytes(buf[:end])))
+                del buf[:end]
+            except ValueError:
+                # Bukan frame valid: geser satu byte dan cari SYNC berikutnya
+                self.crc_error += 1
+                del buf[:1]
+        return frames
@@ -0,0 +1,139 @@
+# ============ Module Pengatur Kualitas Adaptif ================
+# Program ini menjaga latensi per frame tetap di bawah budget dengan menurunkan /
+# menaikkan imgsz YOLO dan batas FPS, misalnya saat laptop throttling di tengah match
+
+"""
+Library yang digunakan
+"""
+import collections
+import time
+
+import numpy as np
+
+from ringlog import LOG
+
+
+class QualityController:
+    """
+    Mengukur latensi tiap frame (capture sampai data terkirim) dan memilih level kualitas.
+    Latensi p90 hanya mengatur imgsz: turun saat melewati budget, naik saat jauh di bawahnya.
+    Batas FPS tidak ikut, karena pace() menunggu sebelum capture sehingga FPS tidak
+    mengubah latensi yang diukur. FPS diturunkan saat CPU terdeteksi throttling (lebih
+    sedikit frame = beban CPU lebih kecil) dan dipulihkan satu level per window setelahnya.
+    """
+    def __init__(self, budget_ms=60.0, imgsz_steps=(320, 416, 512, 640), fps_steps=(10, 15, 20, 30),
+                 window=30, headroom=0.6, throttle_ratio=1.3):
+        """
+        :param budget_ms: target latensi per frame dalam milidetik
+        :param imgsz_steps: pilihan imgsz dari kecil ke besar (kelipatan 32)
+        :param fps_steps: pilihan batas FPS dari kecil ke besar
+        :param window: jumlah frame yang diukur sebelum keputusan berikutnya
+        :param headroom: naik level hanya jika p90 < headroom * budget
+        :param throttle_ratio: latensi rata-rata > ratio * baseline level yang sama dianggap
+                               CPU sedang throttling / ada beban lain
+        """
+        self.budget = budget_ms / 1000.0
+        self.imgsz_steps = sorted(imgsz_steps)
+        self.fps_steps = sorted(fps_steps)
+        self.window = window
+        self.headroom = headroom
+        self.throttle_ratio = throttle_ratio
+
+        # Mulai dari kualitas tertinggi, turun sendiri jika tidak sanggup
+        self.imgsz_level = len(self.imgsz_steps) - 1
+        self.fps_level = len(self.fps_steps) - 1
+
+        self.latensi = collections.deque(maxlen=window)
+        self.baseline = {}  # imgsz_level -> latensi rata-rata terbaik
+        self.throttled = False
+        self.perubahan = 0
+        self.last_p50 = 0.0
+        self.last_p90 = 0.0
+        self._frame_terakhir = None
+
+    @property
+    def imgsz(self):
+        return self.imgsz_steps[self.imgsz_level]
+
+    @property
+    def max_fps(self):
+        return self.fps_steps[self.fps_level]
+
+    def pace(self):
+        """
+        Tahan loop capture agar tidak melebihi batas FPS saat ini.
+        Dipanggil sekali per frame sebelum membaca kamera.
+        """
+        sekarang = time.monotonic()
+        if self._frame_terakhir is not None:
+            sisa = self._frame_terakhir + 1.0 / self.max_fps - sekarang
+            if sisa > 0:
+                time.sleep(sisa)
+                sekarang += sisa
+        self._frame_terakhir = sekarang
+
+    def record(self, latency):
+        """
+        Catat latensi satu frame dan sesuaikan level jika sudah cukup sampel.
+
+        :param latency: latensi frame dalam detik
+        :return: True jika imgsz / FPS baru saja berubah
+        """
+        self.latensi.append(latency)
+        if len(self.latensi) < self.window:
+            return False
+
+        sampel = np.fromiter(self.latensi, float)
+        self.last_p50, self.last_p90 = (float(p) for p in np.percentile(sampel, (50, 90)))
+        rata = float(sampel.mean())
+
+        # Baseline = latensi terbaik yang pernah terlihat di level ini. Latensi yang naik
+        # jauh di atasnya tanpa level berubah berarti CPU melambat, bukan beban model
+        # Batas FPS tidak mengubah latensi per frame, jadi baseline cukup per imgsz
+        baseline = min(self.baseline.get(self.imgsz_level, rata), rata)
+        self.baseline[self.imgsz_level] = baseline
+        self.throttled = rata > self.throttle_ratio * baseline
+
+        lama = (self.imgsz, self.max_fps)
+        if self.last_p90 > self.budget:
+            if self.imgsz_level > 0:
+                self.imgsz_level -= 1
+            else:
+                LOG.summary("quality", "budget", "p90 %.0fms di atas budget %.0fms pada imgsz terkecil",
+                            self.last_p90 * 1000, self.budget * 1000, level="WARNING")
+        elif (self.last_p90 < self.headroom * self.budget and not self.throttled
+              and self.imgsz_level < len(self.imgsz_steps) - 1):
+            self.imgsz_level += 1
+
+        # Throttling baru bisa dinilai jika imgsz tidak berubah (baseline level yang sama)
+        if self.imgsz == lama[0]:
+            if self.throttled and self.fps_level > 0:
+                self.fps_level -= 1
+            elif not self.throttled and self.fps_level < len(self.fps_steps) - 1:
+                self.fps_level += 1
+
+        # Sampel lama diukur pada level sebelumnya, mulai ulang setelah berubah
+        self.latensi.clear()
+        if (self.imgsz, self.max_fps) == lama:
+            return False
+        self.perubahan += 1
+        LOG.info("quality", "imgsz %d -> %d, fps %d -> %d (p90 %.0fms, budget %.0fms%s)",
+                 lama[0], self.imgsz, lama[1], self.max_fps, self.last_p90 * 1000,
+                 self.budget * 1000, ", throttling" if self.throttled else "")
+        return True
+
+    def metrics(self):
+        """
+        Keputusan dan pengukuran terakhir controller.
+
+        :return: dict imgsz, max_fps, p50_ms, p90_ms, budget_ms, throttled, perubahan
+        """
+        return {
+            "imgsz": self.imgsz,
+            "max_fps": self.max_fps,
+            "p50_ms": round(self.last_p50 * 1000, 1),
+            "p90_ms": round(self.last_p90 * 1000, 1),
+            "budget_ms": round(self.budget * 1000, 1),
+            "throttled": self.throttled,
+            "perubahan": self.perubahan,
+        }
@@ -0,0 +1,340 @@
+# ============ Module Flight Recorder Match ================
+# Program ini merekam setiap frame kamera (JPEG) beserta hasil deteksi, target terpilih,
+# dan byte serial yang dikirim ke file append-only yang di-mmap, plus file index
+# sehingga rekaman bisa dibaca acak per nomor frame / waktu dan diputar ulang ke Detector
+#
+# Format file <nama>.rec:
+#   header file : b"KRSBIREC" + versi (uint32)
+#   per record  : REC_HEADER (magic, jenis, seq, t_capture, panjang payload) + payload
+#     FRAME  -> payload = JPEG
+#     RESULT -> payload = target (int32) + jumlah box (uint16) + panjang serial (uint16)
+#               + box float32 (N, 6: x1 y1 x2 y2 conf cls) + byte serial
+# Format file <nama>.idx: INDEX_ENTRY (jenis, seq, t_capture, offset, panjang) per record
+
+"""
+Library yang digunakan
+"""
+import bisect
+import mmap
+import os
+import queue
+import struct
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from capture import Frame
+from ringlog import LOG
+
+FILE_MAGIC = b"KRSBIREC"
+FILE_VERSION = 1
+FILE_HEADER = struct.Struct("<8sI")
+REC_MAGIC = b"RC"
+REC_HEADER = struct.Struct("<2sBIdI")  # magic, jenis, seq, t_capture, panjang payload
+RESULT_HEADER = struct.Struct("<iHH")  # target (-1 = tidak ada), jumlah box, panjang serial
+INDEX_ENTRY = struct.Struct("<BIdQI")  # jenis, seq, t_capture, offset record, panjang record
+
+KIND_FRAME = 1
+KIND_RESULT = 2
+
+
+class Recorder:
+    """
+    Penulis rekaman. record_frame() / record_result() hanya menitipkan data ke antrian;
+    encode JPEG dan penulisan ke mmap dilakukan thread sendiri. Antrian dibatasi jumlah
+    byte (frame mentah 720p ~2.7 MB); jika batas terlewati, data dibuang dan dihitung
+    sebelum disalin, loop kamera tidak pernah menunggu disk.
+    """
+    def __init__(self, path, jpeg_quality=85, chunk_mb=64, max_queue_mb=32):
+        """
+        :param path: path file tanpa ekstensi, akan dibuat <path>.rec dan <path>.idx
+        :param jpeg_quality: kualitas JPEG frame (0-100)
+        :param chunk_mb: ukuran penambahan file mmap setiap kali penuh
+        :param max_queue_mb: total byte maksimal yang menunggu ditulis
+        """
+        self.path = path
+        self.jpeg_quality = jpeg_quality
+        self.chunk = chunk_mb * 1024 * 1024
+        self.max_queue_bytes = int(max_queue_mb * 1024 * 1024)
+        self._queue = queue.Queue()
+        self._antri_bytes = 0
+        self._lock = threading.Lock()
+        self._thread = None
+
+        folder = os.path.dirname(os.path.abspath(path))
+        os.makedirs(folder, exist_ok=True)
+        self._f = open(path + ".rec", "w+b")
+        self._idx = open(path + ".idx", "wb")
+        self._kapasitas = self.chunk
+        self._f.truncate(self._kapasitas)
+        self._mm = mmap.mmap(self._f.fileno(), self._kapasitas)
+        self._pos = 0
+        self._tulis(FILE_HEADER.pack(FILE_MAGIC, FILE_VERSION))
+
+        # Statistik
+        self.frame = 0
+        self.result = 0
+        self.dibuang = 0
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="recorder", daemon=True)
+            self._thread.start()
+        return self
+
+    def record_frame(self, frame):
+        """
+        Titipkan frame kamera. Gambar disalin karena stage output menggambar anotasi
+        langsung di array yang sama; salinan baru dibuat setelah antrian pasti menerimanya.
+
+        :param frame: Frame (image, seq, t_capture)
+        """
+        if self._pesan(frame.image.nbytes):
+            self._queue.put((KIND_FRAME, frame.seq, frame.t_capture, frame.image.copy()))
+
+    def record_result(self, seq, t_capture, boxes, confidences, class_ids, target, serial_bytes=None):
+        """
+        Titipkan hasil deteksi satu frame.
+
+        :param seq: nomor frame yang dideteksi
+        :param t_capture: waktu capture frame
+        :param boxes: array (N, 4) xyxy
+        :param confidences: array (N,)
+        :param class_ids: array (N,)
+        :param target: index box terpilih atau None
+        :param serial_bytes: byte yang dikirim ke Arduino untuk frame ini, None jika tidak ada
+        """
+        det = np.empty((len(boxes), 6), np.float32)
+        det[:, :4] = boxes
+        det[:, 4] = confidences
+        det[:, 5] = class_ids
+        payload = (RESULT_HEADER.pack(-1 if target is None else int(target), len(det), len(serial_bytes or b""))
+                   + det.tobytes() + (serial_bytes or b""))
+        if self._pesan(len(payload)):
+            self._queue.put((KIND_RESULT, seq, t_capture, payload))
+
+    def close(self):
+        """
+        Tulis sisa antrian, potong file ke ukuran sebenarnya, dan tutup.
+        """
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+        self._mm.flush()
+        self._mm.close()
+        self._f.truncate(self._pos)
+        self._f.close()
+        self._idx.close()
+        LOG.info("recorder", "%s: %d frame, %d hasil, %d dibuang", self.path, self.frame, self.result, self.dibuang)
+
+    def _pesan(self, n):
+        """
+        Pesan tempat di antrian untuk `n` byte.
+
+        :return: False jika batas byte antrian terlewati (data dibuang)
+        """
+        with self._lock:
+            if self._antri_bytes + n > self.max_queue_bytes:
+                self.dibuang += 1
+                return False
+            self._antri_bytes += n
+            return True
+
+    def _loop(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            kind, seq, t_capture, data = item
+            with self._lock:
+                self._antri_bytes -= data.nbytes if kind == KIND_FRAME else len(data)
+            if kind == KIND_FRAME:
+                ok, jpeg = cv2.imencode(".jpg", data, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+                if not ok:
+                    self.dibuang += 1
+                    continue
+                data = jpeg.tobytes()
+                self.frame += 1
+            else:
+                self.result += 1
+
+            record = REC_HEADER.pack(REC_MAGIC, kind, seq, t_capture, len(data)) + data
+            offset = self._tulis(record)
+            self._idx.write(INDEX_ENTRY.pack(kind, seq, t_capture, offset, len(record)))
+            if self._queue.empty():
+                self._idx.flush()  # Index tetap terbaca jika program crash
+
+    def _tulis(self, data):
+        if self._pos + len(data) > self._kapasitas:
+            self._perbesar(len(data))
+        offset = self._pos
+        self._mm[offset:offset + len(data)] = data
+        self._pos += len(data)
+        return offset
+
+    def _perbesar(self, n):
+        # Mapping harus ditutup sebelum file diperbesar (wajib di Windows)
+        self._mm.flush()
+        self._mm.close()
+        self._kapasitas = max(self._kapasitas + self.chunk, self._pos + n)
+        self._f.truncate(self._kapasitas)
+        self._mm = mmap.mmap(self._f.fileno(), self._kapasitas)
+
+
+class RecordingReader:
+    """
+    Pembaca rekaman dengan akses acak. Hanya index yang dibaca di awal; JPEG baru
+    di-decode saat frame itu diminta.
+    """
+    def __init__(self, path):
+        """
+        :param path: path rekaman tanpa ekstensi (atau dengan .rec)
+        """
+        if path.endswith(".rec"):
+            path = path[:-4]
+        self.path = path
+        self._f = open(path + ".rec", "rb")
+        self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, versi = FILE_HEADER.unpack_from(self._mm, 0)
+        if magic != FILE_MAGIC or versi != FILE_VERSION:
+            raise ValueError(f"{path}.rec bukan rekaman versi {FILE_VERSION}")
+
+        entries = self._baca_index() if os.path.exists(path + ".idx") else []
+        # Setelah crash index bisa tertinggal dari .rec: telusuri sisanya dari record terakhir
+        # yang ter-index (atau dari awal jika index tidak ada)
+        pos = entries[-1][3] + entries[-1][4] if entries else FILE_HEADER.size
+        tambahan = self._scan(pos)
+        if tambahan and entries:
+            LOG.warning("recorder", "%s.idx tertinggal %d record, sisanya dibaca dari .rec", path, len(tambahan))
+        entries += tambahan
+        self._frames = {}
+        self._results = {}
+        for kind, seq, t_capture, offset, panjang in entries:
+            (self._frames if kind == KIND_FRAME else self._results)[seq] = (t_capture, offset, panjang)
+
+        self.seqs = sorted(self._frames)
+        self._times = [self._frames[s][0] for s in self.seqs]
+
+    def __len__(self):
+        return len(self.seqs)
+
+    def frame(self, seq):
+        """
+        :return: Frame (image, seq, t_capture) nomor `seq`
+        """
+        t_capture, offset, panjang = self._frames[seq]
+        start = offset + REC_HEADER.size
+        jpeg = np.frombuffer(self._mm, np.uint8, panjang - REC_HEADER.size, start)
+        return Frame(cv2.imdecode(jpeg, cv2.IMREAD_COLOR), seq, t_capture)
+
+    def result(self, seq):
+        """
+        :return: dict boxes, confidences, class_ids, target, serial untuk frame `seq`,
+                 atau None jika frame itu tidak sempat dideteksi
+        """
+        if seq not in self._results:
+            return None
+        _, offset, _ = self._results[seq]
+        start = offset + REC_HEADER.size
+        target, n, n_serial = RESULT_HEADER.unpack_from(self._mm, start)
+        start += RESULT_HEADER.size
+        det = np.frombuffer(self._mm, np.float32, n * 6, start).reshape(n, 6)
+        start += det.nbytes
+        return {
+            "boxes": det[:, :4].copy(),
+            "confidences": det[:, 4].copy(),
+            "class_ids": det[:, 5].copy(),
+            "target": None if target < 0 else target,
+            "serial": bytes(self._mm[start:start + n_serial]),
+        }
+
+    def seq_at(self, t):
+        """
+        :param t: waktu (skala time.monotonic saat rekaman)
+        :return: seq frame terakhir yang ditangkap pada atau sebelum `t`
+        """
+        i = bisect.bisect_right(self._times, t) - 1
+        return self.seqs[max(i, 0)]
+
+    def frames(self, start=None, stop=None):
+        """
+        Iterasi frame berurutan untuk diputar ulang, dari seq `start` sampai sebelum `stop`.
+        """
+        for seq in self.seqs:
+            if (start is None or seq >= start) and (stop is None or seq < stop):
+                yield self.frame(seq)
+
+    def close(self):
+        self._mm.close()
+        self._f.close()
+
+    def _baca_index(self):
+        with open(self.path + ".idx", "rb") as f:
+            data = f.read()
+        n = len(data) // INDEX_ENTRY.size  # Entry terakhir yang terpotong (crash) diabaikan
+        return [INDEX_ENTRY.unpack_from(data, i * INDEX_ENTRY.size) for i in range(n)]
+
+    def _scan(self, pos):
+        # Telusuri record satu per satu mulai `pos` sampai bagian file yang kosong
+        entries = []
+        while pos + REC_HEADER.size <= len(self._mm):
+            magic, kind, seq, t_capture, panjang = REC_HEADER.unpack_from(self._mm, pos)
+            if magic != REC_MAGIC or pos + REC_HEADER.size + panjang > len(self._mm):
+                break
+            entries.append((kind, seq, t_capture, pos, REC_HEADER.size + panjang))
+            pos += REC_HEADER.size + panjang
+        return entries
+
+
+class ReplayCamera:
+    """
+    Sumber frame dari rekaman dengan antarmuka sama seperti capture.Camera, sehingga
+    Detector bisa dijalankan ulang pada footage match yang sebenarnya.
+    """
+    def __init__(self, path, realtime=True):
+        """
+        :param path: path rekaman
+        :param realtime: tahan read() sesuai jeda antar frame saat direkam
+        """
+        self.reader = RecordingReader(path)
+        self.realtime = realtime
+        self._iter = iter(self.reader.seqs)
+        self._mulai = None
+        self.seq = 0
+        pertama = self.reader.frame(self.reader.seqs[0]).image if len(self.reader) else None
+        self.resolution = (pertama.shape[1], pertama.shape[0]) if pertama is not None else (0, 0)
+
+    @property
+    def opened(self):
+        return len(self.reader) > 0
+
+    def read(self):
+        seq = next(self._iter, None)
+        if seq is None:
+            return None
+        frame = self.reader.frame(seq)
+        if self.realtime:
+            if self._mulai is None:
+                self._mulai = (time.monotonic(), frame.t_capture)
+            tunggu = (frame.t_capture - self._mulai[1]) - (time.monotonic() - self._mulai[0])
+            if tunggu > 0:
+                time.sleep(tunggu)
+        self.seq = seq
+        # Waktu capture diganti waktu sekarang agar latensi pipeline tetap terukur benar
+        return Frame(frame.image, seq, time.monotonic())
+
+    def recycle(self, frame):
+        # Frame rekaman di-decode baru setiap read(), tidak ada pool
+        pass
+
+    def report_age(self, frame):
+        return time.monotonic() - frame.t_capture
+
+    def metrics(self):
+        return {"frame": self.seq, "total": len(self.reader)}
+
+    def release(self):
+        self.reader.close()
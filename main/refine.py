@@ -0,0 +1,127 @@
+# ============ Module Refinement Lingkaran Bola ================
+# Program ini berisi tahap refinement posisi bola dari box YOLO
+# Gray + blur dikerjakan sekali untuk gabungan box, lalu kontur dicari per box
+
+"""
+Library yang digunakan
+"""
+import cv2
+import numpy as np
+
+
+class CircleRefiner:
+    """
+    Mencari lingkaran bola (minEnclosingCircle dari kontur terbesar) di dalam box YOLO.
+    Hanya box yang diminta yang diproses, dan box besar diperkecil dulu ke `max_side`
+    sehingga biaya per box terbatas.
+    """
+    def __init__(self, max_side=96, canny_low=50, canny_high=150, blur=5):
+        """
+        :param max_side: sisi terpanjang ROI setelah diperkecil (batas kerja per box)
+        :param canny_low: threshold bawah Canny
+        :param canny_high: threshold atas Canny
+        :param blur: ukuran kernel GaussianBlur
+        """
+        self.max_side = max_side
+        self.canny_low = canny_low
+        self.canny_high = canny_high
+        self.blur = (blur, blur)
+
+    def refine(self, frame, boxes, indices=None):
+        """
+        Refinement beberapa box sekaligus.
+
+        :param frame: frame BGR asli (belum dianotasi)
+        :param boxes: array (N, 4+) xyxy
+        :param indices: index box yang akan dipakai, None = semua box
+        :return: array (N, 3) berisi (x, y, radius) per box, NaN jika tidak ada kontur
+        """
+        boxes = np.asarray(boxes)
+        hasil = np.full((len(boxes), 3), np.nan, np.float32)
+        if indices is None:
+            indices = np.arange(len(boxes))
+        for i, circle in self._iter_circles(frame, boxes, indices):
+            hasil[i] = circle
+        return hasil
+
+    def refine_first(self, frame, boxes, order):
+        """
+        Periksa box sesuai urutan prioritas dan berhenti di box valid pertama,
+        sehingga kontur box yang tidak akan dipakai tidak ikut dicari. Gray + blur
+        gabungan box tetap dikerjakan sekali untuk semua kandidat.
+
+        :param frame: frame BGR asli (belum dianotasi)
+        :param boxes: array (N, 4+) xyxy
+        :param order: urutan index box, biasanya dari TargetSelector.select_topk
+        :return: (index, (x, y, radius)) atau (None, None) jika tidak ada box valid
+        """
+        for i, circle in self._iter_circles(frame, np.asarray(boxes), order):
+            if not np.isnan(circle[0]):
+                return int(i), circle
+        return None, None
+
+    def _iter_circles(self, frame, boxes, indices):
+        """
+        Hasilkan (index, (x, y, radius)) per box sesuai urutan `indices`, satu per satu
+        agar pemanggil bisa berhenti lebih awal.
+        """
+        indices = np.asarray(indices, dtype=int)
+        if len(boxes) == 0 or len(indices) == 0:
+            return
+
+        rects = self._clip(boxes[indices, :4], frame.shape)
+        luas = (rects[:, 2] - rects[:, 0]) * (rects[:, 3] - rects[:, 1])
+        ux1, uy1 = rects[:, 0].min(), rects[:, 1].min()
+        ux2, uy2 = rects[:, 2].max(), rects[:, 3].max()
+        luas_union = (ux2 - ux1) * (uy2 - uy1)
+
+        if len(indices) > 1 and luas_union <= 1.5 * luas.sum():
+            # Box saling berdekatan: konversi gray + blur cukup sekali untuk gabungannya
+            gray = cv2.cvtColor(frame[uy1:uy2, ux1:ux2], cv2.COLOR_BGR2GRAY)
+            blurred = cv2.GaussianBlur(gray, self.blur, 0)
+            for i, (x1, y1, x2, y2) in zip(indices, rects):
+                roi = blurred[y1 - uy1:y2 - uy1, x1 - ux1:x2 - ux1]
+                yield i, self._circle(roi, x1, y1, sudah_blur=True)
+        else:
+            for i, (x1, y1, x2, y2) in zip(indices, rects):
+                yield i, self._circle(frame[y1:y2, x1:x2], x1, y1, sudah_blur=False)
+
+    def _circle(self, roi, offset_x, offset_y, sudah_blur):
+        """
+        Cari lingkaran dari kontur terbesar pada satu ROI.
+        """
+        h, w = roi.shape[:2]
+        if h < 3 or w < 3:
+            return np.nan, np.nan, np.nan
+
+        # Batasi biaya per box: ROI besar diperkecil lebih dulu
+        skala = 1.0
+        if max(h, w) > self.max_side:
+            skala = self.max_side / float(max(h, w))
+            roi = cv2.resize(roi, (max(3, int(w * skala)), max(3, int(h * skala))),
+                             interpolation=cv2.INTER_AREA)
+
+        if not sudah_blur:
+            roi = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
+            roi = cv2.GaussianBlur(roi, self.blur, 0)
+
+        edged = cv2.Canny(roi, self.canny_low, self.canny_high)
+        # RETR_EXTERNAL cukup untuk kontur terluar bola, tanpa membangun hierarki penuh
+        contours, _ = cv2.findContours(edged, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        if not contours:
+            return np.nan, np.nan, np.nan
+
+        area = max(contours, key=cv2.contourArea)
+        (x, y), radius = cv2.minEnclosingCircle(area)
+        return offset_x + x / skala, offset_y + y / skala, radius / skala
+
+    @staticmethod
+    def _clip(boxes, shape):
+        """
+        Bulatkan box ke integer dan potong ke batas frame.
+        """
+        h, w = shape[:2]
+        rects = boxes.astype(int)
+        rects[:, [0, 2]] = np.clip(rects[:, [0, 2]], 0, w)
+        rects[:, [1, 3]] = np.clip(rects[:, [1, 3]], 0, h)
+        return rects
@@ -0,0 +1,212 @@
+# ============ Module Logger Ring Buffer ================
+# Program ini berisi logger non-blocking: thread kamera / bridge hanya menaruh record
+# ke ring buffer di memori, thread lain yang memformat dan menulis ke console
+
+"""
+Library yang digunakan
+"""
+import atexit
+import json
+import sys
+import threading
+import time
+
+LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40, "OFF": 100}
+
+
+class RingLogger:
+    """
+    Logger dengan ring buffer berukuran tetap. log() hanya menyimpan tuple
+    (waktu, level, subsystem, format, args) tanpa memformat string; format dan
+    I/O console dilakukan thread flush. Jika buffer penuh, record tertua ditimpa
+    dan dihitung sebagai dropped, sehingga pemanggil tidak pernah menunggu.
+
+    Pesan yang berulang tiap frame dikirim lewat summary(): hanya pesan terakhir
+    dan jumlahnya yang dicetak sekali per `summary_interval`.
+    """
+    def __init__(self, capacity=4096, flush_interval=0.2, summary_interval=1.0,
+                 default_level="INFO", levels=None, stream=None, jsonl_path=None):
+        """
+        :param capacity: jumlah record di ring buffer
+        :param flush_interval: jeda maksimal sebelum record dicetak (detik)
+        :param summary_interval: jeda antar ringkasan pesan berulang (detik)
+        :param default_level: level untuk subsystem yang tidak diatur
+        :param levels: dict subsystem -> level, contoh {"serial": "WARNING"}
+        :param stream: tujuan teks, None = sys.stdout
+        :param jsonl_path: jika diisi, semua record juga ditulis sebagai JSON per baris
+        """
+        self.capacity = capacity
+        self._buf = [None] * capacity  # Dialokasikan sekali di awal
+        self._head = 0  # Jumlah record yang pernah ditulis
+        self._tail = 0  # Jumlah record yang sudah dicetak / dibuang
+        self._lock = threading.Lock()
+
+        self.flush_interval = flush_interval
+        self.summary_interval = summary_interval
+        self.default_level = LEVELS[default_level]
+        self.levels = {k: LEVELS[v] for k, v in (levels or {}).items()}
+        self.stream = stream
+        self.jsonl_path = jsonl_path
+
+        self._summary = {}  # (subsystem, key) -> [jumlah, level, format, args]
+        self._summary_terakhir = time.monotonic()
+        self.dropped = 0
+
+        self._wake = threading.Event()
+        self._thread = None
+        self._running = False
+        self._start_lock = threading.Lock()
+
+    def configure(self, log_config):
+        """
+        Atur level dari bagian "log" di config.json.
+
+        :param log_config: dict berisi level, levels, summary_interval, jsonl_path
+        """
+        self.default_level = LEVELS[log_config.get("level", "INFO")]
+        for subsystem, level in log_config.get("levels", {}).items():
+            self.set_level(subsystem, level)
+        self.summary_interval = log_config.get("summary_interval", self.summary_interval)
+        self.jsonl_path = log_config.get("jsonl_path", self.jsonl_path)
+
+    def set_level(self, subsystem, level):
+        self.levels[subsystem] = LEVELS[level]
+
+    def enabled(self, level, subsystem):
+        return LEVELS[level] >= self.levels.get(subsystem, self.default_level)
+
+    def log(self, level, subsystem, msg, *args):
+        """
+        Simpan satu record. Tidak memformat, tidak I/O, tidak pernah blok lama.
+
+        :param level: "DEBUG", "INFO", "WARNING", atau "ERROR"
+        :param subsystem: nama bagian program, contoh "detector", "serial", "bridge"
+        :param msg: format %-style, diformat nanti di thread flush
+        :param args: argumen format
+        """
+        if LEVELS[level] < self.levels.get(subsystem, self.default_level):
+            return
+        if self._thread is None:
+            self.start()
+        record = (time.time(), level, subsystem, msg, args)
+        with self._lock:
+            if self._head - self._tail >= self.capacity:
+                self._tail += 1  # Timpa record tertua
+                self.dropped += 1
+            self._buf[self._head % self.capacity] = record
+            self._head += 1
+        if LEVELS[level] >= LEVELS["ERROR"]:
+            self._wake.set()  # Error dicetak secepatnya
+
+    def debug(self, subsystem, msg, *args):
+        self.log("DEBUG", subsystem, msg, *args)
+
+    def info(self, subsystem, msg, *args):
+        self.log("INFO", subsystem, msg, *args)
+
+    def warning(self, subsystem, msg, *args):
+        self.log("WARNING", subsystem, msg, *args)
+
+    def error(self, subsystem, msg, *args):
+        self.log("ERROR", subsystem, msg, *args)
+
+    def summary(self, subsystem, key, msg, *args, level="INFO"):
+        """
+        Catat pesan yang berulang (tiap frame / tiap datagram). Yang dicetak hanya
+        pesan terakhir per `key` beserta jumlahnya, sekali per summary_interval.
+        """
+        if LEVELS[level] < self.levels.get(subsystem, self.default_level):
+            return
+        if self._thread is None:
+            self.start()
+        with self._lock:
+            item = self._summary.get((subsystem, key))
+            if item is None:
+                self._summary[(subsystem, key)] = [1, level, msg, args]
+            else:
+                item[0] += 1
+                item[2] = msg
+                item[3] = args
+
+    def start(self):
+        """
+        Mulai thread flush (otomatis saat record pertama masuk).
+        """
+        with self._start_lock:
+            if self._thread is not None:
+                return self
+            self._running = True
+            self._thread = threading.Thread(target=self._loop, name="ringlog", daemon=True)
+            self._thread.start()
+        atexit.register(self.stop)
+        return self
+
+    def stop(self):
+        """
+        Hentikan thread flush dan cetak semua record yang tersisa.
+        """
+        if self._thread is None:
+            return
+        self._running = False
+        self._wake.set()
+        self._thread.join(timeout=2)
+        self._thread = None
+        self._flush(paksa_summary=True)
+
+    def _loop(self):
+        while self._running:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self._flush()
+
+    def _flush(self, paksa_summary=False):
+        sekarang = time.monotonic()
+        with self._lock:
+            records = [self._buf[i % self.capacity] for i in range(self._tail, self._head)]
+            self._tail = self._head
+            summary = None
+            if paksa_summary or sekarang - self._summary_terakhir >= self.summary_interval:
+                summary, self._summary = self._summary, {}
+                durasi = sekarang - self._summary_terakhir
+                self._summary_terakhir = sekarang
+            dropped, self.dropped = self.dropped, 0
+
+        if summary:
+            t = time.time()
+            for (subsystem, _), (jumlah, level, msg, args) in summary.items():
+                if jumlah > 1:
+                    msg = f"{msg} (x{jumlah} dalam {durasi:.1f}s)"
+                records.append((t, level, subsystem, msg, args))
+        if dropped:
+            records.append((time.time(), "WARNING", "log", "%d record dibuang, buffer penuh", (dropped,)))
+        if not records:
+            return
+
+        baris = []
+        for t, level, subsystem, msg, args in records:
+            try:
+                teks = msg % args if args else msg
+            except (TypeError, ValueError):
+                teks = f"{msg} {args}"
+            jam = time.strftime("%H:%M:%S", time.localtime(t)) + f".{int(t * 1000) % 1000:03d}"
+            baris.append((t, level, subsystem, teks, f"{jam} {level:<7} [{subsystem}] {teks}"))
+
+        # Satu write untuk semua baris: console Windows mahal per panggilan, bukan per byte
+        stream = self.stream or sys.stdout
+        try:
+            stream.write("\n".join(b[4] for b in baris) + "\n")
+            stream.flush()
+        except Exception:
+            pass
+
+        if self.jsonl_path:
+            try:
+                with open(self.jsonl_path, "a", encoding="utf-8") as f:
+                    for t, level, subsystem, teks, _ in baris:
+                        f.write(json.dumps({"t": t, "level": level, "subsystem": subsystem, "msg": teks}) + "\n")
+            except OSError:
+                pass
+
+
+# Logger bersama untuk seluruh program
+LOG = RingLogger()
@@ -0,0 +1,109 @@
+# ============ Module Search Window (ROI) ================
+# Program ini berisi pengatur jendela pencarian bola setelah bola terkunci
+# YOLO cukup dijalankan pada potongan kecil di sekitar posisi terakhir bola
+
+"""
+Library yang digunakan
+"""
+import numpy as np
+
+
+class SearchWindow:
+    """
+    Menyimpan posisi bola yang terkunci dan menentukan area crop untuk frame berikutnya.
+    Ukuran crop menyesuaikan ukuran bola dan kecepatannya, dan deteksi full-frame
+    tetap dijalankan setiap `redetect_interval` frame atau saat bola hilang.
+    """
+    def __init__(self, frame_size, redetect_interval=15, margin=3.0, min_size=160, max_imgsz=640):
+        """
+        :param frame_size: ukuran frame kamera (width, height)
+        :param redetect_interval: jumlah frame maksimal sebelum deteksi full-frame ulang
+        :param margin: kelipatan ukuran bola untuk lebar crop
+        :param min_size: sisi crop minimal dalam piksel
+        :param max_imgsz: imgsz maksimal yang dikirim ke YOLO untuk crop
+        """
+        self.frame_width, self.frame_height = frame_size
+        self.redetect_interval = redetect_interval
+        self.margin = margin
+        self.min_size = min_size
+        self.max_imgsz = max_imgsz
+
+        self.lock = None  # (cx, cy, w, h) bola terakhir
+        self.velocity = (0.0, 0.0)  # Perpindahan piksel per frame
+        self.frame_sejak_full = 0
+
+    def next_region(self):
+        """
+        Tentukan area deteksi frame berikutnya.
+
+        :return: (x1, y1, x2, y2, imgsz) untuk crop, atau None jika harus full-frame
+        """
+        if self.lock is None or self.frame_sejak_full >= self.redetect_interval:
+            return None
+
+        cx, cy, w, h = self.lock
+        vx, vy = self.velocity
+
+        # Prediksi posisi berikutnya, lalu lebarkan crop sesuai ukuran dan kecepatan bola
+        cx, cy = cx + vx, cy + vy
+        half_w = max(self.min_size / 2, self.margin * w / 2 + abs(vx) * 2)
+        half_h = max(self.min_size / 2, self.margin * h / 2 + abs(vy) * 2)
+
+        x1 = int(max(0, cx - half_w))
+        y1 = int(max(0, cy - half_h))
+        x2 = int(min(self.frame_width, cx + half_w))
+        y2 = int(min(self.frame_height, cy + half_h))
+        if x2 - x1 < 32 or y2 - y1 < 32:
+            return None
+
+        # Crop yang hampir sebesar frame tidak ada untungnya
+        if (x2 - x1) * (y2 - y1) > 0.6 * self.frame_width * self.frame_height:
+            return None
+
+        # imgsz kelipatan 32 supaya YOLO tidak memperbesar crop ke 640
+        imgsz = int(np.ceil(max(x2 - x1, y2 - y1) / 32.0) * 32)
+        imgsz = min(imgsz, self.max_imgsz)
+        return x1, y1, x2, y2, imgsz
+
+    def update(self, boxes, full_frame):
+        """
+        Perbarui kunci bola dari hasil deteksi terbaru.
+
+        :param boxes: array (N, 4) xyxy dalam koordinat frame penuh
+        :param full_frame: True jika deteksi barusan dijalankan pada frame penuh
+        """
+        if full_frame:
+            self.frame_sejak_full = 0
+        else:
+            self.frame_sejak_full += 1
+
+        if len(boxes) == 0:
+            self.lock = None
+            self.velocity = (0.0, 0.0)
+            return
+
+        centers = (boxes[:, :2] + boxes[:, 2:4]) / 2.0
+        if self.lock is None:
+            idx = 0
+        else:
+            # Pilih box yang paling dekat dengan posisi prediksi
+            pred = np.array([self.lock[0] + self.velocity[0], self.lock[1] + self.velocity[1]])
+            idx = int(np.argmin(np.sum((centers - pred) ** 2, axis=1)))
+
+        cx, cy = centers[idx]
+        w = boxes[idx, 2] - boxes[idx, 0]
+        h = boxes[idx, 3] - boxes[idx, 1]
+        if self.lock is not None:
+            # Haluskan kecepatan agar crop tidak melompat-lompat
+            vx = 0.5 * self.velocity[0] + 0.5 * (cx - self.lock[0])
+            vy = 0.5 * self.velocity[1] + 0.5 * (cy - self.lock[1])
+            self.velocity = (float(vx), float(vy))
+        self.lock = (float(cx), float(cy), float(w), float(h))
+
+    def reset(self):
+        """
+        Lepas kunci bola sehingga frame berikutnya dideteksi full-frame.
+        """
+        self.lock = None
+        self.velocity = (0.0, 0.0)
+        self.frame_sejak_full = 0
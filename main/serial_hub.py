@@ -0,0 +1,178 @@
+# ============ Module Hub Serial Arduino ================
+# Program ini berisi satu-satunya pemilik port serial Arduino
+# Pembacaan blocking dengan timeout (tanpa busy-polling), parser inkremental,
+# pesan masuk dibagikan ke subscriber, dan penulisan dari semua thread dikunci
+
+"""
+Library yang digunakan
+"""
+import queue
+import threading
+
+import serial
+
+from protocol import FrameParser
+from ringlog import LOG
+
+
+class SerialHub:
+    """
+    Pemilik tunggal port serial. Satu thread pembaca memakai read() blocking dengan
+    timeout sehingga tidak memakan CPU saat diam, memecah aliran byte menjadi baris
+    (mode "line") atau frame biner (mode "frame"), lalu membagikannya ke subscriber.
+    """
+    def __init__(self, port, baudrate=115200, timeout=0.1, mode="line", serial_obj=None):
+        """
+        :param port: nama port serial, contoh "COM7"
+        :param baudrate: baudrate port
+        :param timeout: timeout read() dalam detik, juga batas waktu berhenti thread
+        :param mode: "line" untuk pesan teks per baris, "frame" untuk protokol biner
+        :param serial_obj: objek serial yang sudah dibuka (port dan baudrate diabaikan)
+        """
+        if serial_obj is None:
+            serial_obj = serial.Serial(port, baudrate, timeout=timeout)
+        else:
+            serial_obj.timeout = timeout
+        self.serial = serial_obj
+        self.mode = mode
+
+        self._write_lock = threading.Lock()
+        self._sub_lock = threading.Lock()
+        self._subscribers = []
+        self._line_buf = bytearray()
+        self._frame_parser = FrameParser() if mode == "frame" else None
+
+        self._running = False
+        self._thread = None
+
+        # Statistik
+        self.bytes_dibaca = 0
+        self.pesan_diterima = 0
+        self.bytes_ditulis = 0
+
+    @property
+    def port(self):
+        return self.serial.port
+
+    @property
+    def baudrate(self):
+        return self.serial.baudrate
+
+    @property
+    def is_open(self):
+        return self.serial.is_open
+
+    def start(self):
+        """
+        Mulai thread pembaca.
+        """
+        if self._thread is None:
+            self._running = True
+            self._thread = threading.Thread(target=self._read_loop, name="serial-hub", daemon=True)
+            self._thread.start()
+        return self
+
+    def subscribe(self, callback):
+        """
+        Daftarkan callback untuk setiap pesan masuk. Callback dipanggil dari thread
+        pembaca, jadi harus cepat; untuk pekerjaan berat pakai subscribe_queue().
+
+        :param callback: fungsi callback(pesan), pesan berupa str (mode "line")
+                         atau protocol.Frame (mode "frame")
+        :return: callback itu sendiri, untuk unsubscribe()
+        """
+        with self._sub_lock:
+            self._subscribers = self._subscribers + [callback]
+        return callback
+
+    def subscribe_queue(self, maxsize=64):
+        """
+        Daftarkan antrian yang menerima setiap pesan masuk. Jika antrian penuh,
+        pesan terlama dibuang agar thread pembaca tidak pernah menunggu.
+
+        :return: queue.Queue berisi pesan
+        """
+        q = queue.Queue(maxsize)
+
+        def masukkan(pesan):
+            while True:
+                try:
+                    q.put_nowait(pesan)
+                    return
+                except queue.Full:
+                    try:
+                        q.get_nowait()
+                    except queue.Empty:
+                        pass
+
+        self.subscribe(masukkan)
+        return q
+
+    def unsubscribe(self, callback):
+        with self._sub_lock:
+            self._subscribers = [c for c in self._subscribers if c is not callback]
+
+    def write(self, data):
+        """
+        Tulis bytes ke port. Aman dipanggil dari banyak thread sekaligus.
+
+        :param data: bytes yang akan dikirim
+        """
+        with self._write_lock:
+            self.serial.write(data)
+            self.bytes_ditulis += len(data)
+
+    def close(self):
+        """
+        Hentikan thread pembaca dan tutup port.
+        """
+        self._running = False
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(self.serial.timeout + 0.5 if self.serial.timeout else 1.0)
+        self._thread = None
+        with self._write_lock:
+            self.serial.close()
+
+    def _read_loop(self):
+        ser = self.serial
+        while self._running:
+            try:
+                # Blok sampai ada data atau timeout, lalu ambil semua yang sudah tersedia
+                data = ser.read(max(1, ser.in_waiting))
+            except Exception as e:
+                if self._running:
+                    LOG.error("serial", "Baca serial gagal: %s", e)
+                break
+            if not data:
+                continue
+            self.bytes_dibaca += len(data)
+            for pesan in self._parse(data):
+                self.pesan_diterima += 1
+                for callback in self._subscribers:
+                    try:
+                        callback(pesan)
+                    except Exception as e:
+                        LOG.error("serial", "Subscriber error: %s", e)
+
+    def _parse(self, data):
+        """
+        Parser inkremental: potongan byte -> daftar pesan lengkap.
+        """
+        if self._frame_parser is not None:
+            return self._frame_parser.feed(data)
+
+        buf = self._line_buf
+        buf += data
+        pesan = []
+        while True:
+            idx = buf.find(b"\n")
+            if idx < 0:
+                break
+            line = buf[:idx].decode(errors="replace").strip()
+            del buf[:idx + 1]
+            if line:
+                pesan.append(line)
+        # Jaga buffer tetap kecil jika Arduino tidak pernah mengirim newline
+        if len(buf) > 4096:
+            del buf[:-1024]
+        return pesan
@@ -0,0 +1,122 @@
+# ============ Module Penulis Serial Non-Blocking ================
+# Program ini berisi thread penulis serial dengan mailbox satu slot
+# Loop kamera cukup menitipkan data terbaru, tidak pernah menunggu port serial
+
+"""
+Library yang digunakan
+"""
+import threading
+import time
+
+from frame_slot import LatestSlot
+from metrics import REGISTRY
+from ringlog import LOG
+
+
+class SerialWriter:
+    """
+    Thread penulis serial. Data terbaru dititipkan lewat mailbox satu slot (data lama
+    yang belum terkirim ditimpa), lalu ditulis dengan jeda sesuai kapasitas baudrate
+    sehingga buffer serial tidak pernah menumpuk data basi.
+    """
+    def __init__(self, port, baudrate=None, name="serial-writer"):
+        """
+        :param port: objek serial (atau apa pun yang punya write(bytes))
+        :param baudrate: baudrate link, None = ambil dari port.baudrate
+        :param name: nama thread
+        """
+        self.port = port
+        if baudrate is None:
+            baudrate = getattr(port, "baudrate", 115200)
+        # 1 start bit + 8 data bit + 1 stop bit = 10 bit per byte
+        self.detik_per_byte = 10.0 / baudrate
+        self.name = name
+
+        self._mailbox = LatestSlot()
+        self._thread = None
+        self._running = False
+
+        # Statistik
+        self.terkirim = 0
+        self.bytes_terkirim = 0
+        self.gagal = 0
+        self.dibuang = 0
+        self._ditimpa_saat_jeda = 0
+
+    def start(self):
+        """
+        Mulai thread penulis.
+        """
+        if self._thread is not None:
+            return self
+        self._running = True
+        self._thread = threading.Thread(target=self._loop, name=self.name, daemon=True)
+        self._thread.start()
+        return self
+
+    def submit(self, data):
+        """
+        Titipkan data untuk dikirim. Tidak pernah blok; data lama yang belum
+        terkirim akan ditimpa (coalesced).
+
+        :param data: bytes yang akan dikirim
+        """
+        self._mailbox.put(data)
+
+    def stop(self, timeout=1.0):
+        """
+        Hentikan thread. Data yang masih di mailbox dihitung sebagai dibuang.
+        """
+        self._running = False
+        self._mailbox.close()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._mailbox.get(timeout=0) is not None:
+            self.dibuang += 1
+
+    @property
+    def coalesced(self):
+        """
+        Jumlah update yang ditimpa update lebih baru sebelum sempat dikirim.
+        """
+        return self._mailbox.ditimpa + self._ditimpa_saat_jeda
+
+    def stats(self):
+        """
+        :return: dict statistik penulis serial
+        """
+        return {
+            "terkirim": self.terkirim,
+            "bytes": self.bytes_terkirim,
+            "coalesced": self.coalesced,
+            "gagal": self.gagal,
+            "dibuang": self.dibuang,
+        }
+
+    def _loop(self):
+        siap = time.monotonic()
+        while self._running:
+            data = self._mailbox.get(timeout=0.1)
+            if data is None:
+                continue
+
+            # Tunggu sampai UART selesai mengirim data sebelumnya
+            jeda = siap - time.monotonic()
+            if jeda > 0:
+                time.sleep(jeda)
+                # Selama menunggu mungkin sudah ada data yang lebih baru
+                terbaru = self._mailbox.get(timeout=0)
+                if terbaru is not None:
+                    self._ditimpa_saat_jeda += 1
+                    data = terbaru
+
+            try:
+                with REGISTRY.timer("serial_write"):
+                    self.port.write(data)
+                self.terkirim += 1
+                self.bytes_terkirim += len(data)
+            except Exception as e:
+                self.gagal += 1
+                LOG.error("serial", "Kirim serial gagal: %s", e)
+            siap = time.monotonic() + len(data) * self.detik_per_byte
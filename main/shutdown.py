@@ -0,0 +1,44 @@
+# ============ Module Penghentian Program ================
+# Program ini memasang handler sinyal (SIGTERM, SIGINT, SIGBREAK di Windows, SIGHUP)
+# agar program tanpa jendela (headless) bisa dihentikan dengan rapi: kamera dilepas,
+# rekaman ditutup, dan port serial ditutup, pengganti tombol 'q' di jendela preview
+
+"""
+Library yang digunakan
+"""
+import signal
+
+from ringlog import LOG
+
+# SIGBREAK = Ctrl+Break / konsol ditutup di Windows, SIGHUP = terminal SSH terputus
+SIGNALS = ("SIGTERM", "SIGINT", "SIGBREAK", "SIGHUP")
+
+
+def install_shutdown_handlers(callback, signals=SIGNALS):
+    """
+    Pasang handler sinyal yang memanggil callback sekali. Sinyal kedua (misalnya Ctrl+C
+    ditekan lagi karena penghentian macet) dilempar sebagai KeyboardInterrupt.
+    Harus dipanggil dari thread utama.
+
+    :param callback: fungsi callback(alasan) yang meminta semua loop berhenti
+    :param signals: nama sinyal yang ditangani, yang tidak ada di OS ini dilewati
+    :return: list nama sinyal yang terpasang
+    """
+    diterima = []
+
+    def handler(signum, frame):
+        nama = signal.Signals(signum).name
+        if diterima:
+            raise KeyboardInterrupt(nama)
+        diterima.append(nama)
+        LOG.info("main", "Sinyal %s diterima, menghentikan program", nama)
+        callback(nama)
+
+    terpasang = []
+    for nama in signals:
+        sig = getattr(signal, nama, None)
+        if sig is None:
+            continue
+        signal.signal(sig, handler)
+        terpasang.append(nama)
+    return terpasang
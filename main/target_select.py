@@ -0,0 +1,117 @@
+# ============ Module Pemilihan Target ================
+# Program ini berisi pemilih target bola berbasis NumPy
+# Semua box dinilai sekaligus, bukan "box terakhir di loop yang menang"
+
+"""
+Library yang digunakan
+"""
+import numpy as np
+
+
+class TargetSelector:
+    """
+    Menilai semua box sekaligus berdasarkan confidence, ukuran, kelas, dan jarak
+    ke target sebelumnya, lalu memilih box terbaik (atau top-k).
+    """
+    def __init__(self, frame_size, w_conf=1.0, w_size=0.5, w_dist=0.75,
+                 class_weights=None, min_conf=0.25):
+        """
+        :param frame_size: ukuran frame kamera (width, height)
+        :param w_conf: bobot confidence YOLO
+        :param w_size: bobot ukuran box (bola dekat = box besar)
+        :param w_dist: bobot penalti jarak ke target sebelumnya
+        :param class_weights: dict {class_id: bonus skor}, kelas lain bernilai 0
+        :param min_conf: box dengan confidence di bawah ini diabaikan
+        """
+        width, height = frame_size
+        self.diagonal = float(np.hypot(width, height))
+        self.w_conf = w_conf
+        self.w_size = w_size
+        self.w_dist = w_dist
+        self.class_weights = class_weights or {}
+        self.min_conf = min_conf
+
+        self.prev = None  # Titik tengah target terakhir (x, y)
+
+    def scores(self, boxes, confidences, class_ids):
+        """
+        Hitung skor semua box dalam satu operasi vektor.
+
+        :param boxes: array (N, 4) xyxy
+        :param confidences: array (N,)
+        :param class_ids: array (N,)
+        :return: array (N,) skor, -inf untuk box yang tidak memenuhi min_conf
+        """
+        boxes = np.asarray(boxes, dtype=np.float32)
+        confidences = np.asarray(confidences, dtype=np.float32)
+
+        wh = boxes[:, 2:4] - boxes[:, 0:2]
+        # Ukuran dinormalisasi terhadap seperempat diagonal frame
+        size = np.minimum(np.sqrt(np.maximum(wh[:, 0] * wh[:, 1], 0)) / (0.25 * self.diagonal), 1.0)
+        score = self.w_conf * confidences + self.w_size * size
+
+        if self.class_weights:
+            bonus = np.zeros(len(boxes), np.float32)
+            class_ids = np.asarray(class_ids).astype(int)
+            for class_id, weight in self.class_weights.items():
+                bonus[class_ids == class_id] = weight
+            score += bonus
+
+        if self.prev is not None:
+            centers = (boxes[:, 0:2] + boxes[:, 2:4]) / 2.0
+            dist = np.hypot(centers[:, 0] - self.prev[0], centers[:, 1] - self.prev[1])
+            score -= self.w_dist * dist / self.diagonal
+
+        score[confidences < self.min_conf] = -np.inf
+        return score
+
+    def select(self, boxes, confidences, class_ids):
+        """
+        Pilih satu target terbaik dan simpan sebagai target sebelumnya.
+
+        :return: index box terpilih, atau None jika tidak ada box yang layak
+        """
+        ranking = self.select_topk(boxes, confidences, class_ids, 1)
+        if not len(ranking):
+            self.prev = None
+            return None
+
+        idx = int(ranking[0])
+        self.update(boxes[idx])
+        return idx
+
+    def select_topk(self, boxes, confidences, class_ids, k=None):
+        """
+        Urutkan box dari skor tertinggi tanpa mengubah target sebelumnya.
+
+        :param k: jumlah box yang diambil, None = semua box yang layak
+        :return: array index box, urut dari skor tertinggi
+        """
+        if len(boxes) == 0:
+            return np.empty(0, dtype=int)
+
+        score = self.scores(boxes, confidences, class_ids)
+        valid = np.count_nonzero(np.isfinite(score))
+        if k is None or k > valid:
+            k = valid
+        if k == 0:
+            return np.empty(0, dtype=int)
+        if k < len(score):
+            top = np.argpartition(-score, k - 1)[:k]
+        else:
+            top = np.arange(len(score))
+        return top[np.argsort(-score[top])]
+
+    def update(self, box):
+        """
+        Simpan titik tengah box sebagai target sebelumnya.
+
+        :param box: xyxy target terpilih, atau None jika target hilang
+        """
+        if box is None:
+            self.prev = None
+        else:
+            self.prev = ((float(box[0]) + float(box[2])) / 2.0, (float(box[1]) + float(box[3])) / 2.0)
+
+    def reset(self):
+        self.prev = None
@@ -0,0 +1,73 @@
+# ============ Test Slot Data Terbaru ================
+# Test LatestSlot pada frame_slot.py: pembaca hanya mendapat item paling baru,
+# item yang ditimpa diteruskan ke on_drop, dan close() membangunkan pembaca
+#
+# Jalankan: python -m pytest main/test_frame_slot.py   (atau python test_frame_slot.py)
+
+"""
+Library yang digunakan
+"""
+import threading
+import time
+import unittest
+
+from frame_slot import LatestSlot
+
+
+class TestLatestSlot(unittest.TestCase):
+    def test_terbaru_menang(self):
+        dibuang = []
+        slot = LatestSlot(on_drop=dibuang.append)
+        for i in range(5):
+            slot.put(i)
+        self.assertEqual(slot.get(timeout=0), 4)
+        self.assertEqual(dibuang, [0, 1, 2, 3])
+        self.assertEqual(slot.ditimpa, 4)
+
+    def test_item_terbaca_tidak_dibuang(self):
+        dibuang = []
+        slot = LatestSlot(on_drop=dibuang.append)
+        slot.put("a")
+        self.assertEqual(slot.get(timeout=0), "a")
+        slot.put("b")
+        self.assertEqual(slot.get(timeout=0), "b")
+        self.assertEqual((dibuang, slot.ditimpa), ([], 0))
+
+    def test_kosong_timeout(self):
+        slot = LatestSlot()
+        mulai = time.monotonic()
+        self.assertIsNone(slot.get(timeout=0.05))
+        self.assertGreaterEqual(time.monotonic() - mulai, 0.04)
+
+    def test_pembaca_menunggu_penulis(self):
+        slot = LatestSlot()
+        hasil = []
+        pembaca = threading.Thread(target=lambda: hasil.append(slot.get(timeout=5)))
+        pembaca.start()
+        time.sleep(0.05)
+        slot.put(7)
+        pembaca.join(timeout=5)
+        self.assertEqual(hasil, [7])
+
+    def test_close_membangunkan_pembaca(self):
+        slot = LatestSlot()
+        hasil = []
+        pembaca = threading.Thread(target=lambda: hasil.append(slot.get()))
+        pembaca.start()
+        time.sleep(0.05)
+        slot.close()
+        pembaca.join(timeout=5)
+        self.assertFalse(pembaca.is_alive())
+        self.assertEqual(hasil, [None])
+        self.assertTrue(slot.closed)
+
+    def test_sisa_item_tetap_terbaca_setelah_close(self):
+        slot = LatestSlot()
+        slot.put(1)
+        slot.close()
+        self.assertEqual(slot.get(), 1)
+        self.assertIsNone(slot.get())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,161 @@
+# ============ Test Pipeline Stage ================
+# Test pipeline.Pipeline dengan stage palsu (stage_classes): urutan stage mengikuti
+# `order`, bukan urutan di config; stage display dilewati saat headless; close()
+# berjalan terbalik dan hanya untuk stage yang open()-nya berhasil
+#
+# Jalankan: python -m pytest main/test_pipeline.py   (atau python test_pipeline.py)
+
+"""
+Library yang digunakan
+"""
+import types
+import unittest
+
+from pipeline import STAGES, Pipeline, Stage
+
+
+class StagePalsu(Stage):
+    """
+    Stage yang hanya mencatat hook yang dipanggil ke options["log"] sebagai (hook, nama).
+    """
+    def _catat(self, hook):
+        self.options["log"].append((hook, self.name))
+
+    def open(self):
+        if self.options.get("gagal") == "open":
+            raise RuntimeError(f"{self.name} gagal dibuka")
+        self._catat("open")
+
+    def start(self):
+        if self.options.get("gagal") == "start":
+            raise RuntimeError(f"{self.name} gagal start")
+        self._catat("start")
+
+    def process(self, state):
+        self._catat("process")
+        return self.options.get("berhenti") is None
+
+    def finish(self, state):
+        self._catat("finish")
+
+    def close(self):
+        self._catat("close")
+
+
+class CapturePalsu(StagePalsu):
+    """
+    Kamera palsu dengan resolusi berbeda dari yang diminta; berhenti setelah options["frames"].
+    """
+    name = "capture"
+    order = 10
+
+    def open(self):
+        super().open()
+        self.camera = types.SimpleNamespace(resolution=(320, 240))
+        self.sisa = self.options.get("frames", 2)
+
+    def process(self, state):
+        self._catat("process")
+        self.sisa -= 1
+        return self.sisa >= 0
+
+
+def _kelas(nama, urutan):
+    return type(f"Palsu_{nama}", (StagePalsu,), {"name": nama, "order": urutan})
+
+
+# Nama dan order sama seperti stage asli, agar urutan yang diuji sama dengan pipeline sebenarnya
+KELAS = {"capture": CapturePalsu}
+KELAS.update({nama: _kelas(nama, STAGES[nama].order) for nama in ("infer", "select", "encode", "annotate")})
+
+
+def _config(log, headless=True, **stages):
+    """
+    :param stages: nama stage -> options tambahan; urutan sengaja tidak sama dengan `order`
+    """
+    urutan = ("encode", "annotate", "select", "capture", "infer")
+    return {
+        "camera": {},
+        "headless": {"enabled": headless},
+        "pipeline": {"serial": {}, "stages": {nama: dict(stages.get(nama, {}), log=log) for nama in urutan}},
+    }
+
+
+def _hook(log, hook):
+    return [nama for h, nama in log if h == hook]
+
+
+class TestPipeline(unittest.TestCase):
+    def test_urutan_stage(self):
+        log = []
+        pipeline = Pipeline(_config(log, capture={"frames": 2}), stage_classes=KELAS)
+        self.assertEqual([stage.name for stage in pipeline.stages], ["capture", "infer", "select", "encode"])
+        self.assertEqual(pipeline.resolution, (320, 240))  # Resolusi kamera sebenarnya
+        self.assertEqual(_hook(log, "start"), ["capture", "infer", "select", "encode"])
+
+        pipeline.run()
+        self.assertEqual(pipeline.frame, 2)
+        urutan = ["capture", "infer", "select", "encode"]
+        # Dua frame penuh, frame ketiga berhenti di capture; finish tetap untuk semua stage
+        self.assertEqual(_hook(log, "process"), urutan * 2 + ["capture"])
+        self.assertEqual(_hook(log, "finish"), urutan * 3)
+        self.assertEqual(_hook(log, "close"), urutan[::-1])
+
+    def test_display_stage_saat_tidak_headless(self):
+        log = []
+        pipeline = Pipeline(_config(log, headless=False), stage_classes=KELAS)
+        self.assertEqual([stage.name for stage in pipeline.stages],
+                         ["capture", "infer", "select", "encode", "annotate"])
+        pipeline.close()
+
+    def test_stage_nonaktif(self):
+        log = []
+        pipeline = Pipeline(_config(log, select={"enabled": False}), stage_classes=KELAS)
+        self.assertIsNone(pipeline.stage("select"))
+        self.assertEqual(_hook(log, "open").count("select"), 0)
+        pipeline.close()
+
+    def test_stage_berhenti_di_tengah(self):
+        log = []
+        pipeline = Pipeline(_config(log, capture={"frames": 5}, select={"berhenti": True}), stage_classes=KELAS)
+        pipeline.run()
+        self.assertEqual(pipeline.frame, 0)
+        self.assertEqual(_hook(log, "process"), ["capture", "infer", "select"])
+        self.assertEqual(_hook(log, "finish"), ["capture", "infer", "select", "encode"])
+
+    def test_open_gagal(self):
+        log = []
+        with self.assertRaisesRegex(RuntimeError, "infer gagal dibuka"):
+            Pipeline(_config(log, infer={"gagal": "open"}), stage_classes=KELAS)
+        # Stage lain dibuka paralel; hanya yang berhasil ditutup, terbalik, tanpa start
+        self.assertEqual(_hook(log, "close"), ["encode", "select", "capture"])
+        self.assertEqual(_hook(log, "start"), [])
+
+    def test_start_gagal(self):
+        log = []
+        with self.assertRaisesRegex(RuntimeError, "select gagal start"):
+            Pipeline(_config(log, select={"gagal": "start"}), stage_classes=KELAS)
+        self.assertEqual(_hook(log, "start"), ["capture", "infer"])
+        self.assertEqual(_hook(log, "close"), ["encode", "select", "infer", "capture"])
+
+    def test_close_sekali(self):
+        log = []
+        pipeline = Pipeline(_config(log), stage_classes=KELAS)
+        pipeline.close()
+        pipeline.close()
+        self.assertEqual(_hook(log, "close"), ["encode", "select", "infer", "capture"])
+
+    def test_stage_tidak_dikenal(self):
+        config = _config([])
+        config["pipeline"]["stages"]["bukan"] = {}
+        with self.assertRaises(ValueError):
+            Pipeline(config, stage_classes=KELAS)
+
+    def test_registry_tidak_berubah(self):
+        Pipeline(_config([]), stage_classes=KELAS).close()
+        # stage_classes hanya berlaku untuk pipeline itu, registry global tetap kelas asli
+        self.assertFalse(any(issubclass(cls, StagePalsu) for cls in STAGES.values()))
+
+
+if __name__ == "__main__":
+    unittest.main()
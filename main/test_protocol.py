@@ -0,0 +1,170 @@
+# ============ Test Protokol Biner Kamera <-> Arduino ================
+# Test format frame protocol.py: round-trip encode -> decode, serta resinkronisasi
+# parser pada aliran byte yang rusak. Jika g++ tersedia, parser C di
+# arduino/robot_protocol.h diberi aliran yang sama dan hasilnya harus identik
+#
+# Jalankan: python -m pytest main/test_protocol.py   (atau python test_protocol.py)
+
+"""
+Library yang digunakan
+"""
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+
+from protocol import (FRAME_COMMAND, FRAME_FIELD, FRAME_TARGETS, SYNC, VERSION, FrameEncoder,
+                      FrameParser, decode, decode_field, decode_targets)
+
+HEADER_C = os.path.join(os.path.dirname(os.path.abspath(__file__)), "arduino", "robot_protocol.h")
+
+# Harness C++: baca aliran byte dari stdin, cetak satu baris per frame valid
+HARNESS_C = r"""
+#include <cstdio>
+#include "robot_protocol.h"
+int main() {
+  RobotFrameParser parser;
+  int c;
+  while ((c = getchar()) != EOF) {
+    if (parser.feed((uint8_t)c)) {
+      const RobotFrame &f = parser.frame();
+      printf("%u %u %u", f.type, f.seq, f.timestamp);
+      for (uint8_t i = 0; i < f.length; i++) printf(" %02x", f.payload[i]);
+      printf("\n");
+    }
+  }
+  // Frame yang ditemukan saat pindai ulang dilaporkan pada feed() berikutnya
+  if (parser.feed(0x00)) {
+    const RobotFrame &f = parser.frame();
+    printf("%u %u %u", f.type, f.seq, f.timestamp);
+    for (uint8_t i = 0; i < f.length; i++) printf(" %02x", f.payload[i]);
+    printf("\n");
+  }
+  return 0;
+}
+"""
+
+
+def _stream(encoder, jumlah=20):
+    """
+    :return: (bytes aliran berisi `jumlah` frame target, list frame yang dikirim)
+    """
+    frames = [encoder.encode_targets([(100 + i, 200 - i, 1, 0.5)], t_capture=i / 1000.0) for i in range(jumlah)]
+    return b"".join(frames), frames
+
+
+def _baris(frame):
+    return " ".join([str(frame.type), str(frame.seq), str(frame.timestamp)] + [f"{b:02x}" for b in frame.payload])
+
+
+class TestRoundTrip(unittest.TestCase):
+    def test_targets(self):
+        data = FrameEncoder(camera=2).encode_targets([(640, -12, 3, 1.0), (1, 2)], t_capture=1.234)
+        frame = decode(data)
+        self.assertEqual((frame.version, frame.type, frame.seq, frame.timestamp), (VERSION, FRAME_TARGETS, 0, 1234))
+        t0, t1 = decode_targets(frame.payload)
+        self.assertEqual((t0.x, t0.y, t0.camera, t0.class_id, t0.confidence), (640, -12, 2, 3, 1.0))
+        self.assertEqual((t1.x, t1.y, t1.class_id), (1, 2, 0))
+
+    def test_field(self):
+        data = FrameEncoder().encode_field([(153.4, -12.34, 1, 0.5)], t_capture=0)
+        frame = decode(data)
+        self.assertEqual(frame.type, FRAME_FIELD)
+        (t,) = decode_field(frame.payload)
+        self.assertEqual((t.distance_cm, t.bearing_deg, t.class_id), (153, -12.3, 1))
+        self.assertAlmostEqual(t.confidence, 128 / 255.0)
+
+    def test_command(self):
+        frame = decode(FrameEncoder().encode_command("maju100>"))
+        self.assertEqual((frame.type, frame.payload), (FRAME_COMMAND, b"maju100"))
+
+    def test_seq_berputar(self):
+        encoder = FrameEncoder()
+        seqs = [decode(encoder.encode_targets([])).seq for _ in range(258)]
+        self.assertEqual(seqs[255:], [255, 0, 1])
+
+    def test_parser_per_byte(self):
+        data, frames = _stream(FrameEncoder())
+        parser = FrameParser()
+        hasil = []
+        for b in data:
+            hasil += parser.feed(bytes([b]))
+        self.assertEqual(hasil, [decode(f) for f in frames])
+
+
+class TestResync(unittest.TestCase):
+    def _parse(self, data):
+        return FrameParser().feed(data)
+
+    def test_sampah_di_depan(self):
+        data, frames = _stream(FrameEncoder())
+        self.assertEqual(self._parse(b"\x00\xff" + bytes([SYNC, 0x00]) + data), [decode(f) for f in frames])
+
+    def test_panjang_mustahil_ditolak(self):
+        # SYNC liar + versi valid + panjang 250 (bukan kelipatan 6): ditolak tanpa menelan frame
+        data, frames = _stream(FrameEncoder())
+        palsu = bytes([SYNC, (VERSION << 4) | FRAME_TARGETS, 0, 0, 0, 250])
+        parser = FrameParser()
+        self.assertEqual(parser.feed(palsu + data), [decode(f) for f in frames])
+        self.assertEqual(parser.length_error, 1)
+
+    def test_crc_gagal_pindai_ulang(self):
+        # Panjang 252 lolos cek header; byte yang ditelan harus dipindai ulang setelah CRC gagal
+        data, frames = _stream(FrameEncoder(), jumlah=40)
+        palsu = bytes([SYNC, (VERSION << 4) | FRAME_TARGETS, 0, 0, 0, 252])
+        parser = FrameParser()
+        self.assertEqual(parser.feed(palsu + data), [decode(f) for f in frames])
+        self.assertEqual(parser.crc_error, 1)
+
+    def test_byte_rusak(self):
+        data, frames = _stream(FrameEncoder())
+        rusak = bytearray(data)
+        rusak[len(frames[0]) * 3 + 7] ^= 0xFF  # Payload frame ke-4
+        hasil = self._parse(bytes(rusak))
+        self.assertEqual(hasil, [decode(f) for i, f in enumerate(frames) if i != 3])
+
+
+@unittest.skipUnless(shutil.which("g++"), "g++ tidak tersedia")
+class TestParserC(unittest.TestCase):
+    """
+    Parser Arduino harus menerima frame yang sama persis dengan FrameParser.
+    """
+    @classmethod
+    def setUpClass(cls):
+        cls.folder = tempfile.mkdtemp()
+        source = os.path.join(cls.folder, "harness.cpp")
+        cls.exe = os.path.join(cls.folder, "harness")
+        with open(source, "w") as f:
+            f.write(HARNESS_C)
+        subprocess.run(["g++", "-std=c++11", "-Wall", "-Werror", "-I", os.path.dirname(HEADER_C),
+                        source, "-o", cls.exe], check=True)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.folder, ignore_errors=True)
+
+    def _bandingkan(self, data):
+        keluaran = subprocess.run([self.exe], input=data, stdout=subprocess.PIPE, check=True).stdout
+        diharapkan = [_baris(f) for f in FrameParser().feed(data)]
+        self.assertEqual(keluaran.decode().splitlines(), diharapkan)
+        return diharapkan
+
+    def test_round_trip(self):
+        encoder = FrameEncoder()
+        data = (encoder.encode_targets([(320, 240, 1, 0.9)]) + encoder.encode_field([(120, 5.5)])
+                + encoder.encode_command("stop") + encoder.encode_targets([]))
+        self.assertEqual(len(self._bandingkan(data)), 4)
+
+    def test_resync(self):
+        data, frames = _stream(FrameEncoder(), jumlah=40)
+        rusak = bytearray(data)
+        rusak[len(frames[0]) * 5 + 8] ^= 0x55
+        palsu = bytes([SYNC, (VERSION << 4) | FRAME_TARGETS, 0, 0, 0, 252])
+        batas = len(frames[0]) * 3  # Header palsu kedua disisipkan di antara frame
+        stream = b"\x11" + palsu + bytes(rusak[:batas]) + bytes([SYNC, 0x13, 0, 0, 0, 250]) + bytes(rusak[batas:])
+        self.assertEqual(len(self._bandingkan(stream)), len(frames) - 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
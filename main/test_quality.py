@@ -0,0 +1,92 @@
+# ============ Test Pengatur Kualitas Adaptif ================
+# Test QualityController pada quality.py: imgsz turun / naik mengikuti p90 latensi,
+# batas FPS hanya turun saat throttling, dan keputusan diambil sekali per window
+#
+# Jalankan: python -m pytest main/test_quality.py   (atau python test_quality.py)
+
+"""
+Library yang digunakan
+"""
+import unittest
+
+from quality import QualityController
+
+
+def _controller():
+    return QualityController(budget_ms=60.0, imgsz_steps=(320, 416, 512, 640), fps_steps=(10, 15, 20, 30),
+                             window=10, headroom=0.6, throttle_ratio=1.3)
+
+
+def _window(controller, latency_ms):
+    """
+    Isi satu window penuh dengan latensi yang sama.
+
+    :return: nilai record() untuk sampel terakhir (True = level berubah)
+    """
+    hasil = [controller.record(latency_ms / 1000.0) for _ in range(controller.window)]
+    return hasil[-1]
+
+
+class TestQualityController(unittest.TestCase):
+    def test_menunggu_window_penuh(self):
+        controller = _controller()
+        for _ in range(controller.window - 1):
+            self.assertFalse(controller.record(0.2))
+        self.assertEqual(controller.imgsz, 640)
+
+    def test_imgsz_turun_di_atas_budget(self):
+        controller = _controller()
+        self.assertTrue(_window(controller, 80))
+        self.assertEqual((controller.imgsz, controller.max_fps), (512, 30))
+        self.assertTrue(_window(controller, 80))
+        self.assertEqual((controller.imgsz, controller.max_fps), (416, 30))
+
+    def test_imgsz_naik_saat_longgar(self):
+        controller = _controller()
+        _window(controller, 80)
+        _window(controller, 80)
+        self.assertEqual(controller.imgsz, 416)
+        self.assertTrue(_window(controller, 20))
+        self.assertEqual(controller.imgsz, 512)
+
+    def test_di_antara_headroom_dan_budget_tetap(self):
+        controller = _controller()
+        _window(controller, 80)
+        self.assertFalse(_window(controller, 45))
+        self.assertEqual((controller.imgsz, controller.max_fps), (512, 30))
+
+    def test_imgsz_terkecil(self):
+        controller = _controller()
+        for _ in range(3):
+            _window(controller, 80)
+        self.assertEqual(controller.imgsz, 320)
+        self.assertFalse(_window(controller, 80))
+        self.assertEqual((controller.imgsz, controller.max_fps), (320, 30))  # FPS tidak dipakai mengejar budget
+
+    def test_fps_turun_saat_throttling(self):
+        controller = _controller()
+        _window(controller, 20)  # Baseline imgsz 640 = 20ms
+        self.assertFalse(controller.throttled)
+
+        # Latensi naik jauh di atas baseline tanpa level berubah: CPU melambat
+        self.assertTrue(_window(controller, 30))
+        self.assertTrue(controller.throttled)
+        self.assertEqual((controller.imgsz, controller.max_fps), (640, 20))
+        _window(controller, 30)
+        self.assertEqual(controller.max_fps, 15)
+
+        # Pulih satu level per window
+        self.assertTrue(_window(controller, 20))
+        self.assertFalse(controller.throttled)
+        self.assertEqual(controller.max_fps, 20)
+
+    def test_metrics(self):
+        controller = _controller()
+        _window(controller, 80)
+        metrics = controller.metrics()
+        self.assertEqual((metrics["imgsz"], metrics["max_fps"], metrics["perubahan"]), (512, 30, 1))
+        self.assertAlmostEqual(metrics["p90_ms"], 80.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+# ============ Test Flight Recorder ================
+# Test recorder.py: rekaman ditulis Recorder lalu dibaca RecordingReader (frame, hasil,
+# seq_at), pemulihan saat .idx tertinggal / hilang / .rec terpotong, dan batas byte antrian
+#
+# Jalankan: python -m pytest main/test_recorder.py   (atau python test_recorder.py)
+
+"""
+Library yang digunakan
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from capture import Frame
+from recorder import INDEX_ENTRY, Recorder, RecordingReader
+
+JUMLAH = 10
+
+
+def _gambar(i):
+    # Warna rata per frame supaya tetap bisa dibedakan setelah kompresi JPEG
+    return np.full((48, 64, 3), (10 * i, 100, 200 - 10 * i), np.uint8)
+
+
+def _rekam(path, jumlah=JUMLAH):
+    recorder = Recorder(path, chunk_mb=1).start()
+    for i in range(jumlah):
+        recorder.record_frame(Frame(_gambar(i), i, 100.0 + i / 30.0))
+        target = None if i % 3 == 0 else 0
+        recorder.record_result(i, 100.0 + i / 30.0, np.array([[i, 2, i + 20, 22]], np.float32),
+                               np.array([0.5], np.float32), np.array([1], np.float32), target,
+                               f"{i},0\n".encode() if target is not None else None)
+    recorder.close()
+    return recorder
+
+
+class TestRecorder(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.path = os.path.join(self.folder, "match")
+
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def _cek_lengkap(self, reader, jumlah=JUMLAH):
+        self.assertEqual(reader.seqs, list(range(jumlah)))
+        for i in reader.seqs:
+            frame = reader.frame(i)
+            self.assertEqual((frame.seq, frame.t_capture), (i, 100.0 + i / 30.0))
+            self.assertLess(np.abs(frame.image.astype(int) - _gambar(i)).max(), 8)
+            hasil = reader.result(i)
+            np.testing.assert_array_equal(hasil["boxes"], [[i, 2, i + 20, 22]])
+            self.assertEqual(hasil["target"], None if i % 3 == 0 else 0)
+            self.assertEqual(hasil["serial"], b"" if i % 3 == 0 else f"{i},0\n".encode())
+
+    def test_round_trip(self):
+        recorder = _rekam(self.path)
+        self.assertEqual((recorder.frame, recorder.result, recorder.dibuang), (JUMLAH, JUMLAH, 0))
+        reader = RecordingReader(self.path + ".rec")
+        try:
+            self._cek_lengkap(reader)
+            self.assertIsNone(reader.result(JUMLAH))
+            self.assertEqual(reader.seq_at(100.0 + 4.5 / 30.0), 4)
+            self.assertEqual(reader.seq_at(0.0), 0)
+            self.assertEqual([f.seq for f in reader.frames(3, 6)], [3, 4, 5])
+        finally:
+            reader.close()
+
+    def test_index_tertinggal(self):
+        # Crash di tengah flush: index berhenti di entry ke-5, entry ke-6 terpotong
+        _rekam(self.path)
+        with open(self.path + ".idx", "r+b") as f:
+            f.truncate(5 * INDEX_ENTRY.size + 7)
+        reader = RecordingReader(self.path)
+        try:
+            self._cek_lengkap(reader)
+        finally:
+            reader.close()
+
+    def test_tanpa_index(self):
+        _rekam(self.path)
+        os.remove(self.path + ".idx")
+        reader = RecordingReader(self.path)
+        try:
+            self._cek_lengkap(reader)
+        finally:
+            reader.close()
+
+    def test_record_terakhir_terpotong(self):
+        # Record terakhir (hasil frame 9) tidak utuh di .rec dan tidak ada di index
+        _rekam(self.path)
+        with open(self.path + ".idx", "r+b") as f:
+            f.truncate(4 * INDEX_ENTRY.size)
+        with open(self.path + ".rec", "r+b") as f:
+            f.seek(0, os.SEEK_END)
+            f.truncate(f.tell() - 3)
+        reader = RecordingReader(self.path)
+        try:
+            self.assertEqual(reader.seqs, list(range(JUMLAH)))
+            self.assertIsNone(reader.result(JUMLAH - 1))
+            self.assertIsNotNone(reader.result(JUMLAH - 2))
+        finally:
+            reader.close()
+
+    def test_bukan_rekaman(self):
+        with open(self.path + ".rec", "wb") as f:
+            f.write(b"BUKANREK" + bytes(8))
+        with self.assertRaises(ValueError):
+            RecordingReader(self.path)
+
+    def test_antrian_dibatasi_byte(self):
+        # Thread belum berjalan: frame kedua melewati batas antrian dan dibuang tanpa disalin
+        gambar = _gambar(0)
+        recorder = Recorder(self.path, chunk_mb=1, max_queue_mb=1.5 * gambar.nbytes / (1024 * 1024))
+        recorder.record_frame(Frame(gambar, 0, 0.0))
+        recorder.record_frame(Frame(gambar, 1, 0.0))
+        self.assertEqual(recorder.dibuang, 1)
+        recorder.start().close()
+        reader = RecordingReader(self.path)
+        try:
+            self.assertEqual(reader.seqs, [0])
+        finally:
+            reader.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+# ============ Test Pemilihan Target ================
+# Test TargetSelector pada target_select.py: skor vektor sama dengan perhitungan per box,
+# urutan top-k, batas min_conf, bonus kelas, dan penalti jarak ke target sebelumnya
+#
+# Jalankan: python -m pytest main/test_target_select.py   (atau python test_target_select.py)
+
+"""
+Library yang digunakan
+"""
+import math
+import unittest
+
+import numpy as np
+
+from target_select import TargetSelector
+
+FRAME = (1280, 720)
+
+
+def _skor_per_box(selector, box, conf, class_id):
+    """
+    Skor satu box dihitung biasa (tanpa NumPy) sebagai pembanding TargetSelector.scores.
+    """
+    if conf < selector.min_conf:
+        return -math.inf
+    w, h = box[2] - box[0], box[3] - box[1]
+    size = min(math.sqrt(max(w * h, 0)) / (0.25 * selector.diagonal), 1.0)
+    skor = selector.w_conf * conf + selector.w_size * size + selector.class_weights.get(int(class_id), 0.0)
+    if selector.prev is not None:
+        cx, cy = (box[0] + box[2]) / 2.0, (box[1] + box[3]) / 2.0
+        skor -= selector.w_dist * math.hypot(cx - selector.prev[0], cy - selector.prev[1]) / selector.diagonal
+    return skor
+
+
+class TestTargetSelector(unittest.TestCase):
+    def test_skor_sama_dengan_per_box(self):
+        rng = np.random.default_rng(1)
+        xy = rng.uniform(0, 1000, (50, 2))
+        boxes = np.hstack([xy, xy + rng.uniform(5, 200, (50, 2))]).astype(np.float32)
+        confidences = rng.uniform(0, 1, 50).astype(np.float32)
+        class_ids = rng.integers(0, 3, 50).astype(np.float32)
+        selector = TargetSelector(FRAME, class_weights={1: 0.3})
+        selector.update((600, 300, 640, 340))
+
+        skor = selector.scores(boxes, confidences, class_ids)
+        for i in range(len(boxes)):
+            diharapkan = _skor_per_box(selector, boxes[i], confidences[i], class_ids[i])
+            if math.isinf(diharapkan):
+                self.assertTrue(np.isneginf(skor[i]))
+            else:
+                self.assertAlmostEqual(float(skor[i]), diharapkan, places=4)
+
+        # Top-k = box layak urut skor tertinggi
+        urut = [i for i in np.argsort(-skor, kind="stable") if np.isfinite(skor[i])]
+        self.assertEqual(list(selector.select_topk(boxes, confidences, class_ids)), urut)
+        self.assertEqual(list(selector.select_topk(boxes, confidences, class_ids, 5)), urut[:5])
+
+    def test_confidence_tertinggi(self):
+        boxes = np.array([[0, 0, 40, 40], [100, 100, 140, 140], [200, 200, 240, 240]], np.float32)
+        selector = TargetSelector(FRAME)
+        self.assertEqual(selector.select(boxes, [0.5, 0.9, 0.7], [0, 0, 0]), 1)
+        self.assertEqual(selector.prev, (120.0, 120.0))
+
+    def test_box_besar_menang_saat_conf_sama(self):
+        boxes = np.array([[0, 0, 20, 20], [300, 300, 400, 400]], np.float32)
+        self.assertEqual(TargetSelector(FRAME).select(boxes, [0.8, 0.8], [0, 0]), 1)
+
+    def test_min_conf(self):
+        boxes = np.array([[0, 0, 40, 40], [100, 100, 140, 140]], np.float32)
+        selector = TargetSelector(FRAME, min_conf=0.5)
+        self.assertEqual(list(selector.select_topk(boxes, [0.3, 0.6], [0, 0])), [1])
+
+        selector.update(boxes[1])
+        self.assertIsNone(selector.select(boxes, [0.3, 0.4], [0, 0]))
+        self.assertIsNone(selector.prev)  # Target hilang, jarak tidak dipakai di frame berikutnya
+
+    def test_bonus_kelas(self):
+        boxes = np.array([[0, 0, 40, 40], [100, 100, 140, 140]], np.float32)
+        selector = TargetSelector(FRAME, class_weights={2: 0.5})
+        self.assertEqual(selector.select(boxes, [0.9, 0.6], [0, 2]), 1)
+
+    def test_dekat_target_sebelumnya(self):
+        boxes = np.array([[0, 0, 40, 40], [1200, 660, 1240, 700]], np.float32)
+        selector = TargetSelector(FRAME)
+        selector.update(boxes[1])
+        # Box jauh sedikit lebih yakin, tapi box dekat target lama yang dipilih
+        self.assertEqual(selector.select(boxes, [0.85, 0.8], [0, 0]), 1)
+
+    def test_topk_tidak_mengubah_prev(self):
+        boxes = np.array([[0, 0, 40, 40]], np.float32)
+        selector = TargetSelector(FRAME)
+        selector.select_topk(boxes, [0.9], [0])
+        self.assertIsNone(selector.prev)
+
+    def test_tanpa_box(self):
+        selector = TargetSelector(FRAME)
+        kosong = np.empty((0, 4), np.float32)
+        self.assertEqual(len(selector.select_topk(kosong, [], [])), 0)
+        self.assertIsNone(selector.select(kosong, [], []))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,185 @@
+# ============ Module Tracker Bola ================
+# Program ini berisi tracker ringan (Kalman kecepatan konstan + optical flow)
+# untuk memperkirakan posisi bola di antara frame yang dideteksi YOLO
+
+"""
+Library yang digunakan
+"""
+import cv2
+import numpy as np
+
+
+class BallTracker:
+    """
+    Tracker satu bola. Kalman filter kecepatan konstan memprediksi posisi, lalu
+    sparse optical flow (Lucas-Kanade) pada titik-titik di dalam box terakhir
+    menjadi pengukuran. Interval deteksi YOLO menyesuaikan keyakinan tracker.
+    """
+    def __init__(self, max_interval=5, min_confidence=0.4, max_points=30):
+        """
+        :param max_interval: YOLO dijalankan paling jarang tiap `max_interval` frame
+                             (1 = setiap frame, 3 = 1 frame YOLO lalu 2 frame tracker)
+        :param min_confidence: di bawah nilai ini tracker dianggap hilang
+        :param max_points: jumlah titik optical flow maksimal dalam box
+        """
+        self.max_interval = max(1, max_interval)
+        self.min_confidence = min_confidence
+        self.max_points = max_points
+
+        self.kalman = cv2.KalmanFilter(4, 2)
+        self.kalman.transitionMatrix = np.array(
+            [[1, 0, 1, 0], [0, 1, 0, 1], [0, 0, 1, 0], [0, 0, 0, 1]], np.float32)
+        self.kalman.measurementMatrix = np.array([[1, 0, 0, 0], [0, 1, 0, 0]], np.float32)
+        self.kalman.processNoiseCov = np.eye(4, dtype=np.float32) * 1.0
+        self.kalman.measurementNoiseCov = np.eye(2, dtype=np.float32) * 0.5
+
+        self.lk_params = dict(
+            winSize=(15, 15),
+            maxLevel=2,
+            criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 10, 0.03),
+        )
+
+        self.aktif = False
+        self.size = (0.0, 0.0)  # Lebar dan tinggi box terakhir
+        self.class_id = 0
+        self.confidence = 0.0
+        self.interval = 1  # Periode deteksi YOLO saat ini (frame), naik sampai max_interval
+        self.frame_sejak_deteksi = 0  # Frame yang sudah diisi tracker sejak deteksi terakhir
+        self._prev_gray = None
+        self._points = None
+
+    def need_detection(self):
+        """
+        :return: True jika frame berikutnya harus dideteksi ulang dengan YOLO
+        """
+        # Satu periode = 1 frame YOLO + (interval - 1) frame tracker
+        return not self.aktif or self.frame_sejak_deteksi >= self.interval - 1
+
+    def correct(self, frame, box, class_id=0):
+        """
+        Koreksi tracker dengan hasil deteksi YOLO.
+
+        :param frame: frame BGR tempat box dideteksi
+        :param box: xyxy bola terpilih, atau None jika bola tidak terdeteksi
+        :param class_id: kelas box
+        :return: box hasil fusi (xyxy) atau None
+        """
+        self.frame_sejak_deteksi = 0
+        if box is None:
+            self.aktif = False
+            self.interval = 1
+            self._points = None
+            return None
+
+        x1, y1, x2, y2 = [float(v) for v in box[:4]]
+        cx, cy = (x1 + x2) / 2, (y1 + y2) / 2
+        measurement = np.array([[cx], [cy]], np.float32)
+
+        if not self.aktif:
+            self.kalman.statePost = np.array([[cx], [cy], [0], [0]], np.float32)
+            self.kalman.errorCovPost = np.eye(4, dtype=np.float32)
+            fused = (cx, cy)
+        else:
+            # Bandingkan prediksi tracker dengan deteksi untuk menyesuaikan interval
+            pred = self.kalman.predict()
+            error = np.hypot(pred[0, 0] - cx, pred[1, 0] - cy)
+            state = self.kalman.correct(measurement)
+            fused = (float(state[0, 0]), float(state[1, 0]))
+            self._sesuaikan_interval(error, max(x2 - x1, y2 - y1))
+
+        self.aktif = True
+        self.size = (x2 - x1, y2 - y1)
+        self.class_id = class_id
+        self.confidence = 1.0
+
+        self._prev_gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        self._points = self._ambil_titik(self._prev_gray, (x1, y1, x2, y2))
+        return self._box_dari_pusat(*fused)
+
+    def track(self, frame):
+        """
+        Perkirakan posisi bola pada frame tanpa deteksi YOLO.
+
+        :param frame: frame BGR terbaru
+        :return: box hasil fusi (xyxy) atau None jika tracker hilang
+        """
+        if not self.aktif:
+            return None
+
+        self.frame_sejak_deteksi += 1
+        # Posisi sebelum predict, karena predict() ikut menimpa statePost
+        prev_cx = float(self.kalman.statePost[0, 0])
+        prev_cy = float(self.kalman.statePost[1, 0])
+        pred = self.kalman.predict()
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+
+        if self._points is not None and len(self._points):
+            new_points, status, _ = cv2.calcOpticalFlowPyrLK(
+                self._prev_gray, gray, self._points, None, **self.lk_params)
+            ok = status.reshape(-1) == 1
+            rasio = ok.mean() if len(ok) else 0.0
+            if ok.any():
+                # Median perpindahan titik = pergeseran bola
+                shift = np.median(new_points[ok] - self._points[ok], axis=0).reshape(-1)
+                cx = prev_cx + shift[0]
+                cy = prev_cy + shift[1]
+                state = self.kalman.correct(np.array([[cx], [cy]], np.float32))
+                self._points = new_points[ok].reshape(-1, 1, 2)
+            else:
+                state = pred
+            self.confidence *= 0.5 + 0.5 * rasio
+        else:
+            # Tanpa titik flow, hanya prediksi Kalman yang tersisa
+            state = pred
+            self.confidence *= 0.6
+
+        self._prev_gray = gray
+        if self.confidence < self.min_confidence:
+            self.aktif = False
+            self.interval = 1
+            return None
+        return self._box_dari_pusat(float(state[0, 0]), float(state[1, 0]))
+
+    def reset(self):
+        """
+        Lepas bola yang sedang dilacak.
+        """
+        self.aktif = False
+        self.interval = 1
+        self.frame_sejak_deteksi = 0
+        self._points = None
+
+    def _sesuaikan_interval(self, error, ukuran):
+        """
+        Perlebar interval deteksi jika prediksi akurat, persempit jika meleset.
+        """
+        batas = max(4.0, 0.25 * ukuran)
+        if error < batas:
+            self.interval = min(self.max_interval, self.interval + 1)
+        else:
+            self.interval = max(1, self.interval // 2)
+
+    def _ambil_titik(self, gray, box):
+        """
+        Ambil titik fitur di dalam box untuk optical flow.
+        """
+        x1, y1, x2, y2 = [int(v) for v in box]
+        h, w = gray.shape[:2]
+        x1, y1 = max(0, x1), max(0, y1)
+        x2, y2 = min(w, x2), min(h, y2)
+        if x2 - x1 < 4 or y2 - y1 < 4:
+            return None
+
+        points = cv2.goodFeaturesToTrack(gray[y1:y2, x1:x2], self.max_points, 0.01, 3)
+        if points is not None:
+            points = points + np.array([x1, y1], np.float32)
+        else:
+            # Bola polos tanpa tekstur: pakai grid titik di dalam box
+            xs = np.linspace(x1, x2 - 1, 4)
+            ys = np.linspace(y1, y2 - 1, 4)
+            points = np.array([[[x, y]] for y in ys for x in xs], np.float32)
+        return points.astype(np.float32)
+
+    def _box_dari_pusat(self, cx, cy):
+        w, h = self.size
+        return np.array([cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2], np.float32)
@@ -1,5 +1,12 @@
 from ultralytics import YOLO
 import cv2
+import os
+import sys
+import time
+
+# Modul bersama ada di folder main
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "main"))
+from quality import QualityController
 
 # Load model (ganti 'best.pt' dengan path file kamu jika perlu)
 model = YOLO("best.pt")
@@ -7,13 +14,19 @@ model = YOLO("best.pt")
 # Buka kamera (0 = default webcam)
 cap = cv2.VideoCapture(0)
 
+# imgsz dan batas FPS menyesuaikan budget latensi (bukan imgsz=640 tetap)
+quality = QualityController(budget_ms=60)
+
 while True:
+    quality.pace()
     ret, frame = cap.read()
     if not ret:
         break
+    t_capture = time.monotonic()
 
     # Jalankan deteksi
-    results = model.predict(source=frame,  verbose=False, imgsz=640)
+    results = model.predict(source=frame,  verbose=False, imgsz=quality.imgsz)
+    quality.record(time.monotonic() - t_capture)
 
     # Ambil hasil frame dengan anotasi (bounding boxes, label, dsb)
     annotated_frame = results[0].plot()
@@ -26,5 +39,6 @@ while True:
         break
 
 # Bersihkan
+print(f"[Quality] {quality.metrics()}")
 cap.release()
 cv2.destroyAllWindows()